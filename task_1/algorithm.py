@@ -2,6 +2,8 @@
 
 class ListNode:
     """Узел односвязного списка."""
+    __slots__ = ("val", "next")
+
     def __init__(self, val=0, next=None):
         self.val = val
         self.next = next
@@ -0,0 +1,220 @@
+# task_1/array_list.py
+#
+# Компактный односвязный список на типизированных массивах.
+#
+# Вместо отдельного объекта ListNode на каждый элемент храним два массива:
+#   values[i] — значение i-го узла
+#   _next[i]  — индекс следующего узла (NULL = -1 — конец списка)
+# «Указатель» на узел — это просто его индекс в массивах.
+#
+# Память: 8 байт на значение + 8 байт на ссылку (array('q')) против
+# ~50–100 байт на объект ListNode плюс отдельный объект int.
+#
+# Дополнительно отслеживается «последовательная» раскладка: сразу после
+# построения узлы лежат в массивах в порядке списка (_next[i] = i + 1),
+# после реверса — в обратном (_next[i] = i - 1). Для таких раскладок реверс
+# переписывает массив ссылок на месте кусками по _CHUNK элементов через
+# range() — цикл идёт внутри C, а временная память ограничена одним куском.
+# В общем случае работает обычный метод трёх указателей по индексам.
+
+from array import array
+
+from algorithm import ListNode
+from sublist_ops import apply_plan, plan_segments
+
+NULL = -1
+
+# Раскладка узлов в массивах
+_FORWARD = 1    # _next[i] = i + 1, голова — узел 0
+_BACKWARD = -1  # _next[i] = i - 1, голова — последний узел
+_UNKNOWN = 0    # произвольные ссылки
+
+# Элементов в куске при переписывании ссылок на месте (512 КБ для 'q')
+_CHUNK = 1 << 16
+
+
+def _fill_links(nxt, step):
+    """
+    Переписывает nxt на месте: nxt[i] = i + step, а у конца списка — NULL.
+    Временный массив — не больше _CHUNK элементов, а не копия всех ссылок.
+    """
+    n = len(nxt)
+    for lo in range(0, n, _CHUNK):
+        hi = min(lo + _CHUNK, n)
+        nxt[lo:hi] = array("q", range(lo + step, hi + step))
+    nxt[n - 1 if step > 0 else 0] = NULL
+
+
+class ArrayLinkedList:
+    """
+    Односвязный список, хранящий значения и ссылки в массивах array.
+
+    Значения по умолчанию — 64-битные целые (typecode 'q');
+    для вещественных можно передать typecode='d'.
+    """
+    __slots__ = ("values", "_next", "head", "_layout")
+
+    def __init__(self, typecode="q"):
+        self.values = array(typecode)
+        self._next = array("q")
+        self.head = NULL
+        self._layout = _FORWARD
+
+    # --- Построение ---
+
+    @classmethod
+    def from_iterable(cls, iterable, typecode="q"):
+        """Создаёт список из любого итерируемого объекта за O(n)."""
+        lst = cls(typecode)
+        lst.values = array(typecode, iterable)
+        lst._link_forward()
+        return lst
+
+    @classmethod
+    def from_range(cls, n):
+        """Создаёт список 1 -> 2 -> ... -> n (аналог build_list)."""
+        return cls.from_iterable(range(1, max(n, 0) + 1))
+
+    @classmethod
+    def from_nodes(cls, head, typecode="q"):
+        """Копирует цепочку ListNode в массивы."""
+        values = []
+        current = head
+        while current is not None:
+            values.append(current.val)
+            current = current.next
+        return cls.from_iterable(values, typecode)
+
+    def to_nodes(self):
+        """Преобразует список в цепочку ListNode; возвращает голову."""
+        dummy = ListNode()
+        tail = dummy
+        for v in self:
+            tail.next = ListNode(v)
+            tail = tail.next
+        return dummy.next
+
+    def _link_forward(self):
+        """Связывает узлы в порядке их расположения в массивах."""
+        n = len(self.values)
+        if len(self._next) != n:
+            # Построение: массива ссылок нужной длины ещё нет
+            self._next = array("q", range(1, n + 1))
+            if n:
+                self._next[n - 1] = NULL
+        elif n:
+            _fill_links(self._next, 1)
+        self.head = 0 if n else NULL
+        self._layout = _FORWARD
+
+    # --- Операции ---
+
+    def reverse(self):
+        """
+        Реверс списка in-place.
+        Время: O(n), дополнительная память: O(1) — массив ссылок
+        переписывается на месте, в том числе для последовательных раскладок.
+        """
+        n = len(self.values)
+        if n < 2:
+            return self
+
+        if self._layout == _FORWARD:
+            # 0 -> 1 -> ... -> n-1  превращается в  n-1 -> ... -> 0
+            _fill_links(self._next, -1)
+            self.head = n - 1
+            self._layout = _BACKWARD
+        elif self._layout == _BACKWARD:
+            self._link_forward()
+        else:
+            # Метод трёх указателей по индексам
+            nxt = self._next
+            prev = NULL
+            current = self.head
+            while current != NULL:
+                next_node = nxt[current]
+                nxt[current] = prev
+                prev = current
+                current = next_node
+            self.head = prev
+        return self
+
+    def relink(self, order):
+        """
+        Перевязывает узлы в заданном порядке индексов за один проход.
+        order должен содержать каждый индекс 0..n-1 ровно один раз.
+        """
+        nxt = self._next
+        prev = NULL
+        for idx in order:
+            if prev == NULL:
+                self.head = idx
+            else:
+                nxt[prev] = idx
+            prev = idx
+        if prev == NULL:
+            self.head = NULL
+        else:
+            nxt[prev] = NULL
+        self._layout = _UNKNOWN
+        return self
+
+    def splice(self, operations):
+        """
+        Применяет пакет операций (см. sublist_ops.splice) за один проход
+        перевязки. Время: O(n + M·S).
+        """
+        order = self.node_order()
+        segments = plan_segments(len(order), operations)
+        return self.relink(apply_plan(order, segments))
+
+    def reverse_range(self, i, j):
+        """Реверс узлов с позициями i..j (с нуля, включительно)."""
+        return self.splice([("reverse", i, j)])
+
+    def reverse_k_group(self, k):
+        """Реверс каждой полной группы из k узлов."""
+        return self.splice([("reverse_k", k)])
+
+    def rotate(self, k):
+        """Циклический сдвиг вправо на k позиций."""
+        return self.splice([("rotate", k)])
+
+    def node_order(self):
+        """Возвращает индексы узлов в порядке обхода списка."""
+        if self._layout == _FORWARD:
+            return list(range(len(self.values)))
+        if self._layout == _BACKWARD:
+            return list(range(len(self.values) - 1, -1, -1))
+        order = []
+        nxt = self._next
+        current = self.head
+        while current != NULL:
+            order.append(current)
+            current = nxt[current]
+        return order
+
+    # --- Доступ к данным ---
+
+    def __iter__(self):
+        values = self.values
+        if self._layout == _FORWARD:
+            return iter(values)
+        if self._layout == _BACKWARD:
+            return reversed(values)
+        return (values[i] for i in self.node_order())
+
+    def __len__(self):
+        return len(self.values)
+
+    def to_values(self):
+        """Преобразует список в обычный Python-список (аналог list_to_values)."""
+        return list(self)
+
+    def nbytes(self):
+        """Объём памяти под данные и ссылки (без учёта заголовков объектов)."""
+        return (len(self.values) * self.values.itemsize
+                + len(self._next) * self._next.itemsize)
+
+    def __repr__(self):
+        return " -> ".join(map(str, self)) or "<пустой список>"
@@ -0,0 +1,221 @@
+# task_1/sublist_ops.py
+#
+# Операции над частями односвязного списка и их пакетное применение.
+#
+# Одиночные операции (in-place, O(1) доп. памяти):
+#   reverse_range(head, i, j) — реверс узлов с позициями i..j (с нуля, включительно)
+#   reverse_k_group(head, k)  — реверс каждой полной группы из k узлов
+#   rotate(head, k)           — циклический сдвиг вправо на k позиций
+#
+# Пакетное применение — splice(head, operations):
+#   Список операций сначала «проигрывается» на описании списка в виде
+#   сегментов исходных позиций (start, end, reversed), узлы не трогаются.
+#   Затем узлы один раз перевязываются в итоговом порядке.
+#   Время: O(n + M·S), где M — число операций, S — число сегментов
+#   (S ≤ 2M + 1 для reverse/rotate), вместо O(n·M) при M отдельных проходах.
+#
+# Формат операций:
+#   ("reverse", i, j)  — как reverse_range
+#   ("reverse_k", k)   — как reverse_k_group
+#   ("rotate", k)      — как rotate
+
+from itertools import chain
+
+from algorithm import ListNode
+
+
+def reverse_range(head, i, j):
+    """
+    Реверс узлов с позициями i..j (нумерация с нуля, включительно).
+    Время: O(j), дополнительная память: O(1).
+    """
+    if i < 0 or i > j:
+        raise ValueError(f"некорректный диапазон [{i}, {j}]")
+    dummy = ListNode(0, head)
+    before = dummy
+    for _ in range(i):
+        before = before.next
+        if before is None:
+            raise ValueError(f"позиция {i} за пределами списка")
+
+    # Проверяем длину окна до изменения ссылок
+    probe = before
+    for _ in range(j - i + 1):
+        probe = probe.next
+        if probe is None:
+            raise ValueError(f"позиция {j} за пределами списка")
+
+    # Классические три указателя внутри окна
+    first = before.next
+    prev = None
+    current = first
+    for _ in range(j - i + 1):
+        next_node = current.next
+        current.next = prev
+        prev = current
+        current = next_node
+
+    before.next = prev
+    first.next = current
+    return dummy.next
+
+
+def reverse_k_group(head, k):
+    """
+    Реверс каждой полной группы из k узлов; неполный хвост не меняется.
+    Время: O(n), дополнительная память: O(1).
+    """
+    if k <= 0:
+        raise ValueError("k должно быть положительным")
+    dummy = ListNode(0, head)
+    before = dummy
+    while True:
+        # Проверяем, что впереди есть k узлов
+        probe = before
+        for _ in range(k):
+            probe = probe.next
+            if probe is None:
+                return dummy.next
+
+        first = before.next
+        prev = probe.next
+        current = first
+        for _ in range(k):
+            next_node = current.next
+            current.next = prev
+            prev = current
+            current = next_node
+        before.next = prev
+        before = first
+
+
+def rotate(head, k):
+    """
+    Циклический сдвиг списка вправо на k позиций.
+    Время: O(n), дополнительная память: O(1).
+    """
+    if head is None:
+        return None
+    n = 1
+    tail = head
+    while tail.next is not None:
+        tail = tail.next
+        n += 1
+    k %= n
+    if k == 0:
+        return head
+
+    new_tail = head
+    for _ in range(n - k - 1):
+        new_tail = new_tail.next
+    new_head = new_tail.next
+    new_tail.next = None
+    tail.next = head
+    return new_head
+
+
+# === Пакетное применение операций ===
+
+def _split(segments, cuts):
+    """
+    Разрезает сегменты так, чтобы каждая позиция из cuts (по возрастанию)
+    стала границей. Возвращает новый список сегментов и индексы сегментов,
+    с которых начинаются позиции cuts.
+    """
+    result = []
+    starts = []
+    cut_iter = iter(cuts)
+    cut = next(cut_iter, None)
+    pos = 0
+    for start, end, rev in segments:
+        length = end - start
+        while cut is not None and cut < pos + length:
+            offset = cut - pos
+            if offset:
+                # Для перевёрнутого сегмента первые offset элементов —
+                # это исходные позиции end-offset .. end-1.
+                if rev:
+                    result.append((end - offset, end, True))
+                    end -= offset
+                else:
+                    result.append((start, start + offset, False))
+                    start += offset
+                pos += offset
+                length -= offset
+            starts.append(len(result))
+            cut = next(cut_iter, None)
+        result.append((start, end, rev))
+        pos += length
+    while cut is not None:
+        # Позиции, совпадающие с концом списка
+        starts.append(len(result))
+        cut = next(cut_iter, None)
+    return result, starts
+
+
+def _reverse_segments(segments, lo, hi):
+    """Реверс сегментов segments[lo:hi] с переключением флагов."""
+    segments[lo:hi] = [(s, e, not rev) for s, e, rev in reversed(segments[lo:hi])]
+
+
+def plan_segments(n, operations):
+    """
+    Проигрывает операции над списком длины n без обращения к узлам.
+    Возвращает итоговый порядок как список сегментов исходных позиций
+    (start, end, reversed), end не включается.
+    """
+    segments = [(0, n, False)] if n else []
+    for op in operations:
+        kind = op[0]
+        if kind == "reverse":
+            _, i, j = op
+            if not 0 <= i <= j < n:
+                raise ValueError(f"некорректный диапазон [{i}, {j}] для длины {n}")
+            segments, (lo, hi) = _split(segments, (i, j + 1))
+            _reverse_segments(segments, lo, hi)
+        elif kind == "reverse_k":
+            k = op[1]
+            if k <= 0:
+                raise ValueError("k должно быть положительным")
+            cuts = range(0, n - n % k + 1, k)
+            segments, starts = _split(segments, cuts)
+            for lo, hi in zip(starts, starts[1:]):
+                _reverse_segments(segments, lo, hi)
+        elif kind == "rotate":
+            if n == 0:
+                continue
+            k = op[1] % n
+            if k:
+                segments, (idx,) = _split(segments, (n - k,))
+                segments = segments[idx:] + segments[:idx]
+        else:
+            raise ValueError(f"неизвестная операция: {kind!r}")
+    return segments
+
+
+def apply_plan(items, segments):
+    """Итератор по items в порядке, заданном сегментами."""
+    return chain.from_iterable(
+        reversed(items[s:e]) if rev else items[s:e] for s, e, rev in segments
+    )
+
+
+def splice(head, operations):
+    """
+    Применяет список операций к цепочке ListNode за один проход перевязки.
+    Время: O(n + M·S), дополнительная память: O(n) ссылок на узлы.
+    """
+    nodes = []
+    current = head
+    while current is not None:
+        nodes.append(current)
+        current = current.next
+
+    segments = plan_segments(len(nodes), operations)
+    dummy = ListNode()
+    tail = dummy
+    for node in apply_plan(nodes, segments):
+        tail.next = node
+        tail = node
+    tail.next = None
+    return dummy.next
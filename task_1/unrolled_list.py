@@ -0,0 +1,179 @@
+# task_1/unrolled_list.py
+#
+# Развёрнутый (unrolled) односвязный список.
+#
+# Каждый узел хранит не одно значение, а блок до block_size значений
+# в обычном Python-списке. Переход по ссылке происходит раз на блок,
+# а внутри блока значения перебираются встроенными средствами (C-уровень).
+#
+# Реверс без перестановки значений:
+#   - у каждого блока есть флаг reversed — значения блока читаются с конца;
+#   - у всего списка есть флаг _reversed — блоки читаются с конца.
+# reverse(lazy=True)  — O(1): переключается только флаг списка.
+# reverse(lazy=False) — O(число блоков): метод трёх указателей по блокам
+#                       и переключение флагов блоков.
+#
+# Сложность:
+#   append        — амортизированно O(1)
+#   обход/экспорт — O(n), но O(n / block_size) переходов по ссылкам
+#   list[i]       — O(n / block_size)
+
+DEFAULT_BLOCK_SIZE = 64
+
+
+class Block:
+    """Узел развёрнутого списка: блок значений и ссылка на следующий блок."""
+    __slots__ = ("values", "reversed", "next")
+
+    def __init__(self, values=None, next=None):
+        self.values = values if values is not None else []
+        self.reversed = False
+        self.next = next
+
+    def normalize(self):
+        """Физически разворачивает значения блока и сбрасывает флаг."""
+        if self.reversed:
+            self.values.reverse()
+            self.reversed = False
+
+
+class UnrolledLinkedList:
+    """Односвязный список блоков с ленивым реверсом."""
+    __slots__ = ("head", "tail", "block_size", "_size", "_reversed")
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE):
+        if block_size <= 0:
+            raise ValueError("block_size должно быть положительным")
+        self.head = None
+        self.tail = None
+        self.block_size = block_size
+        self._size = 0
+        self._reversed = False
+
+    @classmethod
+    def from_iterable(cls, iterable, block_size=DEFAULT_BLOCK_SIZE):
+        """Создаёт список, нарезая значения на полные блоки."""
+        lst = cls(block_size)
+        values = list(iterable)
+        prev = None
+        for start in range(0, len(values), block_size):
+            block = Block(values[start:start + block_size])
+            if prev is None:
+                lst.head = block
+            else:
+                prev.next = block
+            prev = block
+        lst.tail = prev
+        lst._size = len(values)
+        return lst
+
+    # --- Изменение ---
+
+    def append(self, value):
+        """Добавляет значение в конец списка."""
+        if self._reversed:
+            self._apply_reverse()
+        tail = self.tail
+        if tail is None or len(tail.values) >= self.block_size:
+            block = Block([value])
+            if tail is None:
+                self.head = block
+            else:
+                tail.next = block
+            self.tail = block
+        else:
+            tail.normalize()
+            tail.values.append(value)
+        self._size += 1
+
+    def reverse(self, lazy=True):
+        """
+        Реверс списка.
+        lazy=True  — O(1), только флаг списка;
+        lazy=False — O(число блоков), ссылки между блоками разворачиваются сразу.
+        """
+        self._reversed = not self._reversed
+        if not lazy:
+            self._apply_reverse()
+        return self
+
+    def _apply_reverse(self):
+        """Применяет отложенный реверс: три указателя по блокам + флаги блоков."""
+        if not self._reversed:
+            return
+        prev = None
+        current = self.head
+        self.tail = current
+        while current is not None:
+            next_block = current.next
+            current.next = prev
+            current.reversed = not current.reversed
+            prev = current
+            current = next_block
+        self.head = prev
+        self._reversed = False
+
+    # --- Доступ к данным ---
+
+    def _blocks(self):
+        """Блоки в логическом порядке (с учётом флага списка)."""
+        blocks = []
+        current = self.head
+        while current is not None:
+            blocks.append(current)
+            current = current.next
+        if self._reversed:
+            blocks.reverse()
+        return blocks
+
+    def __iter__(self):
+        flip = self._reversed
+        for block in self._blocks():
+            if block.reversed != flip:
+                yield from reversed(block.values)
+            else:
+                yield from block.values
+
+    def to_values(self):
+        """Преобразует список в обычный Python-список (аналог list_to_values)."""
+        result = []
+        flip = self._reversed
+        for block in self._blocks():
+            if block.reversed != flip:
+                result.extend(block.values[::-1])
+            else:
+                result.extend(block.values)
+        return result
+
+    def __getitem__(self, index):
+        size = self._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("индекс за пределами списка")
+        if self._reversed:
+            index = size - 1 - index
+
+        # Идём по физическому порядку блоков, пропуская целые блоки
+        block = self.head
+        while index >= len(block.values):
+            index -= len(block.values)
+            block = block.next
+        if block.reversed:
+            index = len(block.values) - 1 - index
+        return block.values[index]
+
+    def __len__(self):
+        return self._size
+
+    def block_count(self):
+        """Число блоков в списке."""
+        count = 0
+        current = self.head
+        while current is not None:
+            count += 1
+            current = current.next
+        return count
+
+    def __repr__(self):
+        return " -> ".join(map(str, self)) or "<пустой список>"
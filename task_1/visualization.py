@@ -1,6 +1,9 @@
+import gc
 import time
 import tracemalloc
 from algorithm import build_list, reverse_linked_list, build_list_from_values, list_to_values
+from array_list import ArrayLinkedList
+from unrolled_list import UnrolledLinkedList
 
 def demo_example():
     values = [1, 2, 3, 4, 5]
@@ -26,11 +29,94 @@ def measure_reverse(head, n_desc):
     print(f"(Это O(1) — не зависит от размера данных)")
     return rev_head
 
+def _timed(func, *args):
+    """Время выполнения func(*args) без tracemalloc; возвращает (результат, секунды)."""
+    gc.collect()
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start_time
+
+def _peak_memory(func, *args):
+    """Пиковая память (байты), выделенная во время func(*args)."""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak_memory
+
+def benchmark_array_list(n):
+    """Сравнивает ListNode-цепочку и ArrayLinkedList: построение, реверс, память."""
+    print(f"\n--- Сравнение ListNode и ArrayLinkedList (n = {n}) ---")
+
+    head, build_nodes = _timed(build_list, n)
+    _, reverse_nodes = _timed(reverse_linked_list, head)
+    del head
+    lst, build_array = _timed(ArrayLinkedList.from_range, n)
+    _, reverse_array = _timed(lst.reverse)
+    del lst
+
+    memory_nodes = _peak_memory(build_list, n)
+    memory_array = _peak_memory(ArrayLinkedList.from_range, n)
+
+    print(f"{'':<22}{'ListNode':>14}{'ArrayLinkedList':>18}")
+    print(f"{'Построение, с':<22}{build_nodes:>14.4f}{build_array:>18.4f}")
+    print(f"{'Реверс, с':<22}{reverse_nodes:>14.4f}{reverse_array:>18.4f}")
+    print(f"{'Память, байт':<22}{memory_nodes:>14}{memory_array:>18}")
+    if memory_array:
+        print(f"Экономия памяти: ×{memory_nodes / memory_array:.1f}")
+
+def benchmark_unrolled(n, rounds=10):
+    """
+    Сравнивает многократный реверс + полный обход: ListNode (три указателя)
+    против UnrolledLinkedList (ленивый и немедленный реверс блоков).
+    """
+    print(f"\n--- Реверс и обход: ListNode и UnrolledLinkedList (n = {n}, раундов: {rounds}) ---")
+
+    def nodes_rounds(head):
+        for _ in range(rounds):
+            head = reverse_linked_list(head)
+            list_to_values(head)
+        return head
+
+    def unrolled_rounds(lst, lazy):
+        for _ in range(rounds):
+            lst.reverse(lazy=lazy)
+            lst.to_values()
+        return lst
+
+    head = build_list(n)
+    _, nodes_time = _timed(nodes_rounds, head)
+    del head
+    lst = UnrolledLinkedList.from_iterable(range(1, n + 1))
+    _, lazy_time = _timed(unrolled_rounds, lst, True)
+    _, eager_time = _timed(unrolled_rounds, lst, False)
+    _, reverse_only = _timed(lst.reverse, False)
+
+    print(f"ListNode, три указателя:          {nodes_time:.4f} с")
+    print(f"Unrolled, ленивый реверс (O(1)):  {lazy_time:.4f} с")
+    print(f"Unrolled, реверс блоков:          {eager_time:.4f} с")
+    print(f"Один реверс {lst.block_count()} блоков:        {reverse_only:.6f} с")
+
+def demo_benchmark():
+    print("\nВыберите размер списка для сравнения:")
+    print("1) 10^5 элементов")
+    print("2) 10^6 элементов")
+    print("3) 10^7 элементов (нужно несколько ГБ памяти для ListNode)")
+    size_choice = input("Ваш выбор (1/2/3): ").strip()
+    size_map = {"1": 10**5, "2": 10**6, "3": 10**7}
+    n = size_map.get(size_choice, 10**5)
+    benchmark_array_list(n)
+    benchmark_unrolled(n)
+    print()
+
 def demo_reversal():
     print("=== Демонстрация реверса ===")
     print("1) Ввести список вручную")
     print("2) Использовать сгенерированный список")
-    choice = input("Ваш выбор (1/2): ").strip()
+    print("3) Сравнить ListNode, ArrayLinkedList и UnrolledLinkedList на больших списках")
+    choice = input("Ваш выбор (1/2/3): ").strip()
     
     if choice == "1":
         # Ручной ввод
@@ -79,6 +165,9 @@ def demo_reversal():
         head_for_measure = build_list(n)
         measure_reverse(head_for_measure, f"n = {n}")
         print()
+
+    elif choice == "3":
+        demo_benchmark()
         
     else:
         print("Неверный выбор. Завершение.\n")
@@ -0,0 +1,148 @@
+# Файл: benchmark.py
+# Сравнение построчного (main_simple) и быстрого (main) ввода-вывода task_2
+# на входе максимального размера.
+#
+# Запуск:
+#   python benchmark.py                       # d = q = 100 000, n = 10
+#   python benchmark.py --d 50000 --n 20 --q 100000
+#
+# Оба режима запускаются в одном процессе с подменой stdin/stdout;
+# вывод сверяется побайтово.
+#
+# Перед замерами — проверка хранилища признаков (feature_store.py): после
+# write-through файл содержит все обновления, включая пришедшие после
+# последнего запроса типа 1, у обоих движков; режим read отклоняет
+# обновления PermissionError. Журнал overlay виден в любом режиме
+# и не переживает convert. Отдельно — вход с n = 0 (объекты без признаков)
+# во всех движках и в шардах.
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import task_2
+from engines import np
+from feature_store import FeatureStore, convert_text
+
+
+def generate_input(n, d, q, k_max=10, seed=0):
+    """Генерирует текст входа: n признаков, d объектов, q запросов (50/50 типы 1 и 2)."""
+    rng = random.Random(seed)
+    lines = [str(n), ' '.join(str(rng.randint(-100, 100)) for _ in range(n)), str(d)]
+    for _ in range(d):
+        lines.append(' '.join(str(rng.randint(0, 10**6)) for _ in range(n)))
+    lines.append(str(q))
+    for _ in range(q):
+        if rng.random() < 0.5:
+            lines.append(f"1 {rng.randint(1, k_max)}")
+        else:
+            lines.append(f"2 {rng.randint(1, d)} {rng.randint(1, n)} {rng.randint(0, 10**6)}")
+    return '\n'.join(lines) + '\n'
+
+
+def run(entry, text):
+    """Запускает entry() с text в stdin; возвращает (вывод в байтах, секунды)."""
+    raw = text.encode()
+    stdin = io.TextIOWrapper(io.BytesIO(raw), encoding='utf-8')
+    stdout = io.StringIO()
+    saved = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = stdin, stdout
+    try:
+        start = time.perf_counter()
+        entry()
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdin, sys.stdout = saved
+    return stdout.getvalue().encode(), elapsed
+
+
+def check_store():
+    """
+    Обновления доходят до файла в write-through; read их отклоняет.
+    Журнал overlay учитывается в read и write-through и сбрасывается convert.
+    """
+    setup = b"2\n1 1\n3\n1 2\n3 4\n5 6\n"
+    # Обновления типа 2 после последнего запроса типа 1
+    queries = b"3\n1 2\n2 1 1 100\n2 2 2 50\n"
+    expected = [100, 2, 3, 50, 5, 6]
+    backends = ("python", "numpy") if np is not None else ("python",)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.bin")
+        for backend in backends:
+            convert_text(io.BytesIO(setup), path)
+            with FeatureStore(path, "write-through") as store:
+                assert task_2.solve(queries, backend, store=store) == "3 2\n"
+            with FeatureStore(path) as store:
+                assert [x for row in store.rows() for x in row] == expected, backend
+            with FeatureStore(path, "read") as store:
+                try:
+                    task_2.solve(b"1\n2 1 1 7\n", backend, store=store)
+                except PermissionError:
+                    pass
+                else:
+                    raise AssertionError(f"{backend}: режим read принял обновление")
+
+            convert_text(io.BytesIO(setup), path)
+            with FeatureStore(path, "overlay") as store:
+                task_2.solve(b"1\n2 1 1 100\n", backend, store=store)
+            for mode in ("read", "overlay"):
+                with FeatureStore(path, mode) as store:
+                    assert task_2.solve(b"1\n1 3\n", backend, store=store) == "1 3 2\n", mode
+            # write-through сначала переносит журнал в файл, и он больше не проигрывается
+            with FeatureStore(path, "write-through") as store:
+                task_2.solve(b"1\n2 1 1 200\n", backend, store=store)
+            assert not os.path.exists(path + ".log"), backend
+            with FeatureStore(path, "overlay") as store:
+                assert store.rows()[0][0] == 200, backend
+                task_2.solve(b"1\n2 1 1 7\n", backend, store=store)
+            convert_text(io.BytesIO(b"1\n1\n1\n5\n"), path)
+            with FeatureStore(path) as store:
+                assert store.rows()[0][0] == 5, backend
+    print(f"Хранилище: write-through, read, журнал overlay и convert проверены ({', '.join(backends)})")
+
+
+def check_no_features():
+    """n = 0: d объектов с нулевой релевантностью, в одном процессе и в шардах."""
+    data = b"0\n\n3\n\n\n\n2\n1 2\n1 5\n"
+    backends = ("python", "numpy") if np is not None else ("python",)
+    for backend in backends:
+        for shards in (0, 2):
+            assert task_2.solve(data, backend, shards=shards) == "1 2\n1 2 3\n", (backend, shards)
+    print(f"n = 0: движки и шарды проверены ({', '.join(backends)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение режимов ввода-вывода task_2")
+    parser.add_argument('--n', type=int, default=10, help='число признаков')
+    parser.add_argument('--d', type=int, default=100_000, help='число объектов')
+    parser.add_argument('--q', type=int, default=100_000, help='число запросов')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    check_store()
+    check_no_features()
+
+    print(f"Генерация входа: n = {args.n}, d = {args.d}, q = {args.q} ...")
+    text = generate_input(args.n, args.d, args.q, seed=args.seed)
+    print(f"Размер входа: {len(text) / 2**20:.1f} МБ")
+
+    simple_out, simple_time = run(task_2.main_simple, text)
+    fast_out, fast_time = run(lambda: task_2.main([]), text)
+
+    print(f"main_simple (input/print): {simple_time:.3f} с")
+    print(f"main (буферизованный):     {fast_time:.3f} с")
+    print(f"Ускорение: ×{simple_time / fast_time:.2f}")
+    print("Вывод совпадает побайтово" if simple_out == fast_out else "ОШИБКА: вывод различается")
+
+    if np is not None:
+        numpy_out, numpy_time = run(lambda: task_2.main(["--engine", "numpy"]), text)
+        print(f"main --engine numpy:       {numpy_time:.3f} с")
+        print("Вывод NumPy-движка совпадает" if numpy_out == simple_out else "ОШИБКА: вывод NumPy-движка различается")
+
+
+if __name__ == "__main__":
+    main()
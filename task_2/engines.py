@@ -0,0 +1,201 @@
+# Файл: engines.py
+# Движки вычисления релевантности для task_2.
+#
+# Оба движка реализуют один интерфейс:
+#   top(k)          — номера (с 1) k самых релевантных объектов
+#   update(i, j, v) — признак j объекта i (оба с 0) становится равен v
+#   set_coefficient(j, v) — коэффициент a[j] (с 0) становится равен v;
+#                     релевантность всех объектов меняется одним проходом
+#                     relevance += F[:, j] * (v - a[j]), индекс строится заново
+#   flush()         — применяет отложенные обновления (признаки поверх
+#                     отображённого файла после этого записаны в него)
+#
+# PythonEngine — чистый Python: релевантность в списке, порядок в RankingIndex.
+# NumpyEngine  — признаки в матрице d×n (int64), релевантность = F @ a.
+#                Обновления типа 2 копятся и применяются пакетом перед
+#                ближайшим запросом типа 1; топ-k — argpartition + устойчивая
+#                сортировка k победителей. Результаты топ-k кэшируются в
+#                TopKCache и при немногих обновлениях чинятся инкрементально.
+#
+# NumpyEngine выигрывает на построении (большие n и d) и на сериях запросов
+# типа 1 с редкими обновлениями между ними; при частых обновлениях сотен
+# объектов подряд полная пересборка стоит O(d), и быстрее PythonEngine.
+#
+# NumPy — необязательная зависимость: без неё доступен только PythonEngine.
+# NumpyEngine считает в int64; результаты совпадают с PythonEngine,
+# пока релевантности помещаются в 64-битное целое.
+
+from operator import mul
+
+from ranking_index import RankingIndex
+from topk_cache import TopKCache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не установлен — остаётся чистый Python
+    np = None
+
+
+class PythonEngine:
+    """Релевантность в списке Python, порядок — в декартовом дереве."""
+
+    def __init__(self, a, features):
+        self.a = a
+        self.features = features  # features[i] — список признаков объекта i
+        self.relevance = [sum(map(mul, a, f_i)) for f_i in features]
+        self.index = RankingIndex.from_relevance(self.relevance)
+
+    @classmethod
+    def from_flat(cls, a, flat, d=None):
+        """
+        Создаёт движок из признаков, записанных подряд (d·n чисел).
+        d нужен при n = 0: тогда число объектов по flat не восстановить.
+        """
+        n = len(a)
+        if d is None:
+            d = len(flat) // n if n else 0
+        return cls(a, [flat[i * n:(i + 1) * n] for i in range(d)])
+
+    def top(self, k):
+        return self.index.top(k)
+
+    def flush(self):
+        """Обновления применяются сразу — откладывать нечего."""
+
+    def update(self, i, j, v):
+        row = self.features[i]
+        old_rel = self.relevance[i]
+        new_rel = old_rel + self.a[j] * (v - row[j])
+        row[j] = v
+        self.relevance[i] = new_rel
+        self.index.update(i + 1, old_rel, new_rel)
+
+    def set_coefficient(self, j, v):
+        delta = v - self.a[j]
+        if delta == 0:
+            return
+        self.a[j] = v
+        self.relevance = [rel + row[j] * delta
+                          for rel, row in zip(self.relevance, self.features)]
+        # Порядок меняется у многих объектов сразу — строим индекс целиком
+        self.index = RankingIndex.from_relevance(self.relevance)
+
+
+class NumpyEngine:
+    """Векторизованный движок: матрица признаков d×n и вектор релевантности."""
+
+    def __init__(self, a, features, cache_capacity=64, max_dirty=1024):
+        if np is None:
+            raise ImportError("NumpyEngine требует установленный NumPy")
+        self.a = np.asarray(a, dtype=np.int64)
+        features = np.asarray(features, dtype=np.int64)
+        # Плоский вход — d·n чисел; при n = 0 матрицу d×0 передаёт from_flat
+        self.features = features if features.ndim == 2 else features.reshape(-1, len(self.a))
+        self.relevance = self.features @ self.a
+        # Отложенные обновления типа 2: (объект, признак, значение)
+        self._rows = []
+        self._cols = []
+        self._vals = []
+        self.cache = TopKCache(cache_capacity, max_dirty)
+
+    @classmethod
+    def from_flat(cls, a, flat, d=None, **cache_options):
+        """Создаёт движок из признаков, записанных подряд (d·n чисел); d — как у PythonEngine."""
+        n = len(a)
+        if d is None:
+            d = len(flat) // n if n else 0
+        return cls(a, np.array(flat, dtype=np.int64).reshape(d, n), **cache_options)
+
+    def update(self, i, j, v):
+        self._rows.append(i)
+        self._cols.append(j)
+        self._vals.append(v)
+
+    def flush(self):
+        """Применяет накопленные обновления одним пакетом."""
+        if not self._rows:
+            return
+        rows = np.array(self._rows, dtype=np.int64)
+        cols = np.array(self._cols, dtype=np.int64)
+        vals = np.array(self._vals, dtype=np.int64)
+        self._rows, self._cols, self._vals = [], [], []
+
+        # Для каждой клетки (i, j) важно только последнее значение пакета:
+        # промежуточные изменения релевантности взаимно сокращаются.
+        cells = rows * self.features.shape[1] + cols
+        _, last_from_end = np.unique(cells[::-1], return_index=True)
+        keep = len(cells) - 1 - last_from_end
+        rows, cols, vals = rows[keep], cols[keep], vals[keep]
+
+        delta = self.a[cols] * (vals - self.features[rows, cols])
+        self.features[rows, cols] = vals
+        np.add.at(self.relevance, rows, delta)
+        self.cache.invalidate((rows + 1).tolist())
+
+    def set_coefficient(self, j, v):
+        # Отложенные обновления признаков считаются по старому коэффициенту
+        self.flush()
+        delta = v - self.a[j]
+        if delta == 0:
+            return
+        self.a[j] = v
+        self.relevance += self.features[:, j] * delta
+        self.cache.clear()
+
+    def top(self, k):
+        self.flush()
+        return self.cache.top(k, self._relevance_of, self._select_top)
+
+    def _relevance_of(self, ids):
+        return self.relevance[np.asarray(ids, dtype=np.int64) - 1].tolist()
+
+    def _select_top(self, k):
+        """Пары (релевантность, номер) k лучших объектов — полный пересчёт за O(d)."""
+        relevance = self.relevance
+        d = len(relevance)
+        k = min(k, d)
+        if k <= 0:
+            return []
+        if k < d:
+            # argpartition выбирает k лучших, но среди равных на границе —
+            # произвольных; добираем равные с наименьшими номерами.
+            part = np.argpartition(-relevance, k - 1)[:k]
+            threshold = relevance[part].min()
+            above = np.flatnonzero(relevance > threshold)
+            ties = np.flatnonzero(relevance == threshold)[:k - len(above)]
+            winners = np.concatenate((above, ties))
+        else:
+            winners = np.arange(d)
+        # Сортировка по (релевантность по убыванию, номер по возрастанию)
+        winners = winners[np.lexsort((winners, -relevance[winners]))]
+        return list(zip(relevance[winners].tolist(), (winners + 1).tolist()))
+
+
+ENGINES = {"python": PythonEngine, "numpy": NumpyEngine}
+
+
+def resolve_backend(backend):
+    """Имя движка: 'auto' заменяется на 'numpy' или 'python'."""
+    if backend == "auto":
+        backend = "numpy" if np is not None else "python"
+    if backend not in ENGINES:
+        raise ValueError(f"неизвестный движок: {backend!r}")
+    return backend
+
+
+def make_engine(a, flat_features, backend="python", d=None):
+    """
+    Создаёт движок по имени: 'python', 'numpy' или 'auto'
+    ('numpy', если NumPy установлен, иначе 'python').
+    flat_features — признаки всех объектов подряд, d·n чисел; d обязателен
+    при n = 0, иначе выводится из длины flat_features.
+    """
+    return ENGINES[resolve_backend(backend)].from_flat(a, flat_features, d)
+
+
+def make_engine_from(backend, a, features):
+    """
+    Создаёт движок поверх готовых коэффициентов и признаков без копирования
+    (например, отображённых в память, см. feature_store.py).
+    """
+    return ENGINES[resolve_backend(backend)](a, features)
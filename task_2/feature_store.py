@@ -0,0 +1,284 @@
+# Файл: feature_store.py
+# Бинарное хранилище коэффициентов и матрицы признаков для task_2.
+#
+# Формат файла (все числа — little-endian int64, кроме заголовка):
+#   magic    4 байта  b"RNKF"
+#   version  uint32   1
+#   n        int64    число признаков
+#   d        int64    число объектов
+#   a[n]     int64    коэффициенты формулы
+#   F[d*n]   int64    признаки, построчно (объект за объектом)
+#
+# Файл открывается через mmap (numpy.memmap, если NumPy установлен):
+# открытие не читает данные, страницы подгружаются по мере обращения
+# и разделяются между процессами через кэш страниц ОС.
+#
+# Режимы записи обновлений (запросы типа 2 и 3):
+#   "read"          — только чтение, изменения запрещены;
+#   "write-through" — изменения пишутся прямо в отображённый файл;
+#   "overlay"       — файл отображается с копированием при записи, изменения
+#                     видны только процессу и дописываются в журнал
+#                     <путь>.log; compact() переносит его в основной файл.
+#
+# Непустой журнал учитывается в любом режиме: "read" и "overlay"
+# проигрывают его в копии страниц, "write-through" перед открытием
+# переносит его в файл — иначе запись в файл разошлась бы с журналом,
+# а следующий overlay затёр бы её старыми значениями. convert заменяет
+# данные целиком и удаляет журнал прежнего файла.
+#
+# Запуск:
+#   python feature_store.py convert input.txt store.bin [--queries queries.txt]
+#   python feature_store.py compact store.bin
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не установлен — работаем через mmap + memoryview
+    np = None
+
+MAGIC = b"RNKF"
+VERSION = 1
+HEADER = struct.Struct("<4sIqq")   # magic, version, n, d
+LOG_RECORD = struct.Struct("<qqqq")  # тип запроса (2 или 3), i, j, v
+
+MODES = ("read", "write-through", "overlay")
+
+if sys.byteorder != "little":
+    raise ImportError("feature_store поддерживает только little-endian платформы")
+
+
+def _apply_log(data, a_view, f_view, n):
+    """Применяет записи журнала к отображению; обрезанный хвост игнорируется."""
+    usable = len(data) - len(data) % LOG_RECORD.size
+    for kind, i, j, v in LOG_RECORD.iter_unpack(data[:usable]):
+        if kind == 2:
+            f_view[i * n + j] = v
+        else:
+            a_view[j] = v
+
+
+def _log_path(path):
+    return path + ".log"
+
+
+def _has_log(path):
+    """Есть ли у файла непустой журнал overlay."""
+    try:
+        return os.path.getsize(_log_path(path)) > 0
+    except FileNotFoundError:
+        return False
+
+
+def _read_ints(stream):
+    """Читает строку из бинарного потока и возвращает её числа."""
+    return array("q", map(int, stream.readline().split()))
+
+
+def convert_text(src, dst_path, queries=None):
+    """
+    Переводит текстовый вход task_2 (бинарный поток src) в файл dst_path.
+    Признаки читаются и пишутся построчно — весь вход в память не грузится.
+    Остаток входа (q и запросы) копируется в поток queries, если он передан.
+    Возвращает (n, d).
+    """
+    n = int(src.readline())
+    a = _read_ints(src)
+    d = int(src.readline())
+    if len(a) != n:
+        raise ValueError(f"ожидалось {n} коэффициентов, получено {len(a)}")
+
+    with open(dst_path, "wb") as dst:
+        dst.write(HEADER.pack(MAGIC, VERSION, n, d))
+        dst.write(a.tobytes())
+        for i in range(d):
+            row = _read_ints(src)
+            if len(row) != n:
+                raise ValueError(f"объект {i + 1}: ожидалось {n} признаков, получено {len(row)}")
+            dst.write(row.tobytes())
+
+    # Журнал относился к прежнему содержимому dst_path
+    if os.path.exists(_log_path(dst_path)):
+        os.remove(_log_path(dst_path))
+
+    if queries is not None:
+        for chunk in iter(lambda: src.read(1 << 20), b""):
+            queries.write(chunk)
+    return n, d
+
+
+class FeatureStore:
+    """Отображённый в память файл коэффициентов и признаков."""
+
+    def __init__(self, path, mode="read"):
+        if mode not in MODES:
+            raise ValueError(f"неизвестный режим: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.log_path = _log_path(path)
+        self._log = None
+
+        with open(path, "rb") as f:
+            magic, version, self.n, self.d = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: не файл признаков версии {VERSION}")
+        self._a_offset = HEADER.size
+        self._f_offset = HEADER.size + 8 * self.n
+
+        if mode == "write-through" and _has_log(path):
+            self.compact()
+        replay = mode == "overlay" or mode == "read" and _has_log(path)
+
+        if mode == "write-through":
+            access = mmap.ACCESS_WRITE
+        elif replay:
+            access = mmap.ACCESS_COPY
+        else:
+            access = mmap.ACCESS_READ
+        with open(path, "rb" if access == mmap.ACCESS_READ else "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=access)
+        self._view = memoryview(self._mmap)
+        self._a_view = self._view[self._a_offset:self._f_offset].cast("q")
+        self._f_view = self._view[self._f_offset:].cast("q")
+
+        if replay:
+            self._replay_log()
+        if mode == "overlay":
+            self._log = open(self.log_path, "ab")
+
+    # --- Доступ к данным ---
+
+    def coefficients(self):
+        """Коэффициенты: массив NumPy (если установлен) или memoryview."""
+        if np is not None:
+            return np.frombuffer(self._a_view, dtype=np.int64)
+        return self._a_view
+
+    def matrix(self):
+        """Матрица признаков d×n как массив NumPy поверх отображения (без копии)."""
+        if np is None:
+            raise ImportError("matrix() требует установленный NumPy")
+        return np.frombuffer(self._f_view, dtype=np.int64).reshape(self.d, self.n)
+
+    def rows(self):
+        """Список строк признаков — срезы memoryview, поддерживают row[j] = v."""
+        n = self.n
+        view = self._f_view
+        return [view[i * n:(i + 1) * n] for i in range(self.d)]
+
+    def make_engine(self, backend="python"):
+        """Создаёт движок task_2 поверх отображения — без копирования признаков."""
+        from engines import make_engine_from, resolve_backend
+
+        backend = resolve_backend(backend)
+        if backend == "numpy":
+            return make_engine_from(backend, self.coefficients(), self.matrix())
+        return make_engine_from(backend, self._a_view, self.rows())
+
+    # --- Журнал обновлений ---
+
+    def record(self, kind, i, j, v):
+        """
+        Фиксирует обновление, уже применённое движком к отображению.
+        kind = 2 — признак j объекта i; kind = 3 — коэффициент j (i не используется).
+        В режиме overlay запись дописывается в журнал.
+        """
+        if self.mode == "read":
+            raise PermissionError("хранилище открыто только для чтения")
+        if self._log is not None:
+            self._log.write(LOG_RECORD.pack(kind, i, j, v))
+
+    def _replay_log(self):
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as log:
+                _apply_log(log.read(), self._a_view, self._f_view, self.n)
+
+    def compact(self):
+        """Переносит журнал в основной файл и очищает его."""
+        if self._log is not None:
+            self._log.flush()
+        with open(self.path, "r+b") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE)
+            view = memoryview(mm)
+            a_view = view[self._a_offset:self._f_offset].cast("q")
+            f_view = view[self._f_offset:].cast("q")
+            if os.path.exists(self.log_path):
+                with open(self.log_path, "rb") as log:
+                    _apply_log(log.read(), a_view, f_view, self.n)
+            a_view.release()
+            f_view.release()
+            view.release()
+            mm.flush()
+            mm.close()
+        if self._log is not None:
+            self._log.truncate(0)
+        elif os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def flush(self):
+        """Сбрасывает изменения на диск (журнал или отображение)."""
+        if self._log is not None:
+            self._log.flush()
+        elif self.mode == "write-through":
+            self._mmap.flush()
+
+    def close(self):
+        """
+        Сбрасывает изменения и закрывает отображение. Массивы, строки и
+        движки, полученные от хранилища, к этому моменту должны быть
+        освобождены — иначе mmap не закроется (BufferError).
+        """
+        if self._mmap is None:
+            return
+        self.flush()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self._a_view.release()
+        self._f_view.release()
+        self._view.release()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бинарное хранилище признаков task_2")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="текстовый вход → бинарный файл")
+    convert.add_argument("src", help="текстовый вход task_2 ('-' — stdin)")
+    convert.add_argument("dst", help="путь к бинарному файлу")
+    convert.add_argument("--queries", help="куда сохранить запросы из входа")
+    compact = sub.add_parser("compact", help="перенести журнал overlay в файл")
+    compact.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        src = sys.stdin.buffer if args.src == "-" else open(args.src, "rb")
+        queries = open(args.queries, "wb") if args.queries else None
+        try:
+            n, d = convert_text(src, args.dst, queries)
+        finally:
+            if src is not sys.stdin.buffer:
+                src.close()
+            if queries is not None:
+                queries.close()
+        print(f"Записано: n = {n}, d = {d} → {args.dst}")
+    else:
+        with FeatureStore(args.path, "overlay") as store:
+            store.compact()
+        print(f"Журнал перенесён в {args.path}")
+
+
+if __name__ == "__main__":
+    main()
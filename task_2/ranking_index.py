@@ -0,0 +1,156 @@
+# Файл: ranking_index.py
+# Упорядоченный индекс объектов по релевантности для task_2.
+#
+# Структура: декартово дерево (treap) — двоичное дерево поиска по ключу
+# и одновременно куча по случайному приоритету. Ожидаемая высота O(log d).
+#
+# Ключ объекта — пара (-релевантность, номер): сначала более релевантные,
+# при равной релевантности — с меньшим номером. Это в точности порядок
+# устойчивой сортировки indexed.sort(key=..., reverse=True) из task_2.py.
+#
+# Сложность:
+#   - Построение: O(d log d) — сортировка + O(d) сборка дерева стеком
+#   - Обновление релевантности: O(log d) — удаление + вставка
+#   - Топ-k: O(k + log d) — in-order обход с остановкой после k узлов
+#   - Память: O(d)
+
+import random
+
+
+class _Node:
+    """Узел декартова дерева."""
+    __slots__ = ("rel", "obj", "priority", "left", "right")
+
+    def __init__(self, rel, obj, priority):
+        self.rel = rel          # релевантность
+        self.obj = obj          # номер объекта (с 1)
+        self.priority = priority
+        self.left = None
+        self.right = None
+
+
+def _before(rel_a, obj_a, rel_b, obj_b):
+    """True, если объект a стоит в рейтинге раньше объекта b."""
+    return rel_a > rel_b or (rel_a == rel_b and obj_a < obj_b)
+
+
+def _split(node, rel, obj):
+    """Делит поддерево на (ключи раньше (rel, obj), остальные)."""
+    if node is None:
+        return None, None
+    if _before(node.rel, node.obj, rel, obj):
+        left, right = _split(node.right, rel, obj)
+        node.right = left
+        return node, right
+    left, right = _split(node.left, rel, obj)
+    node.left = right
+    return left, node
+
+
+def _merge(left, right):
+    """Сливает два дерева, где все ключи left раньше ключей right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return left
+    right.left = _merge(left, right.left)
+    return right
+
+
+class RankingIndex:
+    """Индекс объектов, упорядоченных по убыванию релевантности."""
+
+    def __init__(self):
+        self.root = None
+        self._size = 0
+
+    @classmethod
+    def from_relevance(cls, relevance):
+        """
+        Строит индекс по списку релевантностей (объект i+1 — relevance[i]).
+        Сортировка O(d log d), затем сборка декартова дерева стеком за O(d).
+        """
+        index = cls()
+        order = sorted(range(len(relevance)), key=lambda i: -relevance[i])
+        rand = random.random
+        stack = []  # правая граница дерева
+        for i in order:
+            node = _Node(relevance[i], i + 1, rand())
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        index.root = stack[0] if stack else None
+        index._size = len(order)
+        return index
+
+    def insert(self, rel, obj):
+        """Добавляет объект obj с релевантностью rel. O(log d)."""
+        node = _Node(rel, obj, random.random())
+        parent = None
+        current = self.root
+        # Спускаемся, пока приоритет текущего узла выше нового
+        while current is not None and current.priority > node.priority:
+            parent = current
+            if _before(rel, obj, current.rel, current.obj):
+                current = current.left
+            else:
+                current = current.right
+        node.left, node.right = _split(current, rel, obj)
+        if parent is None:
+            self.root = node
+        elif _before(rel, obj, parent.rel, parent.obj):
+            parent.left = node
+        else:
+            parent.right = node
+        self._size += 1
+
+    def remove(self, rel, obj):
+        """Удаляет объект obj с релевантностью rel. O(log d)."""
+        parent = None
+        current = self.root
+        while current is not None and not (current.rel == rel and current.obj == obj):
+            parent = current
+            if _before(rel, obj, current.rel, current.obj):
+                current = current.left
+            else:
+                current = current.right
+        if current is None:
+            raise KeyError((rel, obj))
+        merged = _merge(current.left, current.right)
+        if parent is None:
+            self.root = merged
+        elif parent.left is current:
+            parent.left = merged
+        else:
+            parent.right = merged
+        self._size -= 1
+
+    def update(self, obj, old_rel, new_rel):
+        """Меняет релевантность объекта obj. O(log d)."""
+        if old_rel != new_rel:
+            self.remove(old_rel, obj)
+            self.insert(new_rel, obj)
+
+    def top(self, k):
+        """Номера k самых релевантных объектов. O(k + log d)."""
+        result = []
+        stack = []
+        current = self.root
+        while (stack or current is not None) and len(result) < k:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            result.append(current.obj)
+            current = current.right
+        return result
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,252 @@
+# Файл: sharded.py
+# Шардированный движок task_2: объекты распределены по процессам-воркерам.
+#
+# Объекты делятся на S непрерывных диапазонов номеров (шардов). Каждый шард
+# обслуживает отдельный процесс со своим движком (PythonEngine или
+# NumpyEngine), который владеет признаками и релевантностью своих объектов.
+#
+# Обмен данными без pickle:
+#   - признаки один раз кладутся в multiprocessing.shared_memory
+#     (int64 подряд), воркеры работают прямо с этим блоком памяти;
+#   - команды и ответы идут через Pipe как упакованные байты
+#     (struct / array('q')).
+#
+# Весь поток запросов можно выполнить пакетом (run): ответы на запросы
+# типа 1 не меняют состояние, поэтому каждый шард получает один раз свою
+# часть потока (свои обновления + все запросы типов 1 и 3), проигрывает её
+# независимо от других и возвращает все локальные топы одним сообщением.
+#
+# Запросы по одному (top/update/set_coefficient):
+#   - тип 2 — буферизуется и отправляется владельцу шарда пакетом перед
+#     ближайшим запросом другого типа;
+#   - тип 3 — рассылается всем шардам;
+#   - тип 1 — каждый шард возвращает свой локальный топ-k (релевантность,
+#     номер), родитель сливает k-путевым слиянием heapq.merge по ключу
+#     (-релевантность, номер) — тот же порядок, что и у одного процесса.
+#
+# Релевантности передаются как int64 — как и в NumpyEngine.
+
+import heapq
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from itertools import islice
+from multiprocessing import Pipe, Process, shared_memory
+
+from engines import make_engine_from, np, resolve_backend
+
+_TOP = b"T"
+_UPDATE = b"U"
+_COEF = b"C"
+_BATCH = b"B"
+_STOP = b"S"
+_INT = struct.Struct("<q")
+_PAIR = struct.Struct("<qq")
+
+
+def _local_top(engine, k, lo):
+    """Локальный топ-k шарда: массив [релевантность, номер, ...] с глобальными номерами."""
+    ids = engine.top(k)
+    # Список релевантности PythonEngine пересоздаётся запросом типа 3
+    relevance = engine.relevance
+    reply = array("q")
+    for obj in ids:
+        reply.append(int(relevance[obj - 1]))
+        reply.append(obj + lo)
+    return reply
+
+
+def _run_batch(engine, records, lo):
+    """
+    Выполняет пакет запросов (записи по 4 числа, см. ShardedEngine.run)
+    и возвращает ответы на запросы типа 1 подряд: [длина, пары...]...
+    """
+    replies = array("q")
+    for idx in range(0, len(records), 4):
+        kind, x, y, z = records[idx:idx + 4]
+        if kind == 1:
+            reply = _local_top(engine, x, lo)
+            replies.append(len(reply) // 2)
+            replies.extend(reply)
+        elif kind == 2:
+            engine.update(x - lo, y, z)
+        else:
+            engine.set_coefficient(x, y)
+    return replies
+
+
+def _worker(conn, shm_name, n, lo, hi, backend):
+    """Цикл воркера: владеет объектами lo..hi-1 (с 0)."""
+    # Воркеры — дочерние процессы и делят с родителем resource_tracker,
+    # поэтому повторная регистрация блока безопасна; удаляет его родитель.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    # Блок не короче байта: при n = 0 цен нет, и срез пустой
+    view = shm.buf.cast("B")[:_INT.size * n * (hi + 1)].cast("q")
+    # Коэффициенты копируются: каждый шард меняет свою копию при запросе типа 3
+    a = list(view[:n])
+    features = view[n + lo * n:n + hi * n]
+    if backend == "numpy":
+        a = np.array(a, dtype=np.int64)
+        features = np.frombuffer(features, dtype=np.int64).reshape(hi - lo, n)
+    else:
+        features = [features[i * n:(i + 1) * n] for i in range(hi - lo)]
+    engine = make_engine_from(backend, a, features)
+
+    try:
+        while True:
+            message = conn.recv_bytes()
+            command, payload = message[:1], message[1:]
+            if command == _TOP:
+                (k,) = _INT.unpack(payload)
+                conn.send_bytes(_local_top(engine, k, lo).tobytes())
+            elif command == _UPDATE:
+                batch = array("q")
+                batch.frombytes(payload)
+                for idx in range(0, len(batch), 3):
+                    engine.update(batch[idx] - lo, batch[idx + 1], batch[idx + 2])
+            elif command == _COEF:
+                engine.set_coefficient(*_PAIR.unpack(payload))
+            elif command == _BATCH:
+                records = array("q")
+                records.frombytes(payload)
+                conn.send_bytes(_run_batch(engine, records, lo).tobytes())
+            else:
+                break
+    finally:
+        del engine, features
+        view.release()
+        shm.close()
+
+
+class ShardedEngine:
+    """Движок с интерфейсом PythonEngine/NumpyEngine поверх пула процессов."""
+
+    def __init__(self, a, flat_features, workers=None, backend="python", d=None):
+        backend = resolve_backend(backend)
+        n = len(a)
+        if d is None:
+            d = len(flat_features) // n if n else 0
+        shards = max(1, min(workers or os.cpu_count() or 1, d or 1))
+
+        data = array("q", a)
+        data.extend(flat_features)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(data.itemsize * len(data), 1))
+        shared = self._shm.buf.cast("B")[:len(data) * data.itemsize].cast("q")
+        shared[:] = data
+        shared.release()
+        del data
+
+        # bounds[s] — первый объект шарда s (с 0)
+        self._bounds = [d * s // shards for s in range(shards + 1)]
+        self._conns = []
+        self._procs = []
+        self._pending = [array("q") for _ in range(shards)]
+        for s in range(shards):
+            parent_conn, child_conn = Pipe()
+            proc = Process(target=_worker, daemon=True,
+                           args=(child_conn, self._shm.name, n,
+                                 self._bounds[s], self._bounds[s + 1], backend))
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+    def update(self, i, j, v):
+        shard = bisect_right(self._bounds, i) - 1
+        self._pending[shard].extend((i, j, v))
+
+    def _flush(self):
+        for conn, batch in zip(self._conns, self._pending):
+            if batch:
+                conn.send_bytes(_UPDATE + batch.tobytes())
+                del batch[:]
+
+    def set_coefficient(self, j, v):
+        self._flush()
+        message = _COEF + _PAIR.pack(j, v)
+        for conn in self._conns:
+            conn.send_bytes(message)
+
+    def _merge(self, local, k):
+        """k-путевое слияние локальных топов по (-релевантность, номер)."""
+        merged = heapq.merge(*local, key=lambda pair: (-pair[0], pair[1]))
+        return [obj for _, obj in islice(merged, k)]
+
+    def run(self, records):
+        """
+        Выполняет весь поток запросов за один обмен сообщениями с шардами.
+        records — array('q') записей по 4 числа:
+            (1, k, 0, 0)   — топ-k,
+            (2, i, j, v)   — обновление признака (i, j с 0),
+            (3, j, v, 0)   — новый коэффициент a[j] (j с 0).
+        Ответы типа 1 не влияют на состояние, поэтому каждый шард проигрывает
+        свою часть потока независимо. Возвращает список ответов на запросы типа 1.
+        """
+        self._flush()
+        shard_records = [array("q") for _ in self._conns]
+        top_ks = []
+        for idx in range(0, len(records), 4):
+            record = records[idx:idx + 4]
+            if record[0] == 2:
+                shard_records[bisect_right(self._bounds, record[1]) - 1].extend(record)
+            else:
+                if record[0] == 1:
+                    top_ks.append(record[1])
+                for batch in shard_records:
+                    batch.extend(record)
+        for conn, batch in zip(self._conns, shard_records):
+            conn.send_bytes(_BATCH + batch.tobytes())
+
+        # Разбираем ответы каждого шарда на списки пар по запросам
+        per_shard = []
+        for conn in self._conns:
+            replies = array("q")
+            replies.frombytes(conn.recv_bytes())
+            answers = []
+            pos = 0
+            while pos < len(replies):
+                length = replies[pos]
+                chunk = replies[pos + 1:pos + 1 + 2 * length]
+                answers.append(list(zip(chunk[0::2], chunk[1::2])))
+                pos += 1 + 2 * length
+            per_shard.append(answers)
+        return [self._merge([answers[q] for answers in per_shard], k)
+                for q, k in enumerate(top_ks)]
+
+    def top(self, k):
+        self._flush()
+        request = _TOP + _INT.pack(k)
+        for conn in self._conns:
+            conn.send_bytes(request)
+        # Ответы шардов уже отсортированы по (-релевантность, номер)
+        local = []
+        for conn in self._conns:
+            reply = array("q")
+            reply.frombytes(conn.recv_bytes())
+            local.append(zip(reply[0::2], reply[1::2]))
+        return self._merge(local, k)
+
+    def close(self):
+        """Останавливает воркеры и освобождает общую память."""
+        for conn in self._conns:
+            try:
+                conn.send_bytes(_STOP)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join()
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._procs = []
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,21 +1,158 @@
 
 # Временная сложность:
 # - Инициализация: O(d * n) — чтение признаков и вычисление начальной релевантности.
+# - Построение индекса релевантности: O(d log d).
 # - Обработка запросов:
-#     * Тип 1 ("1 k"): O(d log d) — сортировка всех объектов по релевантности.
-#     * Тип 2 ("2 i j v"): O(1) — обновление одного признака и пересчёт релевантности.
-# - В худшем случае (q запросов типа 1): O(q * d log d).
-# - При ограничениях (d, q ≤ 100 000) и небольшом q это приемлемо.
+#     * Тип 1 ("1 k"): O(k + log d) — первые k узлов упорядоченного индекса.
+#     * Тип 2 ("2 i j v"): O(log d) — пересчёт релевантности и перестановка
+#       объекта в индексе.
+#     * Тип 3 ("3 j v"): O(d log d) — новый коэффициент a[j]; релевантность
+#       всех объектов сдвигается одним проходом на f[j] * (v - a[j]),
+#       индекс строится заново целиком.
+# - В худшем случае: O(d log d + q * (k + log d)).
 #
 # Пространственная сложность:
 # - Хранение признаков: O(d * n)
-# - Хранение релевантности: O(d)
-# - Вспомогательный массив для сортировки: O(d)
+# - Хранение релевантности и индекса: O(d)
 # - Общая память: O(d * n), что укладывается в лимиты.
+#
+# Ввод-вывод:
+# - main() читает весь stdin одним вызовом sys.stdin.buffer.read(), разбивает
+#   его на массив целых чисел и печатает весь ответ одним sys.stdout.write.
+# - Движок релевантности выбирается флагом --engine (см. engines.py):
+#   python (по умолчанию) или numpy — векторизованный вариант.
+# - --shards N распределяет объекты по N процессам (см. sharded.py).
+# - --store PATH берёт коэффициенты и признаки из бинарного файла,
+#   отображённого в память (см. feature_store.py), вместо stdin.
+# - main_simple() — построчный вариант через input()/print(); вывод побайтово
+#   совпадает с main(), используется для сравнения в benchmark.py.
 
+import argparse
 import sys
+from array import array
+
+from engines import make_engine
+from feature_store import FeatureStore
+from ranking_index import RankingIndex
+from sharded import ShardedEngine
+
+def solve(data, backend="python", stats=None, store=None, shards=0):
+    """
+    Обрабатывает весь ввод (bytes или str) и возвращает весь вывод строкой.
+    backend — движок релевантности: 'python', 'numpy' или 'auto' (см. engines.py).
+    stats — если передан словарь, в него записываются счётчики кэша топ-k.
+    store — открытое хранилище FeatureStore; тогда коэффициенты и признаки
+            берутся из него, а data содержит только q и запросы.
+    shards — если больше 0, объекты распределяются по стольким процессам
+             (см. sharded.py).
+    """
+    tokens = list(map(int, data.split()))
+    pos = 0
+
+    if store is not None:
+        engine = store.make_engine(backend)
+    else:
+        # Этап 1: параметры формулы
+        n = tokens[pos]
+        a = tokens[pos + 1:pos + 1 + n]
+        pos += 1 + n
+
+        # Этап 2: объекты; начальную релевантность считает движок
+        d = tokens[pos]
+        pos += 1
+        if shards > 0:
+            engine = ShardedEngine(a, tokens[pos:pos + d * n], shards, backend, d)
+        else:
+            engine = make_engine(a, tokens[pos:pos + d * n], backend, d)
+        pos += d * n
+
+    # Этапы 3–4: запросы; ответы копятся в списке строк
+    q = tokens[pos]
+    pos += 1
+    out = []
+    if isinstance(engine, ShardedEngine):
+        # Весь поток запросов — одним пакетом на каждый шард
+        records = array('q')
+        for _ in range(q):
+            if tokens[pos] == 1:
+                records.extend((1, tokens[pos + 1], 0, 0))
+                pos += 2
+            elif tokens[pos] == 2:
+                obj_num, feat_num, new_val = tokens[pos + 1:pos + 4]
+                records.extend((2, obj_num - 1, feat_num - 1, new_val))
+                pos += 4
+            else:
+                records.extend((3, tokens[pos + 1] - 1, tokens[pos + 2], 0))
+                pos += 3
+        try:
+            out = [' '.join(map(str, ids)) for ids in engine.run(records)]
+        finally:
+            engine.close()
+        return '\n'.join(out) + '\n' if out else ''
+
+    # Движок пишет прямо в отображение файла — в режиме read проверяем заранее
+    read_only = store is not None and store.mode == "read"
+    for _ in range(q):
+        if tokens[pos] == 1:
+            k = tokens[pos + 1]
+            pos += 2
+            out.append(' '.join(map(str, engine.top(k))))
+        elif read_only:
+            raise PermissionError("хранилище открыто только для чтения (--store-mode read): "
+                                  "запросы типов 2 и 3 запрещены")
+        elif tokens[pos] == 2:
+            obj_num, feat_num, new_val = tokens[pos + 1:pos + 4]
+            pos += 4
+            engine.update(obj_num - 1, feat_num - 1, new_val)
+            if store is not None:
+                store.record(2, obj_num - 1, feat_num - 1, new_val)
+        else:
+            feat_num, new_coef = tokens[pos + 1:pos + 3]
+            pos += 3
+            engine.set_coefficient(feat_num - 1, new_coef)
+            if store is not None:
+                store.record(3, 0, feat_num - 1, new_coef)
+
+    if store is not None:
+        # Отложенные обновления NumpyEngine должны попасть в файл до close()
+        engine.flush()
+    if stats is not None and hasattr(engine, "cache"):
+        stats.update(engine.cache.stats())
+    return '\n'.join(out) + '\n' if out else ''
+
+
+def main(argv=None):
+    """Быстрый режим: весь stdin одним чтением, весь ответ одной записью."""
+    parser = argparse.ArgumentParser(description="Ранжирование объектов по релевантности")
+    parser.add_argument("--engine", choices=("python", "numpy", "auto"), default="python",
+                        help="движок релевантности; auto — NumPy, если он установлен")
+    parser.add_argument("--stats", action="store_true",
+                        help="вывести в stderr счётчики кэша топ-k (hits/misses/repairs)")
+    parser.add_argument("--store", metavar="PATH",
+                        help="бинарное хранилище признаков (feature_store.py); "
+                             "stdin тогда содержит только q и запросы")
+    parser.add_argument("--store-mode", choices=("write-through", "overlay", "read"),
+                        default="overlay", help="куда писать обновления хранилища")
+    parser.add_argument("--shards", type=int, default=0, metavar="N",
+                        help="распределить объекты по N процессам (без --store)")
+    args = parser.parse_args(argv)
+    if args.shards and args.store:
+        parser.error("--shards нельзя совмещать с --store")
+    stats = {} if args.stats else None
+    if args.store:
+        with FeatureStore(args.store, args.store_mode) as store:
+            try:
+                sys.stdout.write(solve(sys.stdin.buffer.read(), args.engine, stats, store))
+            except PermissionError as error:
+                parser.exit(1, f"ошибка: {error}\n")
+    else:
+        sys.stdout.write(solve(sys.stdin.buffer.read(), args.engine, stats, shards=args.shards))
+    if stats:
+        print(' '.join(f"{name}={value}" for name, value in stats.items()), file=sys.stderr)
 
-def main():
+
+def main_simple():
+    """Построчный режим: input() на каждую строку, print() на каждый ответ."""
     # Этап 1: чтение параметров формулы
     n = int(input())  # количество признаков у каждого объекта
     a = list(map(int, input().split()))  # коэффициенты a[0] ... a[n-1]
@@ -31,6 +168,9 @@ def main():
         # Вычисляем релевантность: sum(a[j] * f_i[j] for all j)
         relevance[i] = sum(a[j] * f_i[j] for j in range(n))
 
+    # Упорядоченный индекс: (релевантность по убыванию, номер по возрастанию)
+    index = RankingIndex.from_relevance(relevance)
+
     # Этап 3: чтение количества запросов
     q = int(input())  # число запросов
 
@@ -41,12 +181,9 @@ def main():
         if query[0] == 1:
             # Запрос типа 1: вывести k самых релевантных объектов
             k = query[1]
-            # Создаём список пар (релевантность, номер_объекта_с_1)
-            indexed = [(relevance[i], i + 1) for i in range(d)]
-            # Сортируем по убыванию релевантности
-            indexed.sort(key=lambda x: x[0], reverse=True)
-            # Извлекаем первые k номеров
-            result = [str(obj[1]) for obj in indexed[:k]]
+            # Первые k объектов индекса — в том же порядке, что дала бы
+            # устойчивая сортировка по убыванию релевантности
+            result = [str(obj) for obj in index.top(k)]
             print(' '.join(result))
             
         elif query[0] == 2:
@@ -64,8 +201,22 @@ def main():
             # Обновляем признак
             features[i][j] = new_val
             # Пересчитываем релевантность с учётом изменения
+            old_rel = relevance[i]
             relevance[i] += a[j] * (new_val - old_val)
+            # Переставляем объект в индексе
+            index.update(obj_num, old_rel, relevance[i])
             # Ничего не выводим
 
+        elif query[0] == 3:
+            # Запрос типа 3: изменить коэффициент формулы
+            j = query[1] - 1        # номер признака (1-based → 0-based)
+            new_coef = query[2]
+            delta = new_coef - a[j]
+            a[j] = new_coef
+            # Сдвигаем релевантность всех объектов и строим индекс заново
+            for i in range(d):
+                relevance[i] += features[i][j] * delta
+            index = RankingIndex.from_relevance(relevance)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+# Файл: topk_cache.py
+# Кэш результатов запросов «топ-k» с версией (эпохой) обновлений.
+#
+# Кэш хранит отсортированный префикс рейтинга — K лучших объектов по ключу
+# (-релевантность, номер) — и «границу»: ключ K-го объекта на момент
+# последней полной пересборки. Все объекты вне префикса, не менявшиеся
+# с тех пор, лежат строго за границей.
+#
+# Каждое обновление увеличивает эпоху и помечает объект «грязным».
+# Запрос топ-k:
+#   - эпоха не менялась и k ≤ длины префикса          → попадание (hit), O(k);
+#   - грязных объектов немного                          → ремонт (repair):
+#       грязные удаляются из префикса и вставляются заново, если их новый
+#       ключ раньше границы; O(K + D·log K) для D грязных объектов;
+#   - грязных много или k больше префикса              → промах (miss),
+#       полная пересборка префикса размера max(k, capacity).
+#
+# После ремонта префикс по-прежнему точен: в нём ровно все объекты с ключом
+# раньше границы, поэтому его длина может уменьшиться, но не стать неверной.
+
+from bisect import insort
+
+
+class TopKCache:
+    """Отсортированный префикс рейтинга с инкрементальным ремонтом."""
+
+    def __init__(self, capacity=64, max_dirty=1024):
+        self.capacity = capacity    # минимальный размер префикса K
+        self.max_dirty = max_dirty  # больше грязных объектов — полная пересборка
+        self.epoch = 0              # счётчик обновлений
+        self.hits = 0
+        self.misses = 0
+        self.repairs = 0
+        self._synced_epoch = -1     # эпоха, которой соответствует префикс
+        self._prefix = []           # [(-релевантность, номер), ...] по возрастанию
+        self._boundary = None       # ключ K-го объекта; None — префикс содержит всех
+        self._dirty = set()
+
+    def invalidate(self, ids):
+        """Отмечает изменение релевантности объектов ids."""
+        self._dirty.update(ids)
+        self.epoch += 1
+
+    def clear(self):
+        """Сбрасывает префикс целиком (например, при смене формулы)."""
+        self._prefix = []
+        self._boundary = None
+        self._dirty.clear()
+        self._synced_epoch = -1
+        self.epoch += 1
+
+    def top(self, k, relevance_of, select_top):
+        """
+        Номера k лучших объектов.
+        relevance_of(ids)  — текущие релевантности объектов ids;
+        select_top(K)      — полный пересчёт: пары (релевантность, номер)
+                             K лучших объектов в порядке рейтинга.
+        """
+        if self._synced_epoch == self.epoch:
+            if self._covers(k):
+                self.hits += 1
+                return self._ids(k)
+        elif self._synced_epoch >= 0 and len(self._dirty) <= self.max_dirty:
+            self._repair(relevance_of)
+            if self._covers(k):
+                self.repairs += 1
+                return self._ids(k)
+        self._rebuild(max(k, self.capacity), select_top)
+        self.misses += 1
+        return self._ids(k)
+
+    def _covers(self, k):
+        """Префикс содержит ответ на запрос топ-k."""
+        return k <= len(self._prefix) or self._boundary is None
+
+    def _ids(self, k):
+        return [obj for _, obj in self._prefix[:k]]
+
+    def _repair(self, relevance_of):
+        dirty = self._dirty
+        prefix = [item for item in self._prefix if item[1] not in dirty]
+        boundary = self._boundary
+        ids = list(dirty)
+        for rel, obj in zip(relevance_of(ids), ids):
+            key = (-rel, obj)
+            if boundary is None or key < boundary:
+                insort(prefix, key)
+        self._prefix = prefix
+        dirty.clear()
+        self._synced_epoch = self.epoch
+
+    def _rebuild(self, size, select_top):
+        pairs = select_top(size)
+        self._prefix = [(-rel, obj) for rel, obj in pairs]
+        # Если выбраны не все объекты — запоминаем границу префикса
+        self._boundary = self._prefix[-1] if len(pairs) == size and pairs else None
+        self._dirty.clear()
+        self._synced_epoch = self.epoch
+
+    def stats(self):
+        """Счётчики для подбора capacity и max_dirty."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "repairs": self.repairs,
+            "prefix": len(self._prefix),
+            "epoch": self.epoch,
+        }
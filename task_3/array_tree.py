@@ -0,0 +1,722 @@
+# task_3/array_tree.py
+#
+# Красно-чёрное дерево на параллельных типизированных массивах
+# (struct-of-arrays) с тем же публичным интерфейсом, что у RedBlackTree.
+#
+# Узел — это индекс i, его поля лежат в массивах:
+#   keys[i]   — ключ (64-битное целое, array('q'))
+#   counts[i] — сколько раз вставлен ключ
+#   sizes[i]  — сумма counts по поддереву (для rank/select)
+#   left[i], right[i], parent[i] — индексы соседей
+#   colors[i] — 1 = красный, 0 = чёрный (bytearray)
+# Индекс 0 — общий чёрный NIL-лист. Освобождённые при удалении узлы
+# связываются в список свободных (через left) и используются повторно.
+#
+# Память: 6 × 8 байт + 1 байт ≈ 49 байт на уникальный ключ против ~90 байт
+# у RBNode (объект с семью слотами + отдельный объект int для ключа).
+# Кроме того, массивы не отслеживаются циклическим сборщиком мусора.
+# Плата — скорость: каждое чтение из array создаёт объект int, поэтому
+# вставка в чистом Python медленнее, чем у дерева из объектов.
+#
+# Алгоритмы вставки, удаления и запросов — те же, что в task_3.py
+# (при одинаковой последовательности операций получаются одинаковые деревья).
+# Массовая загрузка тоже общая: from_sorted строит ту же форму и раскраску,
+# insert_many сортирует пачку и пересобирает дерево или вставляет от пальца,
+# union/merge сливают обходы range() — в том числе с деревом из объектов.
+
+from array import array
+
+from task_3 import _fold_sorted, _merge_counted
+from tree_format import read_tree, write_tree
+
+NIL = 0
+RED = 1
+BLACK = 0
+
+
+class ArrayRedBlackTree:
+    """Красно-чёрное дерево с узлами-индексами в массивах array/bytearray."""
+
+    NIL = NIL
+
+    def __init__(self):
+        # Ячейка 0 — NIL: чёрный, size = count = 0
+        self.keys = array("q", [0])
+        self.counts = array("q", [0])
+        self.sizes = array("q", [0])
+        self.left = array("q", [NIL])
+        self.right = array("q", [NIL])
+        self.parent = array("q", [NIL])
+        self.colors = bytearray([BLACK])
+        self.root = NIL
+        self._free = NIL  # голова списка свободных ячеек
+
+    # --- Выделение ячеек ---
+
+    def _new_node(self, key, parent):
+        """Красный лист с ключом key; ячейка берётся из списка свободных или дописывается."""
+        node = self._free
+        if node != NIL:
+            self._free = self.left[node]
+            self.keys[node] = key
+            self.counts[node] = 1
+            self.sizes[node] = 1
+            self.left[node] = NIL
+            self.right[node] = NIL
+            self.parent[node] = parent
+            self.colors[node] = RED
+            return node
+        node = len(self.keys)
+        self.keys.append(key)
+        self.counts.append(1)
+        self.sizes.append(1)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.parent.append(parent)
+        self.colors.append(RED)
+        return node
+
+    def _release(self, node):
+        self.left[node] = self._free
+        self._free = node
+
+    # --- Вставка ---
+
+    def insert(self, key):
+        """Вставить ключ. Если уже есть — увеличить счётчик."""
+        keys = self.keys
+        sizes = self.sizes
+        left = self.left
+        right = self.right
+        parent = NIL
+        current = self.root
+        # Один спуск: ключ добавится в поддеревья всех узлов пути
+        while current:
+            sizes[current] += 1
+            current_key = keys[current]
+            if key == current_key:
+                self.counts[current] += 1
+                return
+            parent = current
+            current = left[current] if key < current_key else right[current]
+
+        node = self._new_node(key, parent)
+        if parent == NIL:
+            self.root = node
+        elif key < keys[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        self._fix_insert(node)
+
+    def insert_many(self, keys):
+        """
+        Вставить пачку ключей (как RedBlackTree.insert_many). Пачка сортируется.
+        Если она не меньше дерева, дерево пересобирается слиянием за O(n + m).
+        Иначе ключи вставляются по возрастанию поиском от «пальца».
+        """
+        batch = sorted(keys)
+        if not batch:
+            return
+        if len(batch) >= len(self):
+            self._replace(self._from_counted(
+                _merge_counted(self.range(), _fold_sorted(batch))))
+            return
+        finger = NIL
+        for key in batch:
+            finger = self._insert_from(finger, key)
+
+    def _insert_from(self, finger, key):
+        """
+        Вставка key ≥ keys[finger] поиском от пальца (см. RedBlackTree._insert_from);
+        возвращает узел с ключом key. Экономит только сравнения: size предков
+        start увеличивается до корня, вставка остаётся Θ(log n).
+        """
+        keys = self.keys
+        sizes = self.sizes
+        left = self.left
+        right = self.right
+        parent_of = self.parent
+        root = self.root
+        start = root
+        if finger != NIL:
+            start = finger
+            while start != root:
+                parent = parent_of[start]
+                if start == left[parent] and key < keys[parent]:
+                    break
+                start = parent
+        ancestor = parent_of[start]
+        while ancestor:
+            sizes[ancestor] += 1
+            ancestor = parent_of[ancestor]
+
+        parent = parent_of[start]
+        current = start
+        while current:
+            sizes[current] += 1
+            current_key = keys[current]
+            if key == current_key:
+                self.counts[current] += 1
+                return current
+            parent = current
+            current = left[current] if key < current_key else right[current]
+
+        node = self._new_node(key, parent)
+        if parent == NIL:
+            self.root = node
+        elif key < keys[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        self._fix_insert(node)
+        return node
+
+    # --- Массовая загрузка ---
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """
+        Построить дерево из неубывающей последовательности ключей за O(n)
+        (форма и раскраска — как у RedBlackTree.from_sorted). Повторы
+        сворачиваются в count. Неотсортированный вход — ValueError.
+        """
+        keys = array("q")
+        counts = array("q")
+        for key in iterable:
+            if keys:
+                last = keys[-1]
+                if key == last:
+                    counts[-1] += 1
+                    continue
+                if key < last:
+                    raise ValueError("ключи должны идти в неубывающем порядке")
+            keys.append(key)
+            counts.append(1)
+        return cls._from_columns(keys, counts)
+
+    @classmethod
+    def _from_counted(cls, pairs):
+        """Дерево из отсортированных пар (ключ, счётчик) с различными ключами."""
+        keys = array("q")
+        counts = array("q")
+        for key, count in pairs:
+            keys.append(key)
+            counts.append(count)
+        return cls._from_columns(keys, counts)
+
+    @classmethod
+    def _from_columns(cls, keys, counts):
+        """Дерево из столбцов различных ключей по возрастанию и их счётчиков."""
+        n = len(keys)
+        tree = cls()
+        tree.keys.extend(keys)
+        tree.counts.extend(counts)
+        tree.colors.extend(bytes(n))
+        zeros = array("q", bytes(8 * n))
+        for column in (tree.sizes, tree.left, tree.right, tree.parent):
+            column.extend(zeros)
+        tree.root = tree._link_balanced(n)
+        return tree
+
+    def _link_balanced(self, n):
+        """
+        Связать ячейки 1..n (в порядке ключей) в сбалансированное дерево;
+        вернуть корень. Рекурсия глубиной ⌊log₂ n⌋, как в RedBlackTree.
+        """
+        if not n:
+            return NIL
+        left = self.left
+        right = self.right
+        parent = self.parent
+        sizes = self.sizes
+        counts = self.counts
+        colors = self.colors
+        red_depth = n.bit_length() - 1
+
+        def link(lo, hi, depth, above):
+            mid = (lo + hi) >> 1
+            node = mid + 1  # ячейка 0 — NIL
+            parent[node] = above
+            size = counts[node]
+            if lo < mid:
+                child = left[node] = link(lo, mid, depth + 1, node)
+                size += sizes[child]
+            if mid + 1 < hi:
+                child = right[node] = link(mid + 1, hi, depth + 1, node)
+                size += sizes[child]
+            sizes[node] = size
+            if depth == red_depth:
+                colors[node] = RED
+            return node
+
+        root = link(0, n, 0, NIL)
+        colors[root] = BLACK
+        return root
+
+    def union(self, other):
+        """
+        Новое дерево — объединение мультимножеств (счётчики складываются). O(n + m).
+        other — любое дерево с range(): ArrayRedBlackTree или RedBlackTree.
+        """
+        return self._from_counted(_merge_counted(self.range(), other.range()))
+
+    def merge(self, other):
+        """Влить other в это дерево (other не меняется). O(n + m)."""
+        self._replace(self.union(other))
+
+    def _replace(self, tree):
+        """Забрать массивы другого дерева."""
+        self.keys = tree.keys
+        self.counts = tree.counts
+        self.sizes = tree.sizes
+        self.left = tree.left
+        self.right = tree.right
+        self.parent = tree.parent
+        self.colors = tree.colors
+        self.root = tree.root
+        self._free = tree._free
+
+    def _fix_insert(self, node):
+        """Балансировка после вставки (случаи те же, что в RedBlackTree._fix_insert)."""
+        colors = self.colors
+        left = self.left
+        right = self.right
+        parent_of = self.parent
+        parent = parent_of[node]
+        while colors[parent]:  # родитель красный
+            grandparent = parent_of[parent]
+            if parent == left[grandparent]:
+                uncle = right[grandparent]
+                if colors[uncle]:
+                    # Случай 1: дядя красный → перекраска, подъём
+                    colors[parent] = BLACK
+                    colors[uncle] = BLACK
+                    colors[grandparent] = RED
+                    node = grandparent
+                    parent = parent_of[node]
+                    continue
+                if node == right[parent]:
+                    # Случай 2 → сводим к случаю 3
+                    node = parent
+                    self._left_rotate(node)
+                    parent = parent_of[node]
+                    grandparent = parent_of[parent]
+                # Случай 3
+                colors[parent] = BLACK
+                colors[grandparent] = RED
+                self._right_rotate(grandparent)
+                break
+            else:
+                uncle = left[grandparent]
+                if colors[uncle]:
+                    colors[parent] = BLACK
+                    colors[uncle] = BLACK
+                    colors[grandparent] = RED
+                    node = grandparent
+                    parent = parent_of[node]
+                    continue
+                if node == left[parent]:
+                    node = parent
+                    self._right_rotate(node)
+                    parent = parent_of[node]
+                    grandparent = parent_of[parent]
+                colors[parent] = BLACK
+                colors[grandparent] = RED
+                self._left_rotate(grandparent)
+                break
+        colors[self.root] = BLACK
+
+    # --- Повороты ---
+
+    def _left_rotate(self, x):
+        left = self.left
+        right = self.right
+        parent_of = self.parent
+        sizes = self.sizes
+        y = right[x]
+        child = right[x] = left[y]
+        if child != NIL:
+            parent_of[child] = x
+        parent = parent_of[y] = parent_of[x]
+        if parent == NIL:
+            self.root = y
+        elif x == left[parent]:
+            left[parent] = y
+        else:
+            right[parent] = y
+        left[y] = x
+        parent_of[x] = y
+        sizes[y] = sizes[x]
+        sizes[x] = sizes[left[x]] + sizes[right[x]] + self.counts[x]
+
+    def _right_rotate(self, y):
+        left = self.left
+        right = self.right
+        parent_of = self.parent
+        sizes = self.sizes
+        x = left[y]
+        child = left[y] = right[x]
+        if child != NIL:
+            parent_of[child] = y
+        parent = parent_of[x] = parent_of[y]
+        if parent == NIL:
+            self.root = x
+        elif y == right[parent]:
+            right[parent] = x
+        else:
+            left[parent] = x
+        right[x] = y
+        parent_of[y] = x
+        sizes[x] = sizes[y]
+        sizes[y] = sizes[left[y]] + sizes[right[y]] + self.counts[y]
+
+    # --- Удаление ---
+
+    def delete(self, key):
+        """
+        Удалить одно вхождение ключа. Пока count > 1, уменьшается счётчик;
+        последнее вхождение удаляет узел с балансировкой. Нет ключа — KeyError.
+        """
+        node = self._search_existing(key)
+        if node == NIL:
+            raise KeyError(key)
+        keys = self.keys
+        sizes = self.sizes
+        current = self.root
+        while current != node:
+            sizes[current] -= 1
+            current = self.left[current] if key < keys[current] else self.right[current]
+        sizes[node] -= 1
+        if self.counts[node] > 1:
+            self.counts[node] -= 1
+            return
+        self._remove_node(node)
+        self._release(node)
+
+    def _remove_node(self, z):
+        """Удаление узла z (CLRS); размеры предков z уже уменьшены."""
+        left = self.left
+        right = self.right
+        parent_of = self.parent
+        colors = self.colors
+        y = z
+        y_color = colors[y]
+        if left[z] == NIL:
+            x = right[z]
+            self._transplant(z, x)
+        elif right[z] == NIL:
+            x = left[z]
+            self._transplant(z, x)
+        else:
+            y = right[z]
+            while left[y] != NIL:
+                y = left[y]
+            y_color = colors[y]
+            x = right[y]
+            y_count = self.counts[y]
+            current = parent_of[y]
+            while current != z:
+                self.sizes[current] -= y_count
+                current = parent_of[current]
+            if parent_of[y] == z:
+                parent_of[x] = y
+            else:
+                self._transplant(y, x)
+                right[y] = right[z]
+                parent_of[right[y]] = y
+            self._transplant(z, y)
+            left[y] = left[z]
+            parent_of[left[y]] = y
+            colors[y] = colors[z]
+            self.sizes[y] = self.sizes[z]
+        if y_color == BLACK:
+            self._fix_delete(x)
+
+    def _transplant(self, u, v):
+        parent = self.parent[u]
+        if parent == NIL:
+            self.root = v
+        elif u == self.left[parent]:
+            self.left[parent] = v
+        else:
+            self.right[parent] = v
+        self.parent[v] = parent
+
+    def _fix_delete(self, x):
+        """Балансировка после удаления (случаи те же, что в RedBlackTree._fix_delete)."""
+        left = self.left
+        right = self.right
+        colors = self.colors
+        while x != self.root and colors[x] == BLACK:
+            parent = self.parent[x]
+            if x == left[parent]:
+                w = right[parent]
+                if colors[w]:
+                    colors[w] = BLACK
+                    colors[parent] = RED
+                    self._left_rotate(parent)
+                    w = right[parent]
+                if colors[left[w]] == BLACK and colors[right[w]] == BLACK:
+                    colors[w] = RED
+                    x = parent
+                else:
+                    if colors[right[w]] == BLACK:
+                        colors[left[w]] = BLACK
+                        colors[w] = RED
+                        self._right_rotate(w)
+                        w = right[parent]
+                    colors[w] = colors[parent]
+                    colors[parent] = BLACK
+                    colors[right[w]] = BLACK
+                    self._left_rotate(parent)
+                    x = self.root
+            else:
+                w = left[parent]
+                if colors[w]:
+                    colors[w] = BLACK
+                    colors[parent] = RED
+                    self._right_rotate(parent)
+                    w = left[parent]
+                if colors[left[w]] == BLACK and colors[right[w]] == BLACK:
+                    colors[w] = RED
+                    x = parent
+                else:
+                    if colors[left[w]] == BLACK:
+                        colors[right[w]] = BLACK
+                        colors[w] = RED
+                        self._left_rotate(w)
+                        w = left[parent]
+                    colors[w] = colors[parent]
+                    colors[parent] = BLACK
+                    colors[left[w]] = BLACK
+                    self._right_rotate(parent)
+                    x = self.root
+        colors[x] = BLACK
+
+    # --- Сохранение и загрузка (формат — tree_format.py) ---
+
+    def dump(self, path):
+        """Записать ключи, счётчики и цвета в прямом порядке обхода."""
+        keys = self.keys
+        counts = self.counts
+        colors = self.colors
+        left = self.left
+        right = self.right
+        order = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if right[node]:
+                stack.append(right[node])
+            if left[node]:
+                stack.append(left[node])
+        write_tree(path,
+                   array("q", [keys[i] for i in order]),
+                   array("q", [counts[i] for i in order]),
+                   bytearray(colors[i] for i in order))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Восстановить дерево из файла dump(). Столбцы ключей, счётчиков и цветов
+        читаются из файла целиком — узел i файла становится ячейкой i + 1;
+        ссылки и размеры вычисляются одним линейным проходом.
+        """
+        keys, counts, colors = read_tree(path)
+        n = len(keys)
+        tree = cls()
+        tree.keys.extend(keys)
+        tree.counts.extend(counts)
+        tree.colors.extend(colors)
+        zeros = array("q", bytes(8 * n))
+        for column in (tree.sizes, tree.left, tree.right, tree.parent):
+            column.extend(zeros)
+
+        keys = tree.keys
+        left = tree.left
+        right = tree.right
+        parent = tree.parent
+        stack = []
+        for node in range(1, n + 1):
+            key = keys[node]
+            # Первый узел — корень: ссылки остаются NIL
+            if stack:
+                if key < keys[stack[-1]]:
+                    left[stack[-1]] = node
+                    parent[node] = stack[-1]
+                else:
+                    above = stack.pop()
+                    while stack and keys[stack[-1]] < key:
+                        above = stack.pop()
+                    right[above] = node
+                    parent[node] = above
+            stack.append(node)
+        # Дети идут после родителя — размеры считаются с конца
+        sizes = tree.sizes
+        counts = tree.counts
+        for node in range(n, 0, -1):
+            sizes[node] = counts[node] + sizes[left[node]] + sizes[right[node]]
+        tree.root = 1 if n else NIL
+        return tree
+
+    # --- Поиск и запросы ---
+
+    def _search_existing(self, key):
+        """Индекс узла с ключом key или NIL (0)."""
+        keys = self.keys
+        left = self.left
+        right = self.right
+        current = self.root
+        while current:
+            current_key = keys[current]
+            if key == current_key:
+                return current
+            current = left[current] if key < current_key else right[current]
+        return NIL
+
+    def __len__(self):
+        return self.sizes[self.root]
+
+    def __contains__(self, key):
+        return self._search_existing(key) != NIL
+
+    def floor(self, key):
+        """Наибольший ключ ≤ key или None."""
+        return self._bound(key, inclusive=True, below=True)
+
+    def ceiling(self, key):
+        """Наименьший ключ ≥ key или None."""
+        return self._bound(key, inclusive=True, below=False)
+
+    def predecessor(self, key):
+        """Наибольший ключ < key или None."""
+        return self._bound(key, inclusive=False, below=True)
+
+    def successor(self, key):
+        """Наименьший ключ > key или None."""
+        return self._bound(key, inclusive=False, below=False)
+
+    def _bound(self, key, inclusive, below):
+        keys = self.keys
+        left = self.left
+        right = self.right
+        best = None
+        current = self.root
+        while current:
+            current_key = keys[current]
+            if current_key == key and inclusive:
+                return current_key
+            if below:
+                if current_key < key:
+                    best = current_key
+                    current = right[current]
+                else:
+                    current = left[current]
+            else:
+                if current_key > key:
+                    best = current_key
+                    current = left[current]
+                else:
+                    current = right[current]
+        return best
+
+    def rank(self, key):
+        """Сколько вставленных ключей (с повторами) строго меньше key."""
+        keys = self.keys
+        sizes = self.sizes
+        left = self.left
+        rank = 0
+        current = self.root
+        while current:
+            current_key = keys[current]
+            if key < current_key:
+                current = left[current]
+            elif key == current_key:
+                return rank + sizes[left[current]]
+            else:
+                rank += sizes[left[current]] + self.counts[current]
+                current = self.right[current]
+        return rank
+
+    def select(self, i):
+        """Ключ с номером i (с 0) в отсортированном порядке с учётом повторов."""
+        sizes = self.sizes
+        size = sizes[self.root]
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError("индекс вне дерева")
+        current = self.root
+        while True:
+            left_size = sizes[self.left[current]]
+            count = self.counts[current]
+            if i < left_size:
+                current = self.left[current]
+            elif i < left_size + count:
+                return self.keys[current]
+            else:
+                i -= left_size + count
+                current = self.right[current]
+
+    def range(self, lo=None, hi=None):
+        """
+        Ленивый обход пар (ключ, счётчик) с lo ≤ ключ < hi (None — без границы).
+        Дерево нельзя менять, пока генератор не исчерпан.
+        """
+        keys = self.keys
+        counts = self.counts
+        left = self.left
+        right = self.right
+        stack = []
+        current = self.root
+        while current:
+            if lo is None or keys[current] >= lo:
+                stack.append(current)
+                current = left[current]
+            else:
+                current = right[current]
+        while stack:
+            current = stack.pop()
+            key = keys[current]
+            if hi is not None and key >= hi:
+                return
+            yield key, counts[current]
+            current = right[current]
+            while current:
+                stack.append(current)
+                current = left[current]
+
+    def inorder(self):
+        """Возвращает отсортированный список: (ключ, цвет, счётчик)."""
+        keys = self.keys
+        counts = self.counts
+        colors = self.colors
+        left = self.left
+        right = self.right
+        result = []
+        stack = []
+        current = self.root
+        while stack or current:
+            while current:
+                stack.append(current)
+                current = left[current]
+            current = stack.pop()
+            color_str = 'RED' if colors[current] else 'BLACK'
+            result.append((keys[current], color_str, counts[current]))
+            current = right[current]
+        return result
+
+    def nbytes(self):
+        """Память массивов узлов в байтах (без запаса под рост)."""
+        return (sum(len(arr) * arr.itemsize
+                    for arr in (self.keys, self.counts, self.sizes,
+                                self.left, self.right, self.parent))
+                + len(self.colors))
+
+    def __repr__(self):
+        nodes = self.inorder()
+        if not nodes:
+            return "<пустое дерево>"
+        return " → ".join(f"{key}({color[0]})[{count}]" for key, color, count in nodes)
@@ -0,0 +1,279 @@
+# Файл: benchmark.py
+# Замеры вставки в красно-чёрное дерево task_3.
+#
+# Запуск:
+#   python benchmark.py                 # n = 1 000 000
+#   python benchmark.py --n 200000 --seed 1
+#
+# Для случайного и отсортированного порядка ключей замеряются:
+#   - insert() по одному ключу (сборщик мусора включён, как в обычной программе);
+#   - insert_many() — вся пачка сразу (в пустое дерево — сортировка и
+#     построение за O(n), см. from_sorted).
+# После каждого прогона проверяются свойства КЧ-дерева, поле size и содержимое
+# inorder().
+#
+# Затем деревья из объектов (RedBlackTree) и на массивах (ArrayRedBlackTree)
+# сравниваются по памяти на уникальный ключ (tracemalloc) и скорости вставки;
+# inorder() обоих деревьев должен совпадать вместе с цветами.
+#
+# В конце — массовая загрузка: from_sorted() по отсортированным ключам,
+# union() двух деревьев и insert_many() небольшой пачки в большое дерево;
+# ArrayRedBlackTree повторяет их и должен дать те же деревья.
+#
+# И чтение под нагрузкой записи: несколько потоков-читателей читают окна
+# range() и rank(), пока поток-писатель вставляет ключи. Сравниваются
+# ConcurrentTree (снимки без блокировок) и RedBlackTree под общим замком.
+#
+# Наконец, dump()/load(): загрузка из файла против повторной вставки ключей;
+# загруженное дерево должно совпадать с исходным вместе с цветами.
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from array_tree import ArrayRedBlackTree
+from task_3 import RED, ConcurrentTree, RedBlackTree
+
+
+def check_invariants(tree):
+    """Проверяет свойства 2, 4, 5, порядок ключей и size; возвращает чёрную высоту."""
+    nil = tree.NIL
+    assert tree.root.color is not RED, "корень красный"
+
+    def walk(node, lo, hi):
+        # Рекурсия безопасна: высота КЧ-дерева ≤ 2·log₂(n+1)
+        if node is nil:
+            return 1
+        assert (lo is None or lo < node.key) and (hi is None or node.key < hi), "нарушен порядок ключей"
+        if node.color is RED:
+            assert node.left.color is not RED and node.right.color is not RED, "два красных подряд"
+        for child in (node.left, node.right):
+            assert child is nil or child.parent is node, "неверная ссылка на родителя"
+        assert node.size == node.count + node.left.size + node.right.size, "неверный size"
+        left = walk(node.left, lo, node.key)
+        right = walk(node.right, node.key, hi)
+        assert left == right, "разная чёрная высота"
+        return left + (node.color is not RED)
+
+    return walk(tree.root, None, None)
+
+
+def verify(tree, keys):
+    """Сверяет inorder() с отсортированным мультимножеством ключей."""
+    check_invariants(tree)
+    expected = sorted(Counter(keys).items())
+    actual = [(key, count) for key, _, count in tree.inorder()]
+    assert actual == expected, "содержимое дерева не совпадает со вставленными ключами"
+
+
+def timed_insert(keys, bulk, factory=RedBlackTree):
+    tree = factory()
+    start = time.perf_counter()
+    if bulk:
+        tree.insert_many(keys)
+    else:
+        for key in keys:
+            tree.insert(key)
+    return tree, time.perf_counter() - start
+
+
+def insert_without_gc(factory, keys):
+    """Вставка по одному ключу с отключённым GC — одинаковые условия для обоих деревьев."""
+    gc.disable()
+    try:
+        return timed_insert(keys, bulk=False, factory=factory)
+    finally:
+        gc.enable()
+
+
+def memory_per_key(factory, keys):
+    """Байт на уникальный ключ: прирост памяти, выделенной при построении дерева."""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tree, _ = insert_without_gc(factory, keys)
+        used = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    return used / len(set(keys))
+
+
+def compare_backends(keys):
+    """Объекты против массивов: память на ключ, время вставки, совпадение деревьев."""
+    results = {}
+    for name, factory in (("RedBlackTree", RedBlackTree), ("ArrayRedBlackTree", ArrayRedBlackTree)):
+        tree, elapsed = insert_without_gc(factory, keys)
+        results[name] = tree.inorder()
+        del tree
+        per_key = memory_per_key(factory, keys)
+        print(f"{name:>18}: {per_key:6.1f} байт/ключ, "
+              f"{len(keys) / elapsed / 1e3:7.1f} тыс. вставок/с")
+    assert results["RedBlackTree"] == results["ArrayRedBlackTree"], "деревья различаются"
+    print("inorder() обоих деревьев совпадает (ключи, цвета, счётчики)")
+
+
+def bulk_load(keys):
+    """from_sorted, union и insert_many с проверкой свойств КЧ-дерева."""
+    keys = sorted(keys)
+    start = time.perf_counter()
+    tree = RedBlackTree.from_sorted(keys)
+    print(f"from_sorted({len(keys)}): {time.perf_counter() - start:.2f} с")
+    verify(tree, keys)
+    start = time.perf_counter()
+    array_tree = ArrayRedBlackTree.from_sorted(keys)
+    print(f"ArrayRedBlackTree.from_sorted({len(keys)}): {time.perf_counter() - start:.2f} с")
+    assert array_tree.inorder() == tree.inorder(), "from_sorted: деревья различаются"
+
+    half = len(keys) // 2
+    first = RedBlackTree.from_sorted(keys[:half])
+    second = RedBlackTree.from_sorted(keys[half:])
+    start = time.perf_counter()
+    merged = first.union(second)
+    print(f"union({half} + {len(keys) - half}): {time.perf_counter() - start:.2f} с")
+    verify(merged, keys)
+    array_merged = ArrayRedBlackTree.from_sorted(keys[:half]).union(
+        ArrayRedBlackTree.from_sorted(keys[half:]))
+    assert array_merged.inorder() == merged.inorder(), "union: деревья различаются"
+    del first, second, merged, array_merged
+
+    rng = random.Random(1)
+    batch = [rng.choice(keys) + 1 for _ in range(max(1, len(keys) // 20))]
+    start = time.perf_counter()
+    tree.insert_many(batch)
+    print(f"insert_many({len(batch)}) в дерево из {len(keys)}: {time.perf_counter() - start:.2f} с")
+    verify(tree, keys + batch)
+    array_tree.insert_many(batch)
+    assert array_tree.inorder() == tree.inorder(), "insert_many: деревья различаются"
+
+
+class _LockedTree:
+    """RedBlackTree под общим замком — то, что приходится делать без снимков."""
+
+    def __init__(self, keys):
+        self.tree = RedBlackTree.from_sorted(sorted(keys))
+        self.lock = threading.Lock()
+
+    def insert(self, key):
+        with self.lock:
+            self.tree.insert(key)
+
+    def read(self, lo, width):
+        with self.lock:
+            return sum(count for _, count in self.tree.range(lo, lo + width)), self.tree.rank(lo)
+
+
+class _SnapshotTree:
+    def __init__(self, keys):
+        self.tree = ConcurrentTree()
+        self.tree.insert_many(keys)
+
+    def insert(self, key):
+        self.tree.insert(key)
+
+    def read(self, lo, width):
+        snapshot = self.tree.snapshot()
+        return sum(count for _, count in snapshot.range(lo, lo + width)), snapshot.rank(lo)
+
+
+def reader_throughput(make, keys, readers=4, duration=1.0, width=100):
+    """Чтений окна в секунду у всех читателей и вставок в секунду у писателя."""
+    tree = make(keys)
+    span = 2 * len(keys)
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def reader(slot):
+        rng = random.Random(slot)
+        done = 0
+        while not stop.is_set():
+            tree.read(rng.randrange(-span, span), width)
+            done += 1
+        reads[slot] = done
+
+    def writer():
+        rng = random.Random(-1)
+        done = 0
+        while not stop.is_set():
+            tree.insert(rng.randrange(-span, span))
+            done += 1
+        writes[0] = done
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / duration, writes[0] / duration
+
+
+def dump_and_load(keys):
+    """Сохранение дерева и загрузка обоими классами; сверка с исходным деревом."""
+    tree = RedBlackTree()
+    tree.insert_many(keys)
+    expected = tree.inorder()
+    fd, path = tempfile.mkstemp(suffix=".rbt")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        tree.dump(path)
+        print(f"dump: {time.perf_counter() - start:.2f} с, {os.path.getsize(path) / 2**20:.1f} МБ")
+        for cls in (RedBlackTree, ArrayRedBlackTree):
+            start = time.perf_counter()
+            loaded = cls.load(path)
+            print(f"{cls.__name__}.load: {time.perf_counter() - start:.2f} с")
+            assert loaded.inorder() == expected, "загруженное дерево отличается"
+    finally:
+        os.remove(path)
+    _, elapsed = timed_insert(keys, bulk=False)
+    print(f"повторная вставка тех же ключей: {elapsed:.2f} с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры вставки в КЧ-дерево task_3")
+    parser.add_argument('--n', type=int, default=1_000_000, help='число ключей')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    random_keys = [rng.randint(-args.n, args.n) for _ in range(args.n)]
+    sorted_keys = list(range(args.n))
+
+    for name, keys in (("случайные", random_keys), ("отсортированные", sorted_keys)):
+        tree, single = timed_insert(keys, bulk=False)
+        verify(tree, keys)
+        del tree
+        tree, bulk = timed_insert(keys, bulk=True)
+        verify(tree, keys)
+        del tree
+        print(f"{name:>16}: insert {single:.2f} с, insert_many {bulk:.2f} с")
+
+    print("Свойства КЧ-дерева и содержимое inorder() проверены")
+
+    print("\nОбъекты против массивов (случайные ключи):")
+    compare_backends(random_keys)
+
+    print("\nМассовая загрузка:")
+    bulk_load(random_keys)
+
+    print("\nЧтение под нагрузкой записи (4 читателя, 1 писатель):")
+    preload = random_keys[:100_000]
+    for name, make in (("RedBlackTree + замок", _LockedTree), ("ConcurrentTree", _SnapshotTree)):
+        reads, writes = reader_throughput(make, preload)
+        print(f"{name:>22}: {reads:9.0f} чтений/с, {writes:8.0f} вставок/с")
+
+    print("\nСохранение и загрузка:")
+    dump_and_load(random_keys)
+
+
+if __name__ == "__main__":
+    main()
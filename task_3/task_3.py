@@ -24,18 +24,56 @@
 
 ТЕОРЕТИЧЕСКАЯ СЛОЖНОСТЬ:
 - Время вставки: O(log n) — дерево всегда сбалансировано (высота ≤ 2·log₂(n+1))
+- Удаление, floor/ceiling/predecessor/successor, rank/select: O(log n)
+  (в каждом узле хранится size — сумма счётчиков поддерева)
+- range(lo, hi): O(log n + m) для окна из m ключей, лениво, без списка
+- from_sorted: O(n) — сбалансированное дерево из отсортированных ключей без поворотов
+  (узлы связываются рекурсивно, глубина рекурсии ⌊log₂ n⌋)
+- union / merge: O(n + m) — слияние обходов двух деревьев и построение заново
+- PersistentRedBlackTree: вставка копирует O(log n) узлов пути, snapshot() — O(1)
+- dump / load: O(n) — прямой обход с цветами; загрузка без поворотов и без рекурсии (стек)
 - Память: O(n) — хранится n уникальных ключей
-- Дополнительно: O(1) памяти на балансировку (итеративный алгоритм, без рекурсии)
+- Дополнительно: O(1) памяти на балансировку при вставке и удалении (итеративный
+  алгоритм, без рекурсии)
+
+ПРОИЗВОДИТЕЛЬНОСТЬ:
+- Цвет хранится как обычный bool (RED = True, BLACK = False): проверка цвета —
+  сравнение с константой, а не обращение к члену Enum.
+- Вставка делает один спуск: по пути либо находится ключ (count += 1),
+  либо запоминается родитель для нового узла.
+- Узлы и NIL сравниваются по идентичности (is), без вызова __eq__.
+- size (для rank/select) увеличивается тем же спуском: +1 в каждом узле пути
+  стоит около четверти времени вставки, но отдельный подъём по parent после
+  вставки медленнее.
+- insert_many() вставляет пачку ключей с приостановленным сборщиком мусора:
+  узлы ссылаются друг на друга (parent ↔ child), и на миллионе вставок
+  циклический GC занимает до половины времени, ничего при этом не освобождая.
 """
 
-from enum import Enum
+import gc
+import threading
+from array import array
+from contextlib import contextmanager
+
+from tree_format import read_tree, write_tree
+
+
+@contextmanager
+def _gc_paused():
+    """Отключает циклический сборщик мусора на время блока (если он был включён)."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 # 1. ЦВЕТ УЗЛА: КРАСНЫЙ или ЧЁРНЫЙ
-class Color(Enum):
-    """Перечисление (enum) для цвета узла."""
-    RED = True
-    BLACK = False
+RED = True
+BLACK = False
+
 
 # 2. УЗЕЛ КРАСНО-ЧЁРНОГО ДЕРЕВА
 class RBNode:
@@ -45,33 +83,227 @@ class RBNode:
     Атрибуты:
         key    — значение (любое число, включая 0 и отрицательные)
         count  — сколько раз этот ключ был вставлен (для дубликатов)
+        size   — сумма count по всему поддереву узла (для rank/select)
         color  — цвет узла: RED или BLACK
         left   — левый ребёнок
         right  — правый ребёнок
         parent — родитель (нужен для подъёма при балансировке)
     """
-    __slots__ = ("key", "count", "color", "left", "right", "parent")
+    __slots__ = ("key", "count", "size", "color", "left", "right", "parent")
     
-    def __init__(self, key, color=Color.RED):
+    def __init__(self, key, color=RED, nil=None, parent=None):
         self.key = key
         self.count = 1
+        self.size = 1
         self.color = color
-        self.left = None
-        self.right = None
-        self.parent = None
+        self.left = nil
+        self.right = nil
+        self.parent = parent
 
     def __repr__(self):
-        color_str = 'R' if self.color == Color.RED else 'B'
+        color_str = 'R' if self.color is RED else 'B'
         return f"{self.key}({color_str})[{self.count}]"
 
 
-# 3. КРАСНО-ЧЁРНОЕ ДЕРЕВО — основной класс
-class RedBlackTree:
+# 3. ОБЩИЕ ЗАПРОСЫ — только чтение, без изменения дерева
+class _TreeQueries:
+    """
+    Поиск и запросы к упорядоченному мультимножеству. Нужны только root и NIL
+    и поля узлов key, count, size, left, right, color — поэтому методы общие
+    для изменяемого RedBlackTree и неизменяемого PersistentRedBlackTree.
+    """
+
+    def _search_existing(self, key):
+        """Поиск существующего узла по ключу."""
+        nil = self.NIL
+        current = self.root
+        while current is not nil:
+            if key == current.key:
+                return current
+            current = current.left if key < current.key else current.right
+        return nil
+
+    def __len__(self):
+        """Число вставленных ключей с учётом повторов."""
+        return self.root.size
+
+    def __contains__(self, key):
+        return self._search_existing(key) is not self.NIL
+
+    def floor(self, key):
+        """Наибольший ключ ≤ key или None."""
+        return self._bound(key, inclusive=True, below=True)
+
+    def ceiling(self, key):
+        """Наименьший ключ ≥ key или None."""
+        return self._bound(key, inclusive=True, below=False)
+
+    def predecessor(self, key):
+        """Наибольший ключ < key или None."""
+        return self._bound(key, inclusive=False, below=True)
+
+    def successor(self, key):
+        """Наименьший ключ > key или None."""
+        return self._bound(key, inclusive=False, below=False)
+
+    def _bound(self, key, inclusive, below):
+        """Один спуск от корня, запоминая последний подходящий ключ."""
+        nil = self.NIL
+        best = None
+        current = self.root
+        while current is not nil:
+            current_key = current.key
+            if current_key == key and inclusive:
+                return current_key
+            if below:
+                if current_key < key:
+                    best = current_key
+                    current = current.right
+                else:
+                    current = current.left
+            else:
+                if current_key > key:
+                    best = current_key
+                    current = current.left
+                else:
+                    current = current.right
+        return best
+
+    def rank(self, key):
+        """Сколько вставленных ключей (с повторами) строго меньше key. O(log n)."""
+        nil = self.NIL
+        rank = 0
+        current = self.root
+        while current is not nil:
+            if key < current.key:
+                current = current.left
+            elif key == current.key:
+                return rank + current.left.size
+            else:
+                rank += current.left.size + current.count
+                current = current.right
+        return rank
+
+    def select(self, i):
+        """
+        Ключ с номером i (с 0) в отсортированном порядке с учётом повторов:
+        select(rank(k)) == k для любого ключа k дерева. O(log n).
+        """
+        size = self.root.size
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError("индекс вне дерева")
+        current = self.root
+        while True:
+            left_size = current.left.size
+            if i < left_size:
+                current = current.left
+            elif i < left_size + current.count:
+                return current.key
+            else:
+                i -= left_size + current.count
+                current = current.right
+
+    def range(self, lo=None, hi=None):
+        """
+        Ленивый обход пар (ключ, счётчик) с lo ≤ ключ < hi (None — без границы).
+        Начинает со спуска к lo и останавливается на первом ключе ≥ hi:
+        чтение окна из m ключей стоит O(log n + m). Дерево нельзя менять,
+        пока генератор не исчерпан.
+        """
+        nil = self.NIL
+        stack = []
+        current = self.root
+        # Стек — путь к lo: узлы, от которых обход ещё пойдёт вправо
+        while current is not nil:
+            if lo is None or current.key >= lo:
+                stack.append(current)
+                current = current.left
+            else:
+                current = current.right
+        while stack:
+            current = stack.pop()
+            if hi is not None and current.key >= hi:
+                return
+            yield current.key, current.count
+            current = current.right
+            while current is not nil:
+                stack.append(current)
+                current = current.left
+
+    def inorder(self):
+        """Возвращает отсортированный список: (ключ, цвет, счётчик)."""
+        nil = self.NIL
+        result = []
+        stack = []
+        current = self.root
+        while stack or current is not nil:
+            while current is not nil:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            color_str = 'RED' if current.color is RED else 'BLACK'
+            result.append((current.key, color_str, current.count))
+            current = current.right
+        return result
+
+    def __repr__(self):
+        """Красивое строковое представление дерева."""
+        nodes = self.inorder()
+        if not nodes:
+            return "<пустое дерево>"
+        return " → ".join(f"{key}({color[0]})[{count}]" for key, color, count in nodes)
+
+
+# 4. КРАСНО-ЧЁРНОЕ ДЕРЕВО — основной класс
+# Слияние отсортированных обходов — для insert_many, union и merge
+def _merge_counted(first, second):
+    """Слияние двух отсортированных потоков пар (ключ, счётчик); счётчики равных ключей складываются."""
+    first = iter(first)
+    second = iter(second)
+    a = next(first, None)
+    b = next(second, None)
+    while a is not None and b is not None:
+        if a[0] < b[0]:
+            yield a
+            a = next(first, None)
+        elif b[0] < a[0]:
+            yield b
+            b = next(second, None)
+        else:
+            yield a[0], a[1] + b[1]
+            a = next(first, None)
+            b = next(second, None)
+    if a is not None:
+        yield a
+        yield from first
+    if b is not None:
+        yield b
+        yield from second
+
+
+def _fold_sorted(keys):
+    """Пары (ключ, счётчик) из отсортированного списка ключей."""
+    start = 0
+    n = len(keys)
+    while start < n:
+        key = keys[start]
+        end = start + 1
+        while end < n and keys[end] == key:
+            end += 1
+        yield key, end - start
+        start = end
+
+
+class RedBlackTree(_TreeQueries):
     """Красно-чёрное дерево с поддержкой дубликатов и безопасной балансировкой."""
     
     def __init__(self):
         # Создаём один общий NIL-узел — он заменяет все пустые листья
-        self.NIL = RBNode(None, Color.BLACK)
+        self.NIL = RBNode(None, BLACK)
+        self.NIL.count = 0
+        self.NIL.size = 0
         self.NIL.left = self.NIL
         self.NIL.right = self.NIL
         self.NIL.parent = self.NIL
@@ -79,23 +311,22 @@ class RedBlackTree:
 
     def insert(self, key):
         """Вставить ключ. Если уже есть — увеличить счётчик."""
-        existing_node = self._search_existing(key)
-        if existing_node != self.NIL:
-            existing_node.count += 1
-            return
-
-        new_node = RBNode(key)
-        new_node.left = self.NIL
-        new_node.right = self.NIL
-
-        parent = self.NIL
+        nil = self.NIL
+        parent = nil
         current = self.root
-        while current != self.NIL:
+        # Один спуск: либо находим ключ, либо место для нового узла.
+        # Ключ в любом случае добавится в поддеревья всех узлов пути.
+        while current is not nil:
+            current.size += 1
+            current_key = current.key
+            if key == current_key:
+                current.count += 1
+                return
             parent = current
-            current = current.left if key < current.key else current.right
+            current = current.left if key < current_key else current.right
 
-        new_node.parent = parent
-        if parent == self.NIL:
+        new_node = RBNode(key, RED, nil, parent)
+        if parent is nil:
             self.root = new_node
         elif key < parent.key:
             parent.left = new_node
@@ -104,14 +335,340 @@ class RedBlackTree:
 
         self._fix_insert(new_node)
 
-    def _search_existing(self, key):
-        """Поиск существующего узла по ключу."""
-        current = self.root
-        while current != self.NIL:
-            if key == current.key:
+    # --- Массовая загрузка ---
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """
+        Построить дерево из неубывающей последовательности ключей за O(n).
+        Повторы сворачиваются в count. Дерево строится идеально
+        сбалансированным (середина отрезка — корень), все уровни чёрные,
+        кроме самого нижнего — он красный, так что чёрная высота всех путей
+        одинакова. Неотсортированный вход — ValueError.
+        """
+        tree = cls()
+        nil = tree.NIL
+        with _gc_paused():
+            nodes = []
+            append = nodes.append
+            last = None
+            for key in iterable:
+                if last is not None:
+                    if key == last.key:
+                        last.count += 1
+                        continue
+                    if key < last.key:
+                        raise ValueError("ключи должны идти в неубывающем порядке")
+                last = RBNode(key, BLACK, nil)
+                append(last)
+            tree.root = tree._link_balanced(nodes)
+        return tree
+
+    @classmethod
+    def _from_counted(cls, pairs):
+        """Дерево из отсортированных пар (ключ, счётчик) с различными ключами."""
+        tree = cls()
+        nil = tree.NIL
+        with _gc_paused():
+            nodes = []
+            append = nodes.append
+            for key, count in pairs:
+                node = RBNode(key, BLACK, nil)
+                node.count = count
+                append(node)
+            tree.root = tree._link_balanced(nodes)
+        return tree
+
+    def _link_balanced(self, nodes):
+        """Связать узлы (в порядке ключей) в сбалансированное дерево; вернуть корень."""
+        nil = self.NIL
+        if not nodes:
+            return nil
+        # Глубина самого нижнего уровня: у дерева из n узлов она равна
+        # ⌊log₂ n⌋, и все пустые ссылки лежат на двух последних уровнях.
+        red_depth = len(nodes).bit_length() - 1
+
+        def link(lo, hi, depth, parent):
+            mid = (lo + hi) >> 1
+            node = nodes[mid]
+            node.parent = parent
+            size = node.count
+            if lo < mid:
+                child = node.left = link(lo, mid, depth + 1, node)
+                size += child.size
+            if mid + 1 < hi:
+                child = node.right = link(mid + 1, hi, depth + 1, node)
+                size += child.size
+            node.size = size
+            if depth == red_depth:
+                node.color = RED
+            return node
+
+        root = link(0, len(nodes), 0, nil)
+        root.color = BLACK
+        return root
+
+    def insert_many(self, keys):
+        """
+        Вставить пачку ключей (GC на это время отключён). Пачка сортируется.
+        Если она не меньше дерева, дерево пересобирается слиянием за O(n + m). Иначе ключи вставляются по возрастанию
+        поиском от «пальца» — узла предыдущей вставки.
+        """
+        batch = sorted(keys)
+        if not batch:
+            return
+        with _gc_paused():
+            # Пересборка стоит ~1.5 мкс на узел (n + m), вставка — ~3–4 мкс
+            # на ключ: пересборка выгоднее, когда пачка не меньше дерева.
+            if len(batch) >= len(self):
+                self._replace(self._from_counted(
+                    _merge_counted(self.range(), _fold_sorted(batch))))
+                return
+            finger = self.NIL
+            for key in batch:
+                finger = self._insert_from(finger, key)
+
+    def _insert_from(self, finger, key):
+        """
+        Вставка key ≥ finger.key поиском от пальца: подъём до наименьшего
+        поддерева, в чей диапазон ключей попадает key, затем обычный спуск.
+        Возвращает узел с ключом key — палец для следующей вставки.
+
+        Палец экономит только сравнения ключей: спуск идёт от start, а не от
+        корня. Поле size всё равно увеличивается у всех предков start до
+        корня, так что вставка остаётся Θ(log n). Пересчёт размеров после
+        пачки по объединению путей асимптотически лучше, но на разреженных
+        пачках в полтора раза медленнее этого цикла.
+        """
+        nil = self.NIL
+        start = self.root
+        if finger is not nil:
+            start = finger
+            while start is not self.root:
+                parent = start.parent
+                if start is parent.left and key < parent.key:
+                    break
+                start = parent
+        # Ключ окажется в поддереве start — все предки start получают +1
+        ancestor = start.parent
+        while ancestor is not nil:
+            ancestor.size += 1
+            ancestor = ancestor.parent
+
+        parent = start.parent
+        current = start
+        while current is not nil:
+            current.size += 1
+            current_key = current.key
+            if key == current_key:
+                current.count += 1
                 return current
+            parent = current
+            current = current.left if key < current_key else current.right
+
+        new_node = RBNode(key, RED, nil, parent)
+        if parent is nil:
+            self.root = new_node
+        elif key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._fix_insert(new_node)
+        return new_node
+
+    def union(self, other):
+        """Новое дерево — объединение мультимножеств (счётчики складываются). O(n + m)."""
+        with _gc_paused():
+            return self._from_counted(_merge_counted(self.range(), other.range()))
+
+    def merge(self, other):
+        """Влить other в это дерево (other не меняется). O(n + m)."""
+        self._replace(self.union(other))
+
+    def _replace(self, tree):
+        """Забрать структуру другого дерева (вместе с его NIL)."""
+        self.NIL = tree.NIL
+        self.root = tree.root
+
+    # --- Сохранение и загрузка (формат — tree_format.py) ---
+
+    def dump(self, path):
+        """Записать ключи, счётчики и цвета в прямом порядке обхода. Ключи — int64."""
+        nil = self.NIL
+        keys = array("q")
+        counts = array("q")
+        colors = bytearray()
+        stack = [self.root] if self.root is not nil else []
+        while stack:
+            node = stack.pop()
+            keys.append(node.key)
+            counts.append(node.count)
+            colors.append(node.color is RED)
+            if node.right is not nil:
+                stack.append(node.right)
+            if node.left is not nil:
+                stack.append(node.left)
+        write_tree(path, keys, counts, colors)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Восстановить дерево из файла dump() за один линейный проход:
+        форму задаёт прямой порядок ключей, раскраска берётся из файла.
+        """
+        keys, counts, colors = read_tree(path)
+        tree = cls()
+        nil = tree.NIL
+        with _gc_paused():
+            nodes = [RBNode(key, BLACK, nil) for key in keys]
+            stack = []
+            for node, count, red in zip(nodes, counts, colors):
+                node.count = count
+                if red:
+                    node.color = RED
+                key = node.key
+                if not stack:
+                    node.parent = nil
+                elif key < stack[-1].key:
+                    parent = stack[-1]
+                    parent.left = node
+                    node.parent = parent
+                else:
+                    # Правый ребёнок последнего узла пути с ключом меньше key
+                    parent = stack.pop()
+                    while stack and stack[-1].key < key:
+                        parent = stack.pop()
+                    parent.right = node
+                    node.parent = parent
+                stack.append(node)
+            # В прямом порядке дети идут после родителя — размеры снизу вверх
+            for node in reversed(nodes):
+                node.size = node.count + node.left.size + node.right.size
+            if nodes:
+                tree.root = nodes[0]
+        return tree
+
+    def delete(self, key):
+        """
+        Удалить одно вхождение ключа. Пока count > 1, уменьшается счётчик;
+        последнее вхождение удаляет узел с балансировкой. Нет ключа — KeyError.
+        """
+        node = self._search_existing(key)
+        if node is self.NIL:
+            raise KeyError(key)
+        # Ключ найден — каждый узел пути теряет одно вхождение
+        current = self.root
+        while current is not node:
+            current.size -= 1
             current = current.left if key < current.key else current.right
-        return self.NIL
+        node.size -= 1
+        if node.count > 1:
+            node.count -= 1
+            return
+        self._remove_node(node)
+
+    def _remove_node(self, z):
+        """Удаление узла z (CLRS); размеры предков z уже уменьшены."""
+        nil = self.NIL
+        y = z
+        y_color = y.color
+        if z.left is nil:
+            x = z.right
+            self._transplant(z, x)
+        elif z.right is nil:
+            x = z.left
+            self._transplant(z, x)
+        else:
+            # y — минимум правого поддерева, встаёт на место z
+            y = z.right
+            while y.left is not nil:
+                y = y.left
+            y_color = y.color
+            x = y.right
+            # Узлы между z и y теряют y вместе со всеми его вхождениями
+            current = y.parent
+            while current is not z:
+                current.size -= y.count
+                current = current.parent
+            if y.parent is z:
+                x.parent = y  # x может быть NIL — нужен для балансировки
+            else:
+                self._transplant(y, x)
+                y.right = z.right
+                y.right.parent = y
+            self._transplant(z, y)
+            y.left = z.left
+            y.left.parent = y
+            y.color = z.color
+            y.size = z.size
+        if y_color is BLACK:
+            self._fix_delete(x)
+
+    def _transplant(self, u, v):
+        """Поставить поддерево v на место поддерева u."""
+        parent = u.parent
+        if parent is self.NIL:
+            self.root = v
+        elif u is parent.left:
+            parent.left = v
+        else:
+            parent.right = v
+        v.parent = parent
+
+    def _fix_delete(self, x):
+        """
+        Балансировка после удаления: x несёт «лишний чёрный».
+        w — брат x; случаи те же, что в CLRS, для левой и правой ветви.
+        """
+        while x is not self.root and x.color is BLACK:
+            parent = x.parent
+            if x is parent.left:
+                w = parent.right
+                if w.color is RED:
+                    # Случай 1: брат красный → поворот, брат становится чёрным
+                    w.color = BLACK
+                    parent.color = RED
+                    self._left_rotate(parent)
+                    w = parent.right
+                if w.left.color is BLACK and w.right.color is BLACK:
+                    # Случай 2: оба племянника чёрные → перекраска, подъём
+                    w.color = RED
+                    x = parent
+                else:
+                    if w.right.color is BLACK:
+                        # Случай 3: дальний племянник чёрный → поворот брата
+                        w.left.color = BLACK
+                        w.color = RED
+                        self._right_rotate(w)
+                        w = parent.right
+                    # Случай 4: дальний племянник красный → поворот родителя
+                    w.color = parent.color
+                    parent.color = BLACK
+                    w.right.color = BLACK
+                    self._left_rotate(parent)
+                    x = self.root
+            else:
+                w = parent.left
+                if w.color is RED:
+                    w.color = BLACK
+                    parent.color = RED
+                    self._right_rotate(parent)
+                    w = parent.left
+                if w.left.color is BLACK and w.right.color is BLACK:
+                    w.color = RED
+                    x = parent
+                else:
+                    if w.left.color is BLACK:
+                        w.right.color = BLACK
+                        w.color = RED
+                        self._left_rotate(w)
+                        w = parent.left
+                    w.color = parent.color
+                    parent.color = BLACK
+                    w.left.color = BLACK
+                    self._right_rotate(parent)
+                    x = self.root
+        x.color = BLACK
 
     def _fix_insert(self, node):
         """
@@ -122,24 +679,25 @@ class RedBlackTree:
           - grandparent — родитель родителя
           - uncle    — дядя (второй ребёнок grandparent)
         """
-        while node.parent.color == Color.RED:
+        parent = node.parent
+        while parent.color:  # parent.color is RED
             # === Определяем parent и grandparent ===
-            parent = node.parent
             grandparent = parent.parent
 
-            if parent == grandparent.left:
+            if parent is grandparent.left:
                 # === Случаи для левой ветви ===
                 uncle = grandparent.right
 
-                if uncle.color == Color.RED:
+                if uncle.color:  # uncle.color is RED
                     # Случай 1: дядя красный → перекраска
-                    parent.color = Color.BLACK
-                    uncle.color = Color.BLACK
-                    grandparent.color = Color.RED
+                    parent.color = BLACK
+                    uncle.color = BLACK
+                    grandparent.color = RED
                     node = grandparent  # подъём вверх
+                    parent = node.parent
                 else:
                     # Случай 2 и 3: дядя чёрный
-                    if node == parent.right:
+                    if node is parent.right:
                         # Случай 2: node — правый ребёнок → левый поворот
                         node = parent
                         self._left_rotate(node)
@@ -148,8 +706,8 @@ class RedBlackTree:
                         grandparent = parent.parent
 
                     # Случай 3: node — левый ребёнок → правый поворот + перекраска
-                    parent.color = Color.BLACK
-                    grandparent.color = Color.RED
+                    parent.color = BLACK
+                    grandparent.color = RED
                     self._right_rotate(grandparent)
                     # После поворота node.parent изменился, но нарушение устранено
                     break  # можно выйти, но для единообразия оставим while
@@ -158,15 +716,16 @@ class RedBlackTree:
                 # === Зеркальные случаи для правой ветви ===
                 uncle = grandparent.left
 
-                if uncle.color == Color.RED:
+                if uncle.color:  # uncle.color is RED
                     # Случай 1 (зеркало)
-                    parent.color = Color.BLACK
-                    uncle.color = Color.BLACK
-                    grandparent.color = Color.RED
+                    parent.color = BLACK
+                    uncle.color = BLACK
+                    grandparent.color = RED
                     node = grandparent
+                    parent = node.parent
                 else:
                     # Случай 2 и 3 (зеркало)
-                    if node == parent.left:
+                    if node is parent.left:
                         # Случай 2 (зеркало): node — левый ребёнок → правый поворот
                         node = parent
                         self._right_rotate(node)
@@ -174,75 +733,208 @@ class RedBlackTree:
                         grandparent = parent.parent
 
                     # Случай 3 (зеркало): node — правый ребёнок → левый поворот + перекраска
-                    parent.color = Color.BLACK
-                    grandparent.color = Color.RED
+                    parent.color = BLACK
+                    grandparent.color = RED
                     self._left_rotate(grandparent)
                     break
 
         # Гарантируем, что корень всегда чёрный (свойство 2)
-        self.root.color = Color.BLACK
+        self.root.color = BLACK
 
     def _left_rotate(self, x):
         """Левый поворот вокруг узла x."""
         y = x.right
-        x.right = y.left
-        if y.left != self.NIL:
-            y.left.parent = x
-        y.parent = x.parent
-        if x.parent == self.NIL:
+        child = x.right = y.left
+        if child is not self.NIL:
+            child.parent = x
+        parent = y.parent = x.parent
+        if parent is self.NIL:
             self.root = y
-        elif x == x.parent.left:
-            x.parent.left = y
+        elif x is parent.left:
+            parent.left = y
         else:
-            x.parent.right = y
+            parent.right = y
         y.left = x
         x.parent = y
+        y.size = x.size
+        x.size = x.left.size + x.right.size + x.count
 
     def _right_rotate(self, y):
         """Правый поворот вокруг узла y."""
         x = y.left
-        y.left = x.right
-        if x.right != self.NIL:
-            x.right.parent = y
-        x.parent = y.parent
-        if y.parent == self.NIL:
+        child = y.left = x.right
+        if child is not self.NIL:
+            child.parent = y
+        parent = x.parent = y.parent
+        if parent is self.NIL:
             self.root = x
-        elif y == y.parent.right:
-            y.parent.right = x
+        elif y is parent.right:
+            parent.right = x
         else:
-            y.parent.left = x
+            parent.left = x
         x.right = y
         y.parent = x
+        x.size = y.size
+        y.size = y.left.size + y.right.size + y.count
 
-    def inorder(self):
-        """Возвращает отсортированный список: (ключ, цвет, счётчик)."""
-        result = []
-        stack = []
+
+# 5. ПЕРСИСТЕНТНОЕ ДЕРЕВО — снимки для читателей без блокировок
+class PersistentNode:
+    """
+    Неизменяемый узел персистентного дерева: после создания поля не меняются,
+    поэтому узлы безопасно разделяются между версиями. Ссылки на родителя нет —
+    при копировании пути её пришлось бы обновлять во всём поддереве.
+    """
+    __slots__ = ("key", "count", "size", "color", "left", "right")
+
+    def __init__(self, color, left, key, count, right):
+        self.key = key
+        self.count = count
+        self.size = left.size + right.size + count
+        self.color = color
+        self.left = left
+        self.right = right
+
+
+# Общий чёрный лист всех персистентных деревьев
+_PERSISTENT_NIL = PersistentNode.__new__(PersistentNode)
+_PERSISTENT_NIL.key = None
+_PERSISTENT_NIL.count = 0
+_PERSISTENT_NIL.size = 0
+_PERSISTENT_NIL.color = BLACK
+_PERSISTENT_NIL.left = _PERSISTENT_NIL
+_PERSISTENT_NIL.right = _PERSISTENT_NIL
+
+
+def _balance(color, left, key, count, right):
+    """
+    Новый узел с балансировкой Окасаки: если под чёрным узлом два красных
+    подряд, четыре случая сводятся к одному — красный узел с двумя чёрными детьми.
+    """
+    if color is BLACK:
+        if left.color is RED:
+            child = left.left
+            if child.color is RED:
+                return PersistentNode(
+                    RED,
+                    PersistentNode(BLACK, child.left, child.key, child.count, child.right),
+                    left.key, left.count,
+                    PersistentNode(BLACK, left.right, key, count, right))
+            child = left.right
+            if child.color is RED:
+                return PersistentNode(
+                    RED,
+                    PersistentNode(BLACK, left.left, left.key, left.count, child.left),
+                    child.key, child.count,
+                    PersistentNode(BLACK, child.right, key, count, right))
+        if right.color is RED:
+            child = right.left
+            if child.color is RED:
+                return PersistentNode(
+                    RED,
+                    PersistentNode(BLACK, left, key, count, child.left),
+                    child.key, child.count,
+                    PersistentNode(BLACK, child.right, right.key, right.count, right.right))
+            child = right.right
+            if child.color is RED:
+                return PersistentNode(
+                    RED,
+                    PersistentNode(BLACK, left, key, count, right.left),
+                    right.key, right.count,
+                    PersistentNode(BLACK, child.left, child.key, child.count, child.right))
+    return PersistentNode(color, left, key, count, right)
+
+
+class PersistentRedBlackTree(_TreeQueries):
+    """
+    Красно-чёрное дерево с копированием пути: вставка создаёт новые копии
+    только узлов на пути от корня (O(log n)), остальное поддерево общее.
+    Старые корни остаются валидными деревьями, поэтому snapshot() — это
+    просто ещё одна ссылка на текущий корень, O(1).
+    Запросы — те же, что у RedBlackTree; удаления нет.
+    """
+
+    NIL = _PERSISTENT_NIL
+
+    def __init__(self, root=_PERSISTENT_NIL):
+        self.root = root
+
+    def snapshot(self):
+        """Независимая копия текущей версии за O(1)."""
+        return PersistentRedBlackTree(self.root)
+
+    def insert(self, key):
+        """Вставить ключ (повтор — копия узла с count + 1). Копирует O(log n) узлов."""
+        nil = _PERSISTENT_NIL
+        path = []
         current = self.root
-        while stack or current != self.NIL:
-            while current != self.NIL:
-                stack.append(current)
-                current = current.left
-            current = stack.pop()
-            color_str = 'RED' if current.color == Color.RED else 'BLACK'
-            result.append((current.key, color_str, current.count))
-            current = current.right
-        return result
+        while current is not nil:
+            current_key = current.key
+            if key == current_key:
+                break
+            path.append(current)
+            current = current.left if key < current_key else current.right
 
-    def __repr__(self):
-        """Красивое строковое представление дерева."""
-        nodes = self.inorder()
-        if not nodes:
-            return "<пустое дерево>"
-        return " → ".join(f"{key}({color[0]})[{count}]" for key, color, count in nodes)
+        if current is nil:
+            node = PersistentNode(RED, nil, key, 1, nil)
+        else:
+            node = PersistentNode(current.color, current.left, key, current.count + 1, current.right)
+        # Подъём по пути: каждый предок копируется с новым ребёнком
+        for parent in reversed(path):
+            if key < parent.key:
+                node = _balance(parent.color, node, parent.key, parent.count, parent.right)
+            else:
+                node = _balance(parent.color, parent.left, parent.key, parent.count, node)
+        if node.color is RED:
+            node = PersistentNode(BLACK, node.left, node.key, node.count, node.right)
+        self.root = node
+
+    def insert_many(self, keys):
+        """Вставить все ключи из итерируемого объекта (GC на это время отключён)."""
+        insert = self.insert
+        with _gc_paused():
+            for key in keys:
+                insert(key)
+
+
+class ConcurrentTree:
+    """
+    Один писатель, много читателей. Читатели берут snapshot() и работают
+    с неизменяемой версией без блокировок. Писатель под замком строит новую
+    версию и публикует её одним присваиванием корня — в CPython это атомарно,
+    читатель видит либо старую, либо новую версию целиком.
+    """
+
+    def __init__(self):
+        self._tree = PersistentRedBlackTree()
+        self._write_lock = threading.Lock()
+
+    def snapshot(self):
+        """Текущая версия дерева; последующие записи её не меняют."""
+        return self._tree.snapshot()
 
+    def insert(self, key):
+        with self._write_lock:
+            self._tree.insert(key)
+
+    def insert_many(self, keys):
+        """Вставить пачку; читатели увидят её целиком, без промежуточных версий."""
+        with self._write_lock:
+            draft = self._tree.snapshot()
+            draft.insert_many(keys)
+            self._tree.root = draft.root
+
+    def __len__(self):
+        return len(self.snapshot())
 
-# 4. ПРИМЕР ИСПОЛЬЗОВАНИЯ + РУЧНОЙ ВВОД
+
+# 6. ПРИМЕР ИСПОЛЬЗОВАНИЯ + РУЧНОЙ ВВОД
 if __name__ == "__main__":
     tree = RedBlackTree()
     
     print("Красно-чёрное дерево: поддержка дубликатов, 0, отрицательных чисел.")
-    print("Введите целые числа по одному. Для завершения введите 'stop'.\n")
+    print("Введите целые числа по одному. 'del N' удаляет одно вхождение N.")
+    print("Для завершения введите 'stop'.\n")
 
     while True:
         try:
@@ -250,8 +942,16 @@ if __name__ == "__main__":
             if user_input.lower() == 'stop':
                 break
 
-            key = int(user_input)
-            tree.insert(key)
+            if user_input.lower().startswith('del'):
+                key = int(user_input[3:])
+                try:
+                    tree.delete(key)
+                except KeyError:
+                    print(f" Ключа {key} нет в дереве.\n")
+                    continue
+            else:
+                key = int(user_input)
+                tree.insert(key)
             print(f" → Текущее дерево: {tree}\n")
 
         except ValueError:
@@ -269,7 +969,7 @@ if __name__ == "__main__":
             print(f"  Ключ: {key:>3}, Цвет: {color:>5}, Количество вставок: {count}")
         
         zero_node = tree._search_existing(0)
-        if zero_node != tree.NIL:
+        if zero_node is not tree.NIL:
             print(f"\n Ключ 0 вставлен {zero_node.count} раз(а).")
     else:
         print("\n Дерево осталось пустым.")
\ No newline at end of file
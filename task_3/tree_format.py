@@ -0,0 +1,64 @@
+# task_3/tree_format.py
+#
+# Двоичный формат красно-чёрного дерева (общий для RedBlackTree
+# и ArrayRedBlackTree).
+#
+#   magic    4 байта  b"RBTF"
+#   version  uint32   1
+#   n        int64    число узлов (уникальных ключей)
+#   keys[n]  int64    ключи в прямом порядке обхода (корень, левое, правое)
+#   counts[n] int64   счётчики повторов в том же порядке
+#   colors[n] uint8   1 — красный, 0 — чёрный
+#
+# Числа — little-endian. Прямой порядок различных ключей однозначно задаёт
+# форму дерева поиска, а сохранённые цвета — раскраску, поэтому загрузка
+# восстанавливает то же самое дерево за один линейный проход, без
+# поворотов и перекрасок. Файл читается последовательно целиком.
+
+import struct
+import sys
+from array import array
+
+MAGIC = b"RBTF"
+VERSION = 1
+HEADER = struct.Struct("<4sIq")  # magic, version, n
+
+
+def write_tree(path, keys, counts, colors):
+    """Записывает столбцы дерева (array('q'), array('q'), bytearray) в файл."""
+    if sys.byteorder != "little":
+        keys = array("q", keys)
+        counts = array("q", counts)
+        keys.byteswap()
+        counts.byteswap()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys)))
+        keys.tofile(f)
+        counts.tofile(f)
+        f.write(colors)
+
+
+def read_tree(path):
+    """Читает файл дерева; возвращает (keys, counts, colors) в прямом порядке обхода."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path}: файл дерева обрезан")
+        magic, version, n = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: не файл дерева версии {VERSION}")
+        keys = array("q")
+        counts = array("q")
+        try:
+            keys.fromfile(f, n)
+            counts.fromfile(f, n)
+        except EOFError:
+            raise ValueError(f"{path}: файл дерева обрезан") from None
+        colors = f.read(n)
+        if len(colors) != n:
+            raise ValueError(f"{path}: файл дерева обрезан")
+    if sys.byteorder != "little":
+        keys.byteswap()
+        counts.byteswap()
+    return keys, counts, colors
+
@@ -0,0 +1,128 @@
+# Файл: backtest.py
+# Перебор параметров task_4 в нескольких процессах: много заданий
+# (номер ряда, k) по общей матрице цен.
+#
+# Теоретическая сложность:
+#   - Временная: O(Σ n_i log n_i) по рядам, у которых есть задания,
+#     делённое на число процессов; от числа k на ряд почти не зависит
+#   - Пространственная: 8 байт на цену — один раз, в общей памяти
+#
+# Подход:
+#   Все ряды подряд записываются в один блок multiprocessing.shared_memory
+#   (int64), смещения рядов передаются процессам один раз при запуске.
+#   Процесс подключается к блоку в initializer и читает ряд срезом
+#   memoryview; сами цены не сериализуются ни в одно задание.
+#
+#   Задания группируются по рядам: для ряда считается одна кривая прибыли
+#   profit_curve(prices, min(max k, n // 2)) — O(n log n) движком "heap", —
+#   и из неё берутся ответы для всех k этого ряда (k > n // 2 — по n // 2). Группы рядов раздаются пачками,
+#   чтобы накладные расходы на задание не съедали выигрыш.
+#
+#   run_backtest — генератор: результаты выдаются по мере готовности пачек
+#   (as_completed), порядок между пачками не гарантируется. Блок общей
+#   памяти удаляется, когда генератор исчерпан или закрыт.
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from task_4 import profit_curve
+
+# Состояние процесса-исполнителя: (блок общей памяти, цены, смещения рядов)
+_worker = None
+
+
+def _attach(name, nbytes, offsets):
+    """initializer: подключение процесса к общей памяти с ценами."""
+    global _worker
+    # Трекер ресурсов у исполнителей общий с главным процессом: повторная
+    # регистрация блока ничего не меняет, удаляет его главный процесс
+    block = shared_memory.SharedMemory(name=name)
+    # Блок не короче байта (и может быть округлён ОС до страницы) —
+    # цены занимают только первые nbytes
+    _worker = (block, block.buf.cast("B")[:nbytes].cast("q"), offsets)
+
+
+def _run_groups(groups):
+    """Ответы для пачки рядов: groups — список (номер ряда, [k, ...])."""
+    _, prices, offsets = _worker
+    results = []
+    for index, ks in groups:
+        series = prices[offsets[index]:offsets[index + 1]].tolist()
+        # Больше n // 2 сделок ничего не добавляют — кривая не длиннее ряда
+        cap = min(max(ks), len(series) // 2)
+        curve = profit_curve(series, cap)
+        results.extend((index, k, curve[min(k, cap)]) for k in ks)
+    return results
+
+
+def _group_jobs(jobs, count):
+    """{номер ряда: отсортированные различные k}; проверяет задания."""
+    groups = {}
+    for index, k in jobs:
+        if not 0 <= index < count:
+            raise IndexError(f"нет ряда с номером {index}")
+        if k < 0:
+            raise ValueError("k должно быть неотрицательным")
+        groups.setdefault(index, set()).add(k)
+    return [(index, sorted(ks)) for index, ks in sorted(groups.items())]
+
+
+def _batches(groups, offsets, parts):
+    """Пачки групп примерно равного суммарного размера рядов."""
+    total = sum(offsets[index + 1] - offsets[index] + 1 for index, _ in groups)
+    target = max(1, total // parts)
+    batch, size = [], 0
+    for group in groups:
+        index = group[0]
+        batch.append(group)
+        size += offsets[index + 1] - offsets[index] + 1
+        if size >= target:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def run_backtest(series, jobs, workers=None):
+    """
+    Генератор кортежей (номер ряда, k, максимальная прибыль) для каждого
+    различного задания (номер ряда, k) из jobs.
+
+    series  — последовательность рядов цен (целые числа в пределах int64);
+    workers — число процессов (по умолчанию os.cpu_count()).
+    Результаты приходят по мере готовности, не в порядке jobs.
+    """
+    workers = workers or os.cpu_count() or 1
+    groups = _group_jobs(jobs, len(series))
+    if not groups:
+        return
+
+    offsets = [0]
+    for row in series:
+        offsets.append(offsets[-1] + len(row))
+    flat = array("q")
+    for row in series:
+        flat.extend(row)
+
+    nbytes = len(flat) * flat.itemsize
+    # Блок нулевого размера создать нельзя
+    block = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+    try:
+        block.buf[:nbytes] = memoryview(flat).cast("B")
+        del flat
+        # Несколько пачек на процесс: выравнивает нагрузку, если ряды разные
+        with ProcessPoolExecutor(workers, initializer=_attach,
+                                 initargs=(block.name, nbytes, offsets)) as pool:
+            futures = [pool.submit(_run_groups, batch)
+                       for batch in _batches(groups, offsets, workers * 4)]
+            try:
+                for future in as_completed(futures):
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        block.close()
+        block.unlink()
@@ -0,0 +1,122 @@
+# Файл: batch.py
+# Пакетный расчёт task_4 для многих рядов цен сразу (NumPy).
+#
+# Теоретическая сложность:
+#   - Временная: O(T · B · k) элементарных операций, но всего O(T) вызовов
+#     NumPy — по четыре на момент времени для всех B рядов и всех t = 1..k
+#   - Пространственная: O(B · (T + k))
+#
+# Подход:
+#   Ряды разной длины складываются в матрицу B × T; хвост каждой строки
+#   заполняется её последней ценой. Постоянная цена не меняет ни ответ ДП,
+#   ни жадную сумму, поэтому маска длин дальше не нужна.
+#
+#   Жадный режим (k >= n // 2) для всех строк сразу: np.diff по времени,
+#   отсечение отрицательных изменений (clip) и сумма по строке.
+#
+#   ДП hold/sold векторизуется и по рядам, и по номеру сделки t:
+#     hold[:, t] = max(hold[:, t], sold[:, t-1] − p)     для всех t сразу
+#     sold[:, t] = max(sold[:, t], hold[:, t] + p)
+#   В task_4.py hold[t] берёт sold[t-1], уже обновлённый в этот же момент;
+#   здесь — значение с прошлого шага. Ответ от этого не меняется: новый
+#   sold[t-1] добавляет лишь кандидата hold[t-1] (купить и сразу продать по
+#   той же цене), а hold[t] >= hold[t-1] и так.
+#
+# NumPy — необязательная зависимость, как и в task_2: без неё функции
+# модуля недоступны, а task_4.py работает как прежде.
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не установлен
+    np = None
+
+
+def pad_series(series):
+    """
+    Матрица B × T (int64) из последовательностей разной длины и массив длин.
+    Хвост строки заполняется её последней ценой (пустая строка — нулями).
+    """
+    if np is None:
+        raise ImportError("pad_series требует установленный NumPy")
+    lengths = np.array([len(row) for row in series], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.zeros((len(lengths), width), dtype=np.int64)
+    for i, row in enumerate(series):
+        if len(row):
+            matrix[i, :len(row)] = row
+            matrix[i, len(row):] = row[-1]
+    return matrix, lengths
+
+
+def _forward_fill(matrix, lengths):
+    """Копия матрицы, где после конца каждой строки повторяется её последняя цена."""
+    matrix = np.array(matrix, dtype=np.int64)
+    width = matrix.shape[1]
+    if width == 0:
+        return matrix
+    columns = np.arange(width)
+    last = np.clip(lengths - 1, 0, None)
+    # Индекс столбца, из которого берётся цена: не дальше последнего в строке
+    source = np.minimum(columns[None, :], last[:, None])
+    filled = np.take_along_axis(matrix, source, axis=1)
+    filled[lengths == 0] = 0
+    return filled
+
+
+def greedy_batch(matrix):
+    """Сумма всех положительных изменений цены по каждой строке."""
+    return np.clip(np.diff(matrix, axis=1), 0, None).sum(axis=1)
+
+
+def _dp_batch(matrix, k):
+    """ДП hold/sold по всем строкам сразу; возвращает sold[:, k]."""
+    rows = matrix.shape[0]
+    # Достаточно отрицательное «минус бесконечность», не переполняющееся при + цена
+    hold = np.full((rows, k), np.iinfo(np.int64).min // 4, dtype=np.int64)
+    sold = np.zeros((rows, k + 1), dtype=np.int64)
+    buy = np.empty_like(hold)
+    for price in matrix.T:
+        column = price[:, None]
+        # sold[:, :-1] — ответы для t − 1 с прошлого шага
+        np.subtract(sold[:, :-1], column, out=buy)
+        np.maximum(hold, buy, out=hold)
+        np.add(hold, column, out=buy)
+        np.maximum(sold[:, 1:], buy, out=sold[:, 1:])
+    return sold[:, k]
+
+
+def max_profit_batch(prices, k, lengths=None):
+    """
+    Максимальная прибыль при не более чем k сделках для каждого ряда.
+
+    prices  — матрица B × T или список рядов разной длины;
+    lengths — длины рядов для матрицы (по умолчанию все T).
+    Возвращает массив int64 из B ответов.
+    """
+    if np is None:
+        raise ImportError("max_profit_batch требует установленный NumPy")
+    if isinstance(prices, np.ndarray) and prices.ndim == 2:
+        rows, width = prices.shape
+        if lengths is None:
+            matrix = prices.astype(np.int64, copy=False)
+            lengths = np.full(rows, width, dtype=np.int64)
+        else:
+            lengths = np.asarray(lengths, dtype=np.int64)
+            matrix = _forward_fill(prices, lengths)
+    else:
+        matrix, lengths = pad_series(prices)
+
+    result = np.zeros(len(lengths), dtype=np.int64)
+    if k <= 0 or matrix.shape[1] < 2:
+        return result
+
+    greedy = k >= lengths // 2
+    if greedy.any():
+        result[greedy] = greedy_batch(matrix[greedy])
+    dp_rows = ~greedy
+    if dp_rows.any():
+        sub = matrix[dp_rows]
+        # Дальше самой длинной из этих строк — только повтор последних цен
+        width = int(lengths[dp_rows].max())
+        result[dp_rows] = _dp_batch(sub[:, :width], k)
+    return result
@@ -0,0 +1,249 @@
+# Файл: benchmark.py
+# Проверка и замеры движков task_4.
+#
+# Запуск:
+#   python benchmark.py                  # проверка + замеры на n = 10^5 и 10^6
+#   python benchmark.py --checks 5000 --n 200000
+#
+# 1. Случайная сверка: на коротких рядах движки "dp" и "heap" сравниваются
+#    с полным перебором (рекурсия с мемоизацией), на длинных — друг с другом
+#    при всех k от 0 до n // 2 + 1.
+#    Там же проверяются profit_curve (оба движка) и восстановленные сделки:
+#    не больше k, не пересекаются, сумма прибыли равна оптимуму.
+# 2. Замеры: ДП против впадин/пиков при растущем k и "heap" на ряде 10^6
+#    с k = n // 2 - 1, где ДП заняло бы часы; кривая прибыли целиком против
+#    K отдельных вызовов.
+# 3. Поток цен: ProfitTracker после каждого тика против пересчёта префикса,
+#    checkpoint()/restore() и чтение файла кусками; замер тика против
+#    пересчёта всей истории.
+# 4. Перебор параметров: run_backtest по тысячам заданий (ряд, k) в 1 и
+#    в os.cpu_count() процессах против цикла max_profit_k_transactions.
+# 5. Если установлен NumPy: max_profit_batch по B рядам разной длины против
+#    цикла по рядам (оба движка), со сверкой ответов.
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from functools import lru_cache
+
+from backtest import run_backtest
+from batch import max_profit_batch, np
+from stream import ProfitTracker, max_profit_file, read_price_chunks
+from task_4 import max_profit_k_transactions, profit_curve
+
+
+def brute_force(prices, k):
+    """Полный перебор состояний (день, осталось сделок, держим ли акцию)."""
+    prices = tuple(prices)
+    n = len(prices)
+
+    @lru_cache(maxsize=None)
+    def best(day, left, holding):
+        if day == n:
+            return 0
+        result = best(day + 1, left, holding)
+        if holding:
+            result = max(result, prices[day] + best(day + 1, left - 1, False))
+        elif left > 0:
+            result = max(result, -prices[day] + best(day + 1, left, True))
+        return result
+
+    return best(0, k, False)
+
+
+def random_prices(rng, n):
+    """Цены с разным числом повторов: маленький диапазон даёт плато и равенства."""
+    high = rng.choice((2, 5, 20, 1000))
+    return [rng.randint(0, high) for _ in range(n)]
+
+
+def check_transactions(prices, k, deals, expected):
+    assert len(deals) <= k, (prices, k, deals)
+    last_sell = -1
+    for buy, sell in deals:
+        assert last_sell < buy < sell, (prices, k, deals)
+        last_sell = sell
+    assert sum(prices[sell] - prices[buy] for buy, sell in deals) == expected, (prices, k, deals)
+
+
+def check(checks, seed=0):
+    rng = random.Random(seed)
+    for _ in range(checks):
+        prices = random_prices(rng, rng.randint(0, 12))
+        for k in range(len(prices) // 2 + 2):
+            expected = brute_force(prices, k)
+            for engine in ("dp", "heap"):
+                actual = max_profit_k_transactions(prices, k, engine)
+                assert actual == expected, (prices, k, engine, actual, expected)
+        K = len(prices) // 2 + 1
+        dp_curve = profit_curve(prices, K, "dp")
+        assert profit_curve(prices, K, "heap") == dp_curve, prices
+        for k in range(K + 1):
+            _, deals = profit_curve(prices, 0, transactions_for=k)
+            check_transactions(prices, k, deals, dp_curve[k])
+    for _ in range(max(1, checks // 50)):
+        prices = random_prices(rng, rng.randint(50, 300))
+        for k in range(len(prices) // 2 + 2):
+            dp = max_profit_k_transactions(prices, k, "dp")
+            heap = max_profit_k_transactions(prices, k, "heap")
+            assert dp == heap, (prices, k, dp, heap)
+    print(f"Сверка: {checks} коротких рядов с перебором и {max(1, checks // 50)} длинных — совпадает")
+
+
+def check_stream(checks, seed=0):
+    """Трекер после каждого тика, восстановление из checkpoint и чтение файла."""
+    rng = random.Random(seed)
+    for _ in range(checks):
+        prices = random_prices(rng, rng.randint(0, 30))
+        k = rng.randint(0, 6)
+        tracker = ProfitTracker(k)
+        for i, price in enumerate(prices):
+            tracker.push(price)
+            assert tracker.current() == max_profit_k_transactions(prices[:i + 1], k, "dp"), (prices, k)
+
+        cut = rng.randint(0, len(prices))
+        tracker = ProfitTracker(k)
+        tracker.push_many(prices[:cut])
+        state = tracker.checkpoint()
+        tracker.push_many(prices[cut:])
+        resumed = ProfitTracker(k)
+        resumed.restore(state)
+        resumed.push_many(prices[cut:])
+        assert resumed.current() == tracker.current() == max_profit_k_transactions(prices, k), (prices, k)
+
+        fd, path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(map(str, prices)))
+        try:
+            chunk_size = rng.randint(1, 8)
+            assert [x for chunk in read_price_chunks(path, chunk_size) for x in chunk] == prices
+            assert max_profit_file(path, k, chunk_size) == tracker.current()
+        finally:
+            os.remove(path)
+    print(f"Сверка потока: {checks} рядов — совпадает")
+
+
+def benchmark_stream(prices, k=10, ticks=1000):
+    """Стоимость одного тика у трекера против пересчёта всей истории."""
+    history, tail = prices[:-ticks], prices[-ticks:]
+    tracker = ProfitTracker(k)
+    tracker.push_many(history)
+    start = time.perf_counter()
+    for price in tail:
+        tracker.push(price)
+    tick_time = (time.perf_counter() - start) / ticks
+    # Пересчёт хватает на несколько тиков — больше и не нужно для сравнения
+    start = time.perf_counter()
+    for i in range(3):
+        max_profit_k_transactions(prices[:len(history) + i + 1], k, "dp")
+    recompute_time = (time.perf_counter() - start) / 3
+    assert tracker.current() == max_profit_k_transactions(prices, k)
+    print(f"\nПоток, история {len(history)} цен, k = {k}: тик {tick_time * 1e6:.1f} мкс, "
+          f"пересчёт ДП {recompute_time * 1e3:.0f} мс")
+
+
+def benchmark_backtest(rows=2000, width=2000, ks=(1, 2, 5, 10, 20, 50, 100), seed=0):
+    rng = random.Random(seed)
+    series = [[rng.randint(0, 10**6) for _ in range(rng.randint(width // 2, width))]
+              for _ in range(rows)]
+    jobs = [(index, k) for index in range(rows) for k in ks]
+    # Пустые ряды: блок общей памяти без цен
+    assert list(run_backtest([[]], [(0, 1)], 1)) == [(0, 1, 0)]
+    assert sorted(run_backtest([[], [3, 1, 4], []], [(0, 2), (1, 1), (2, 0)], 2)) == \
+        [(0, 2, 0), (1, 1, 3), (2, 0, 0)]
+    # Огромное k: кривая ограничена n // 2 сделками, а не k + 1 элементами
+    assert list(run_backtest([[3, 1, 4, 1]], [(0, 10**8), (0, 1)], 1)) == [(0, 1, 3), (0, 10**8, 3)]
+    print(f"\nПеребор параметров: {len(jobs)} заданий по {rows} рядам длиной до {width}:")
+    start = time.perf_counter()
+    expected = {(index, k): max_profit_k_transactions(series[index], k) for index, k in jobs}
+    print(f"  цикл по заданиям: {time.perf_counter() - start:.2f} с")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        results = {(index, k): profit for index, k, profit in run_backtest(series, jobs, workers)}
+        elapsed = time.perf_counter() - start
+        assert results == expected
+        print(f"  run_backtest, процессов {workers}: {elapsed:.2f} с")
+
+
+def check_batch(checks, seed=0):
+    """Пакет против поштучного ДП на рядах разной длины, включая пустые."""
+    rng = random.Random(seed)
+    for _ in range(checks):
+        series = [random_prices(rng, rng.randint(0, 30)) for _ in range(rng.randint(1, 10))]
+        for k in range(0, 20, 3):
+            expected = [max_profit_k_transactions(row, k, "dp") for row in series]
+            assert max_profit_batch(series, k).tolist() == expected, (series, k)
+    print(f"Сверка пакета: {checks} наборов рядов — совпадает")
+
+
+def benchmark_batch(rows=1000, width=2000, k=10, seed=0):
+    rng = random.Random(seed)
+    series = [[rng.randint(0, 10**6) for _ in range(rng.randint(width // 2, width))]
+              for _ in range(rows)]
+    start = time.perf_counter()
+    batch = max_profit_batch(series, k).tolist()
+    batch_time = time.perf_counter() - start
+    print(f"\n{rows} рядов длиной до {width}, k = {k}:")
+    print(f"  max_profit_batch: {batch_time:.2f} с")
+    for engine in ("heap", "dp"):
+        start = time.perf_counter()
+        single = [max_profit_k_transactions(row, k, engine) for row in series]
+        elapsed = time.perf_counter() - start
+        assert single == batch
+        print(f"  цикл по рядам, {engine}: {elapsed:.2f} с")
+
+
+def timed(prices, k, engine):
+    start = time.perf_counter()
+    result = max_profit_k_transactions(prices, k, engine)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка и замеры движков task_4")
+    parser.add_argument('--checks', type=int, default=2000, help='число случайных коротких рядов')
+    parser.add_argument('--n', type=int, default=100_000, help='длина ряда для замеров ДП')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    check(args.checks, args.seed)
+    check_stream(max(1, args.checks // 10), args.seed)
+    if np is not None:
+        check_batch(max(1, args.checks // 10), args.seed)
+
+    rng = random.Random(args.seed)
+    prices = [rng.randint(0, 10**6) for _ in range(args.n)]
+    print(f"\nn = {args.n}:")
+    for k in (1, 10, 100):
+        dp, dp_time = timed(prices, k, "dp")
+        heap, heap_time = timed(prices, k, "heap")
+        assert dp == heap
+        print(f"  k = {k:>4}: dp {dp_time:7.3f} с, heap {heap_time:6.3f} с")
+
+    K = 20
+    start = time.perf_counter()
+    separate = [max_profit_k_transactions(prices, k, "dp") for k in range(K + 1)]
+    separate_time = time.perf_counter() - start
+    start = time.perf_counter()
+    curve = profit_curve(prices, K)
+    curve_time = time.perf_counter() - start
+    assert curve == separate
+    print(f"  кривая для k = 0..{K}: {K} вызовов dp {separate_time:.1f} с, "
+          f"profit_curve {curve_time:.3f} с")
+
+    big = [rng.randint(0, 10**6) for _ in range(10**6)]
+    k = len(big) // 2 - 1
+    _, heap_time = timed(big, k, "heap")
+    print(f"\nn = 10^6, k = {k}: heap {heap_time:.2f} с (ДП — O(n·k) ≈ 5·10^11 шагов)")
+
+    benchmark_stream(prices)
+    benchmark_backtest(seed=args.seed)
+
+    if np is not None:
+        benchmark_batch(seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Файл: stream.py
+# Потоковый расчёт task_4: цены приходят по одной (тиками), ответ нужен
+# после каждой.
+#
+# Теоретическая сложность:
+#   - Временная: O(k) на тик, current() — O(1)
+#   - Пространственная: O(k); файл цен читается кусками, а не целиком
+#
+# Подход:
+#   ДП hold/sold из task_4.py не зависит от будущих цен: после каждой цены
+#   массивы описывают оптимум для уже пришедшего префикса. ProfitTracker
+#   хранит их между вызовами и досчитывает только новый тик, вместо
+#   пересчёта всей истории за O(n·k) на каждый тик.
+#
+#   checkpoint() — копия состояния (число тиков, hold, sold) из кортежей;
+#   её можно сохранить (pickle) и вернуть через restore(), в том числе
+#   в новом трекере с тем же k.
+#
+#   read_price_chunks() читает файл цен блоками фиксированного размера и
+#   отдаёт списки чисел; число, разрезанное границей блока, склеивается
+#   со следующим блоком.
+
+# hold до первой покупки: любая прибыль больше
+_NO_HOLD = float("-inf")
+
+
+class ProfitTracker:
+    """Максимальная прибыль при не более чем k сделках по потоку цен."""
+
+    def __init__(self, k):
+        if k < 0:
+            raise ValueError("k должно быть неотрицательным")
+        self.k = k
+        self.ticks = 0
+        # hold[0] не используется: индексы совпадают с task_4.py
+        self.hold = [_NO_HOLD] * (k + 1)
+        self.sold = [0] * (k + 1)
+
+    def push(self, price):
+        """Добавляет одну цену за O(k)."""
+        self.push_many((price,))
+
+    def push_many(self, prices):
+        """Добавляет цены по порядку; prices — любая итерируемая последовательность."""
+        hold = self.hold
+        sold = self.sold
+        steps = range(1, self.k + 1)
+        ticks = 0
+        for price in prices:
+            ticks += 1
+            for t in steps:
+                buy = sold[t - 1] - price
+                if buy > hold[t]:
+                    hold[t] = buy
+                sell = hold[t] + price
+                if sell > sold[t]:
+                    sold[t] = sell
+        self.ticks += ticks
+
+    def current(self):
+        """Ответ для всех цен, пришедших до сих пор."""
+        return self.sold[self.k]
+
+    def curve(self):
+        """curve[t] — ответ при не более чем t сделках, t = 0..k (как profit_curve)."""
+        return list(self.sold)
+
+    def checkpoint(self):
+        """Неизменяемая копия состояния: (число тиков, hold, sold)."""
+        return self.ticks, tuple(self.hold), tuple(self.sold)
+
+    def restore(self, state):
+        """Возвращает трекер к состоянию, полученному от checkpoint()."""
+        ticks, hold, sold = state
+        if len(sold) != self.k + 1 or len(hold) != self.k + 1:
+            raise ValueError(f"состояние для k = {len(sold) - 1}, а трекер для k = {self.k}")
+        self.ticks = ticks
+        self.hold = list(hold)
+        self.sold = list(sold)
+
+
+def read_price_chunks(path, chunk_size=1 << 16):
+    """
+    Генератор списков цен из текстового файла (числа через пробелы или
+    переводы строк). chunk_size — размер читаемого блока в символах.
+    """
+    tail = ""
+    with open(path) as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            tokens = (tail + block).split()
+            # Последнее число могло оборваться на границе блока
+            tail = "" if block[-1].isspace() else tokens.pop()
+            if tokens:
+                yield list(map(int, tokens))
+    if tail:
+        yield [int(tail)]
+
+
+def max_profit_file(path, k, chunk_size=1 << 16):
+    """Ответ для файла цен без загрузки всего ряда в память."""
+    tracker = ProfitTracker(k)
+    for chunk in read_price_chunks(path, chunk_size):
+        tracker.push_many(chunk)
+    return tracker.current()
@@ -3,6 +3,7 @@
 # 
 # Теоретическая сложность:
 #   - Временная: O(n * k), если k < n // 2; иначе O(n)
+#     (движок "heap" — O(n log n) при любом k, см. valley_peak.py)
 #   - Пространственная: O(k)
 #
 # Подход:
@@ -13,10 +14,28 @@
 #   Оптимизация:
 #     Если k >= n // 2, то ограничение на сделки несущественно,
 #     и задача решается жадно: сумма всех положительных изменений цен.
+#
+# Движки (параметр engine):
+#   "dp"   — динамическое программирование выше, O(n·k);
+#   "heap" — пары впадина/пик со стеком и кучей прибылей, O(n log n);
+#   "auto" — жадный режим при k >= n // 2, иначе "heap": по замерам он
+#            быстрее ДП уже при k = 1, а при k порядка n ДП занимает часы.
+#
+# Кривая прибыли profit_curve(prices, K) — ответы сразу для всех k = 0..K:
+#   в ДП это массив sold[] после прохода (O(n·K)), в "heap" — префиксные
+#   суммы отсортированных прибылей элементарных сделок (O(n log n)).
+#   Сами сделки (дни покупки и продажи) восстанавливаются по тем же
+#   элементарным сделкам без таблицы O(n·k).
+
+from valley_peak import best_transactions, max_profit_heap, profit_curve_heap
 
+ENGINES = ("auto", "dp", "heap")
 
-def max_profit_k_transactions(prices, k):
+
+def max_profit_k_transactions(prices, k, engine="auto"):
     """Возвращает максимальную прибыль при не более чем k сделках."""
+    if engine not in ENGINES:
+        raise ValueError(f"неизвестный движок: {engine!r}")
     if not prices or k == 0:
         return 0
 
@@ -30,6 +49,14 @@ def max_profit_k_transactions(prices, k):
                 profit += prices[i] - prices[i - 1]
         return profit
 
+    if engine != "dp":
+        return max_profit_heap(prices, k)
+
+    return _dp_sold(prices, k)[k]
+
+
+def _dp_sold(prices, k):
+    """Массив sold[] после прохода ДП: sold[t] — ответ при не более чем t сделках."""
     # DP-массивы
     sold = [0] * (k + 1)
     hold = [-10**9] * (k + 1) 
@@ -39,7 +66,31 @@ def max_profit_k_transactions(prices, k):
             hold[t] = max(hold[t], sold[t - 1] - price)
             sold[t] = max(sold[t], hold[t] + price)
 
-    return sold[k]
+    return sold
+
+
+def profit_curve(prices, K, engine="auto", transactions_for=None):
+    """
+    Максимальная прибыль для каждого числа сделок: curve[t] при t = 0..K.
+    Если задан transactions_for = k, возвращает (curve, сделки), где
+    сделки — пары (день покупки, день продажи) с 0 для оптимума при k.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"неизвестный движок: {engine!r}")
+    if K < 0:
+        raise ValueError("K должно быть неотрицательным")
+
+    if engine == "dp":
+        # Больше n // 2 сделок ничего не добавляют
+        limit = min(K, len(prices) // 2)
+        curve = _dp_sold(prices, limit)
+        curve.extend([curve[-1]] * (K - limit))
+    else:
+        curve = profit_curve_heap(prices, K)
+
+    if transactions_for is None:
+        return curve
+    return curve, best_transactions(prices, transactions_for)
 
 def main():
     print("=== Максимальная прибыль при ≤ k сделках ===")
@@ -76,6 +127,11 @@ def main():
     print(f"Макс. число сделок: {k}")
     print(f"Максимальная прибыль: {result}")
 
+    curve, deals = profit_curve(prices, k, transactions_for=k)
+    print(f"Прибыль при 0..{k} сделках: {curve}")
+    print("Сделки (покупка → продажа, дни с 1):",
+          ", ".join(f"{buy + 1} → {sell + 1}" for buy, sell in deals) or "нет")
+
 if __name__ == "__main__":
     main()
 
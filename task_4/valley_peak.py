@@ -0,0 +1,138 @@
+# Файл: valley_peak.py
+# Движок task_4, не зависящий от k: разбиение графика цен на «элементарные»
+# сделки (пары впадина/пик) со стеком и выбор k самых прибыльных через кучу.
+#
+# Теоретическая сложность:
+#   - Временная: O(n + m log m), m ≤ n/2 — число пар впадина/пик; от k не зависит
+#   - Пространственная: O(n)
+#
+# Подход:
+#   Проходим по цене слева направо, выделяя очередную пару (впадина v, пик p)
+#   монотонного роста. Стек хранит ещё «открытые» пары. Для новой пары (v, p):
+#     1. Пока впадина на вершине стека выше v, пару с вершины уже нельзя
+#        выгодно объединить ни с чем правее — её прибыль фиксируется.
+#     2. Пока пик на вершине стека не выше p, пары (v1, p1) и (v, p) меняются
+#        на (v1, p) и (v, p1): прибыль p1 − v фиксируется как отдельная
+#        сделка, а (v1, p) продолжает участвовать в объединениях.
+#        Это «слияние/разделение»: одна длинная сделка (v1, p) плюс
+#        p1 − v дают ту же сумму, что две короткие (v1, p1) и (v, p).
+#   После прохода оставшиеся в стеке пары тоже фиксируются.
+#
+#   Полученные прибыли обладают свойством: сумма t наибольших из них равна
+#   максимальной прибыли при не более чем t сделках — для любого t сразу.
+#   Поэтому ответ для k — сумма k наибольших (heapq.nlargest), а вся кривая
+#   прибыли по k — префиксные суммы отсортированного списка.
+#
+# Восстановление сделок:
+#   Зафиксированная пара — «корень»: держим акцию на отрезке [покупка,
+#   продажа]. Каждая «разница» p1 − v — «разрез»: продать в p1 и снова
+#   купить в v, то есть не держать акцию на отрезке [p1, v] внутри корня.
+#   Отрезки всех элементарных сделок образуют вложенное семейство: разрезы
+#   лежат внутри своего корня, а корни, закрытые между p1 и v, — внутри
+#   разреза. Прибыль вложенной сделки не больше прибыли охватывающей,
+#   поэтому среди k наибольших (при равенстве — сначала более длинный
+#   отрезок, он и есть охватывающий) вместе с каждой сделкой выбрана и
+#   охватывающая. Тогда сумма «+1 на корнях, −1 на разрезах» в каждый день
+#   равна 0 или 1, и участки, где она равна 1, — искомые сделки.
+
+import heapq
+from itertools import accumulate
+
+# Вид элементарной сделки
+_ROOT = 0
+_CUT = 1
+
+
+def _decompose(prices):
+    """
+    Элементарные сделки: список (прибыль, вид, i, j).
+    Корень — покупка в день i, продажа в день j; разрез — продажа в день i,
+    покупка в день j внутри отрезка своего корня.
+    """
+    n = len(prices)
+    items = []
+    # Открытые сделки: (цена впадины, цена пика, день впадины, день пика)
+    stack = []
+    i = 0
+    while i < n:
+        # Впадина: конец участка невозрастания
+        while i + 1 < n and prices[i + 1] <= prices[i]:
+            i += 1
+        valley, low_day = prices[i], i
+        # Пик: конец участка неубывания
+        while i + 1 < n and prices[i + 1] >= prices[i]:
+            i += 1
+        peak, high_day = prices[i], i
+        i += 1
+        if peak <= valley:
+            continue
+
+        while stack and stack[-1][0] > valley:
+            low, high, buy, sell = stack.pop()
+            items.append((high - low, _ROOT, buy, sell))
+        while stack and stack[-1][1] <= peak:
+            low, high, buy, sell = stack.pop()
+            items.append((high - valley, _CUT, sell, low_day))
+            valley, low_day = low, buy
+        stack.append((valley, peak, low_day, high_day))
+
+    for low, high, buy, sell in stack:
+        items.append((high - low, _ROOT, buy, sell))
+    return items
+
+
+def transaction_profits(prices):
+    """
+    Прибыли элементарных сделок (в порядке фиксации, не отсортированы):
+    сумма t наибольших — максимальная прибыль при не более чем t сделках.
+    """
+    return [item[0] for item in _decompose(prices)]
+
+
+def max_profit_heap(prices, k):
+    """Максимальная прибыль при не более чем k сделках за O(n log n) при любом k."""
+    if k <= 0:
+        return 0
+    return sum(heapq.nlargest(k, transaction_profits(prices)))
+
+
+def profit_curve_heap(prices, K):
+    """curve[t] — максимальная прибыль при не более чем t сделках, t = 0..K."""
+    profits = sorted(transaction_profits(prices), reverse=True)[:K]
+    curve = [0]
+    curve.extend(accumulate(profits))
+    # Больше сделок, чем элементарных, прибыли не добавляет
+    curve.extend([curve[-1]] * (K + 1 - len(curve)))
+    return curve
+
+
+def best_transactions(prices, k):
+    """
+    Оптимальные сделки при не более чем k сделках: список пар
+    (день покупки, день продажи) по возрастанию, дни с 0. O(n log n).
+    """
+    if k <= 0:
+        return []
+    # Ключ (−прибыль, −длина отрезка): охватывающая сделка раньше вложенной
+    chosen = heapq.nsmallest(
+        k, ((-profit, i - j, kind, i, j)
+            for profit, kind, i, j in _decompose(prices) if profit > 0))
+
+    # Сколько акций держим: корень +1 на [i, j), разрез −1 на [i, j)
+    delta = {}
+    for _, _, kind, i, j in chosen:
+        sign = 1 if kind == _ROOT else -1
+        delta[i] = delta.get(i, 0) + sign
+        delta[j] = delta.get(j, 0) - sign
+
+    result = []
+    holding = 0
+    buy = None
+    for day in sorted(delta):
+        now = holding + delta[day]
+        if holding == 0 and now == 1:
+            buy = day
+        elif holding == 1 and now == 0:
+            result.append((buy, day))
+        holding = now
+    return result
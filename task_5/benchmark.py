@@ -0,0 +1,274 @@
+# Файл: benchmark.py
+# Проверка и замеры max_guests_day из task_5.
+#
+# Запуск:
+#   python benchmark.py                     # сверка + замеры на n = 10^6
+#   python benchmark.py --checks 5000 --n 200000
+#
+# 1. Случайная сверка с подсчётом «в лоб»: для каждого дня каждого
+#    бронирования +1, ответ — самый ранний день с максимумом. Даты берутся
+#    из узкого и широкого диапазонов, так что проверяются и массив
+#    разностей, и разреженный режим; много совпадающих дат заезда и
+#    отъезда.
+# 2. Замеры: прежняя реализация (strptime на каждую дату и сортировка 2n
+#    событий datetime) против разбора с кэшем и массива разностей —
+#    на плотных датах (сезон в два года) и на широком диапазоне (100 лет).
+# 3. OccupancyIndex: случайные добавления и отмены бронирований вперемешку
+#    с запросами сверяются с подсчётом по дням; замер серии запросов
+#    против пересчёта max_guests_day на каждый запрос.
+# 4. Файл CSV: max_guests_day_file кусками (1 процесс и os.cpu_count())
+#    против чтения всего файла в список; время и пик памяти (tracemalloc).
+# 5. Группы (отели/типы номеров): grouped_peaks и grouped_top_days обоими
+#    движками против цикла max_guests_day по группам, со сверкой пиков;
+#    отдельно — с одной далёкой датой (разреженный путь NumPy-движка).
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from grouped import grouped_peaks, grouped_top_days, np
+from ingest import max_guests_day_file
+from occupancy_index import OccupancyIndex
+from task_5 import format_day, max_guests_day
+
+# %y в strptime понимает годы 1969-2068
+FIRST_DAY = date(1969, 1, 1).toordinal()
+LAST_DAY = date(2068, 12, 31).toordinal()
+
+
+def brute_force(bookings):
+    """Число гостей в каждый день подсчётом по всем дням всех бронирований."""
+    guests = {}
+    for arrival, departure in bookings:
+        day = datetime.strptime(arrival, "%d.%m.%y").toordinal()
+        last = datetime.strptime(departure, "%d.%m.%y").toordinal()
+        while day <= last:
+            guests[day] = guests.get(day, 0) + 1
+            day += 1
+    if not guests:
+        return None
+    best = max(guests.values())
+    return format_day(min(day for day, count in guests.items() if count == best))
+
+
+def sorted_events(bookings):
+    """Прежняя реализация: strptime на каждую дату и сортировка событий datetime."""
+    events = []
+    for arrival, departure in bookings:
+        events.append((datetime.strptime(arrival, "%d.%m.%y"), 1))
+        events.append((datetime.strptime(departure, "%d.%m.%y") + timedelta(days=1), -1))
+    events.sort(key=lambda x: x[0])
+    current = best = 0
+    best_day = None
+    for day, delta in events:
+        current += delta
+        if current > best:
+            best = current
+            best_day = day
+    return best_day.strftime("%d.%m.%y") if best_day else None
+
+
+def random_bookings(rng, n, first, span, max_stay):
+    bookings = []
+    for _ in range(n):
+        arrival = first + rng.randrange(span)
+        departure = min(arrival + rng.randint(0, max_stay), LAST_DAY)
+        bookings.append((format_day(arrival), format_day(departure)))
+    return bookings
+
+
+def check(checks, seed=0):
+    rng = random.Random(seed)
+    for _ in range(checks):
+        span = rng.choice((3, 30, 400, 30000))
+        first = rng.randint(FIRST_DAY, LAST_DAY - span)
+        bookings = random_bookings(rng, rng.randint(0, 30), first, span, rng.choice((0, 2, 40)))
+        assert max_guests_day(bookings) == brute_force(bookings), bookings
+    print(f"Сверка: {checks} наборов бронирований с подсчётом по дням — совпадает")
+
+
+def check_index(checks, seed=0):
+    """Индекс после каждого добавления/отмены против списка живых бронирований."""
+    rng = random.Random(seed)
+    for _ in range(checks):
+        days = rng.randint(1, 60)
+        first = rng.randint(FIRST_DAY, LAST_DAY - days)
+        last = first + days - 1
+
+        def booking():
+            arrival = first + rng.randrange(days)
+            return arrival, min(last, arrival + rng.randint(0, 10))
+
+        live = [booking() for _ in range(rng.randint(0, 15))]
+        index = OccupancyIndex.from_bookings(
+            [(format_day(a), format_day(d)) for a, d in live], first, last)
+        for _ in range(20):
+            if rng.random() < 0.3:
+                live.append(booking())
+                index.add(*live[-1])
+            elif live and rng.random() < 0.3:
+                index.cancel(*live.pop(rng.randrange(len(live))))
+            guests = [sum(a <= day <= d for a, d in live) for day in range(first, last + 1)]
+            day = rng.randrange(days)
+            assert index.guests_on(first + day) == guests[day], live
+            lo = rng.randrange(days)
+            hi = rng.randrange(lo, days)
+            top = max(guests[lo:hi + 1])
+            expected = (format_day(first + guests.index(top, lo)), top) if top > 0 else (None, 0)
+            assert index.busiest(first + lo, first + hi) == expected, live
+    print(f"Сверка OccupancyIndex: {checks} наборов по 20 операций — совпадает")
+
+
+def benchmark_index(bookings, queries=10_000, seed=0):
+    """Серия запросов к индексу против max_guests_day на каждый запрос."""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    index = OccupancyIndex.from_bookings(bookings)
+    build_time = time.perf_counter() - start
+    days = index.last_day - index.first_day + 1
+    start = time.perf_counter()
+    for _ in range(queries):
+        lo = index.first_day + rng.randrange(days)
+        hi = min(index.last_day, lo + 30)
+        index.add(lo, hi)
+        index.busiest(lo, hi)
+        index.guests_on(hi)
+        index.cancel(lo, hi)
+    query_time = (time.perf_counter() - start) / queries
+    _, rerun_time = timed(max_guests_day, bookings)
+    print(f"\nOccupancyIndex, n = {len(bookings)}, D = {days}: построение {build_time:.2f} с")
+    print(f"  добавление + месяц-максимум + день + отмена: {query_time * 1e6:.0f} мкс "
+          f"против {rerun_time:.2f} с на пересчёт max_guests_day")
+
+
+def measured(function, *args, **kwargs):
+    """(результат, секунды, пик выделенной памяти в МБ) — время без tracemalloc."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def load_whole_file(path):
+    with open(path, newline="") as f:
+        return max_guests_day([(row[0], row[1]) for row in csv.reader(f)])
+
+
+def benchmark_file(bookings):
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            csv.writer(f).writerows(bookings)
+        print(f"\nФайл CSV, {len(bookings)} строк, {os.path.getsize(path) / 2**20:.0f} МБ:")
+        expected, elapsed, peak = measured(load_whole_file, path)
+        print(f"  весь файл в список + max_guests_day: {elapsed:.2f} с, пик {peak:.0f} МБ")
+        for workers in sorted({1, os.cpu_count() or 1}):
+            result, elapsed, peak = measured(max_guests_day_file, path, workers=workers)
+            assert result == expected
+            print(f"  max_guests_day_file, процессов {workers}: {elapsed:.2f} с, "
+                  f"пик {peak:.0f} МБ (в главном процессе)")
+    finally:
+        os.remove(path)
+
+
+def benchmark_grouped(bookings, groups=1000, top=5, seed=0):
+    rng = random.Random(seed)
+    group_ids = [rng.randrange(groups) for _ in bookings]
+    arrivals = [arrival for arrival, _ in bookings]
+    departures = [departure for _, departure in bookings]
+    print(f"\nГруппы: {len(bookings)} бронирований, {groups} групп:")
+
+    start = time.perf_counter()
+    per_group = {}
+    for group, booking in zip(group_ids, bookings):
+        per_group.setdefault(group, []).append(booking)
+    expected = {group: max_guests_day(rows) for group, rows in per_group.items()}
+    print(f"  цикл max_guests_day по группам: {time.perf_counter() - start:.2f} с")
+
+    for backend in ("python", "numpy") if np is not None else ("python",):
+        start = time.perf_counter()
+        peaks = grouped_peaks(group_ids, arrivals, departures, backend)
+        peak_time = time.perf_counter() - start
+        assert {group: day for group, (day, _) in peaks.items()} == expected, backend
+        start = time.perf_counter()
+        top_days = grouped_top_days(group_ids, arrivals, departures, top, backend)
+        top_time = time.perf_counter() - start
+        assert all(top_days[group][0] == peaks[group] for group in per_group), backend
+        print(f"  {backend:>6}, строки дат: пики {peak_time:.2f} с, топ-{top} {top_time:.2f} с")
+
+    if np is not None:
+        columns = (np.array(group_ids),
+                   np.array([datetime.strptime(day, "%d.%m.%y").toordinal() for day in arrivals]),
+                   np.array([datetime.strptime(day, "%d.%m.%y").toordinal() for day in departures]))
+        start = time.perf_counter()
+        peaks = grouped_peaks(*columns, backend="numpy")
+        peak_time = time.perf_counter() - start
+        assert {group: day for group, (day, _) in peaks.items()} == expected
+        start = time.perf_counter()
+        grouped_top_days(*columns, top, backend="numpy")
+        top_time = time.perf_counter() - start
+        print(f"   numpy, массивы номеров дней: пики {peak_time:.2f} с, топ-{top} {top_time:.2f} с")
+
+        # Одно бронирование 1970 года: плотная матрица G × W раздулась бы
+        # в сотни МБ — движок переходит на разреженный путь
+        group_column, arrival_column, departure_column = columns
+        arrival_column = arrival_column.copy()
+        departure_column = departure_column.copy()
+        arrival_column[0] = departure_column[0] = date(1970, 1, 1).toordinal()
+        outlier = (group_column, arrival_column, departure_column)
+        peaks, elapsed, peak_memory = measured(grouped_peaks, *outlier, backend="numpy")
+        assert peaks == grouped_peaks(*outlier, backend="python")
+        assert (grouped_top_days(*outlier, top, backend="numpy")
+                == grouped_top_days(*outlier, top, backend="python"))
+        print(f"   numpy, с бронированием 1970 года: пики {elapsed:.2f} с, пик памяти {peak_memory:.0f} МБ")
+
+
+def timed(function, bookings):
+    start = time.perf_counter()
+    result = function(bookings)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка и замеры task_5")
+    parser.add_argument('--checks', type=int, default=2000, help='число случайных наборов')
+    parser.add_argument('--n', type=int, default=1_000_000, help='число бронирований для замеров')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    check(args.checks, args.seed)
+    check_index(max(1, args.checks // 10), args.seed)
+
+    rng = random.Random(args.seed)
+    cases = (
+        ("плотные даты (2 года)", date(2023, 1, 1).toordinal(), 730, 14),
+        ("широкий диапазон (100 лет)", FIRST_DAY, LAST_DAY - FIRST_DAY - 30, 30),
+    )
+    for name, first, span, max_stay in cases:
+        bookings = random_bookings(rng, args.n, first, span, max_stay)
+        old, old_time = timed(sorted_events, bookings)
+        new, new_time = timed(max_guests_day, bookings)
+        print(f"\n{name}, n = {args.n}: ответ {new}")
+        print(f"  strptime + сортировка событий: {old_time:.2f} с (ответ {old})")
+        print(f"  разбор с кэшем + массив разностей: {new_time:.2f} с")
+
+    season = date(2023, 1, 1).toordinal()
+    bookings = random_bookings(rng, args.n, season, 730, 14)
+    benchmark_index(bookings, seed=args.seed)
+    benchmark_file(bookings)
+    benchmark_grouped(bookings, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+# Файл: grouped.py
+# Занятость task_5 сразу для многих групп (отелей, типов номеров):
+# самый загруженный день и N самых загруженных дней каждой группы.
+#
+# Теоретическая сложность (G — групп, W — наибольший диапазон дней группы,
+# u — различных дней с событиями в группе):
+#   - NumPy, плотная матрица: O(n + G · W) для пиков, O(n + G · W log W)
+#     для топ-N; память O(n + G · W)
+#   - Разреженный путь (чистый Python или NumPy при G · W ≫ n):
+#     O(n + Σ u log u), память O(n)
+#
+# Подход:
+#   Вход — три столбца одинаковой длины: группа, заезд, отъезд (строки
+#   'ДД.ММ.ГГ' или номера дней date.toordinal).
+#
+#   backend="numpy": группы нумеруются, а различные строки дат разбираются
+#   по одному разу. Для списков — через словари различных значений
+#   (dict.fromkeys), для массивов NumPy — через np.unique.
+#   У каждой группы свой первый день (np.minimum.at), ячейка (группа, день)
+#   получает номер g · W + день − первый[g], где W включает и день после
+#   последнего отъезда. Массивы разностей всех групп — два np.bincount
+#   (заезды +1, дни после отъезда −1) в матрице G × W; число гостей —
+#   cumsum по строкам. Пик группы — argmax по строке (первый максимум, то
+#   есть самый ранний день, как в max_guests_day); топ-N — устойчивая
+#   сортировка строки по убыванию, при равенстве раньше более ранний день.
+#
+#   Матрица G × W плотная: одна группа с далёкой датой раздувает все строки.
+#   Поэтому, как и в max_guests_day, матрица строится, только пока в ней
+#   не больше max(DENSE_MIN_SPAN, DENSE_DAYS_PER_BOOKING · n) ячеек; иначе
+#   уже разобранные столбцы раскладываются по группам и считаются
+#   разреженным путём.
+#
+#   Разреженный путь (backend="python" и запасной путь NumPy): для каждой
+#   группы — словарь изменений по дням (day_deltas). Пик — sweep_deltas;
+#   топ-N — отрезки между соседними днями с событиями, на которых число
+#   гостей постоянно, сортируются по (−гостей, первый день) и
+#   разворачиваются в дни.
+#
+#   backend="auto" — NumPy, если установлен, иначе чистый Python.
+#   Как и в task_2, NumPy — необязательная зависимость.
+
+from task_5 import (DENSE_DAYS_PER_BOOKING, DENSE_MIN_SPAN, day_deltas, format_day,
+                    parse_day, sweep_deltas)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не установлен
+    np = None
+
+BACKENDS = ("auto", "numpy", "python")
+
+
+def _resolve_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"неизвестный движок: {backend!r}")
+    if backend == "auto":
+        backend = "numpy" if np is not None else "python"
+    if backend == "numpy" and np is None:
+        raise ImportError("backend='numpy' требует установленный NumPy")
+    return backend
+
+
+# ---------------------------------------------------------------------------
+# Разреженный путь (чистый Python)
+# ---------------------------------------------------------------------------
+
+def _split_groups(groups, arrivals, departures):
+    """{группа: (заезды, дни после отъезда)} в порядке первого появления группы."""
+    if not len(groups) == len(arrivals) == len(departures):
+        raise ValueError("столбцы группы, заезда и отъезда разной длины")
+    cache = {}
+
+    def day(value):
+        if not isinstance(value, str):
+            return value
+        result = cache.get(value)
+        if result is None:
+            result = cache[value] = parse_day(value)
+        return result
+
+    split = {}
+    for group, arrival, departure in zip(groups, arrivals, departures):
+        starts, ends = split.setdefault(group, ([], []))
+        starts.append(day(arrival))
+        ends.append(day(departure) + 1)
+    return split
+
+
+def _sparse_peaks(split):
+    result = {}
+    for group, (starts, ends) in split.items():
+        day, guests = sweep_deltas(day_deltas(starts, ends))
+        result[group] = (format_day(day), guests) if day is not None else (None, 0)
+    return result
+
+
+def _top_days(starts, ends, n):
+    """N самых загруженных дней одной группы по отрезкам постоянного числа гостей."""
+    deltas = day_deltas(starts, ends)
+    days = sorted(deltas)
+    # (−гостей, первый день, последний день) для отрезков с гостями
+    segments = []
+    guests = 0
+    for day, next_day in zip(days, days[1:]):
+        guests += deltas[day]
+        if guests > 0:
+            segments.append((-guests, day, next_day - 1))
+    segments.sort()
+    result = []
+    for minus_guests, first, last in segments:
+        for day in range(first, min(last, first + n - len(result) - 1) + 1):
+            result.append((format_day(day), -minus_guests))
+        if len(result) == n:
+            break
+    return result
+
+
+def _sparse_top_days(split, n):
+    return {group: _top_days(starts, ends, n) for group, (starts, ends) in split.items()}
+
+
+# ---------------------------------------------------------------------------
+# NumPy
+# ---------------------------------------------------------------------------
+
+def _day_column(values):
+    """Столбец номеров дней (int64); строки различных дат разбираются по одному разу."""
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "iu":
+            return values.astype(np.int64, copy=False)
+        unique, inverse = np.unique(values, return_inverse=True)
+        days = np.fromiter((parse_day(str(value)) for value in unique), dtype=np.int64, count=len(unique))
+        return days[inverse]
+    # Список строк или чисел: словарь различных значений дешевле сортировки np.unique
+    days = {value: parse_day(value) if isinstance(value, str) else value
+            for value in dict.fromkeys(values)}
+    return np.fromiter(map(days.__getitem__, values), dtype=np.int64, count=len(values))
+
+
+def _group_column(groups):
+    """(список имён групп, столбец номеров групп int64)."""
+    if isinstance(groups, np.ndarray):
+        names, group = np.unique(groups, return_inverse=True)
+        return names.tolist(), group.astype(np.int64, copy=False)
+    index = {name: i for i, name in enumerate(dict.fromkeys(groups))}
+    group = np.fromiter(map(index.__getitem__, groups), dtype=np.int64, count=len(groups))
+    return list(index), group
+
+
+def _numpy_columns(groups, arrivals, departures):
+    """(имена групп, номера групп, заезды, дни после отъезда) — столбцы int64."""
+    names, group = _group_column(groups)
+    starts = _day_column(arrivals)
+    ends = _day_column(departures) + 1
+    if not len(group) == len(starts) == len(ends):
+        raise ValueError("столбцы группы, заезда и отъезда разной длины")
+    return names, group, starts, ends
+
+
+def _split_columns(names, group, starts, ends):
+    """Те же данные, что у _split_groups, из уже разобранных столбцов."""
+    order = np.argsort(group, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(group, minlength=len(names))))).tolist()
+    starts = starts[order].tolist()
+    ends = ends[order].tolist()
+    return {name: (starts[lo:hi], ends[lo:hi])
+            for name, lo, hi in zip(names, bounds, bounds[1:])}
+
+
+def _occupancy_matrix(names, group, starts, ends):
+    """
+    (первые дни групп, матрица G × W числа гостей по дням) или None, если
+    матрица вышла бы намного больше числа бронирований.
+    Строка g описывает дни first[g] .. first[g] + W − 1.
+    """
+    first = np.full(len(names), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, group, np.minimum(starts, ends))
+    width = int((np.maximum(starts, ends) - first[group]).max()) + 1
+
+    cells = len(names) * width
+    if cells > max(DENSE_MIN_SPAN, DENSE_DAYS_PER_BOOKING * len(starts)):
+        return None
+    base = group * width - first[group]
+    diff = (np.bincount(base + starts, minlength=cells)
+            - np.bincount(base + ends, minlength=cells))
+    return first, np.cumsum(diff.reshape(len(names), width), axis=1)
+
+
+def _numpy_peaks(groups, arrivals, departures):
+    columns = _numpy_columns(groups, arrivals, departures)
+    dense = _occupancy_matrix(*columns)
+    if dense is None:
+        return _sparse_peaks(_split_columns(*columns))
+    names = columns[0]
+    first, guests = dense
+    best = guests.argmax(axis=1)
+    peak = guests[np.arange(len(names)), best]
+    return {name: (format_day(day), count) if count > 0 else (None, 0)
+            for name, day, count in zip(names, (first + best).tolist(), peak.tolist())}
+
+
+def _numpy_top_days(groups, arrivals, departures, n):
+    columns = _numpy_columns(groups, arrivals, departures)
+    dense = _occupancy_matrix(*columns)
+    if dense is None:
+        return _sparse_top_days(_split_columns(*columns), n)
+    first, guests = dense
+    order = np.argsort(-guests, axis=1, kind="stable")[:, :n]
+    counts = np.take_along_axis(guests, order, axis=1)
+    days = first[:, None] + order
+    result = {}
+    for name, row_days, row_counts in zip(columns[0], days.tolist(), counts.tolist()):
+        result[name] = [(format_day(day), count)
+                        for day, count in zip(row_days, row_counts) if count > 0]
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Общий интерфейс
+# ---------------------------------------------------------------------------
+
+def grouped_peaks(groups, arrivals, departures, backend="auto"):
+    """
+    Самый загруженный день каждой группы: {группа: (день 'ДД.ММ.ГГ', гостей)}.
+    Для каждой группы совпадает с max_guests_day по её бронированиям;
+    (None, 0), если гостей в группе не было.
+    """
+    if not len(groups):
+        return {}
+    if _resolve_backend(backend) == "numpy":
+        return _numpy_peaks(groups, arrivals, departures)
+    return _sparse_peaks(_split_groups(groups, arrivals, departures))
+
+
+def grouped_top_days(groups, arrivals, departures, n, backend="auto"):
+    """
+    N самых загруженных дней каждой группы: {группа: [(день, гостей), ...]}
+    по убыванию числа гостей, при равенстве — раньше более ранний день.
+    Дни без гостей не включаются.
+    """
+    if not len(groups) or n <= 0:
+        return {}
+    if _resolve_backend(backend) == "numpy":
+        return _numpy_top_days(groups, arrivals, departures, n)
+    return _sparse_top_days(_split_groups(groups, arrivals, departures), n)
+
+
+def _demo():
+    """Сверка обоих движков с max_guests_day по каждой группе на случайных данных."""
+    import random
+    from datetime import date
+
+    from task_5 import max_guests_day
+
+    rng = random.Random(0)
+    season = date(2024, 1, 1).toordinal()
+    groups, arrivals, departures = [], [], []
+    for _ in range(20_000):
+        arrival = season + rng.randrange(365)
+        groups.append(f"отель {rng.randrange(50)}/{rng.choice('ABC')}")
+        arrivals.append(format_day(arrival))
+        departures.append(format_day(arrival + rng.randint(0, 14)))
+
+    per_group = {}
+    for group, arrival, departure in zip(groups, arrivals, departures):
+        per_group.setdefault(group, []).append((arrival, departure))
+    expected = {group: max_guests_day(bookings) for group, bookings in per_group.items()}
+
+    backends = ("python", "numpy") if np is not None else ("python",)
+    for backend in backends:
+        peaks = grouped_peaks(groups, arrivals, departures, backend)
+        assert {group: day for group, (day, _) in peaks.items()} == expected, backend
+        top = grouped_top_days(groups, arrivals, departures, 3, backend)
+        assert all(top[group][0] == peaks[group] for group in per_group), backend
+    if np is not None:
+        assert (grouped_top_days(groups, arrivals, departures, 3, "numpy")
+                == grouped_top_days(groups, arrivals, departures, 3, "python"))
+
+    print(f"{len(per_group)} групп, {len(groups)} бронирований; движки: {', '.join(backends)}")
+    print("Пики совпадают с max_guests_day по каждой группе")
+    for group in sorted(per_group)[:3]:
+        print(f"  {group}: топ-3 дня {top[group]}")
+
+
+if __name__ == "__main__":
+    _demo()
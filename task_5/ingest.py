@@ -0,0 +1,132 @@
+# Файл: ingest.py
+# Загрузка бронирований task_5 из больших CSV-файлов: чтение кусками и
+# подсчёт по схеме map-reduce, в том числе в нескольких процессах.
+#
+# Запуск:
+#   python ingest.py bookings.csv                  # заезд, отъезд в столбцах 0 и 1
+#   python ingest.py bookings.csv --header --columns 2 3 --workers 4
+#
+# Теоретическая сложность:
+#   - Временная: O(n + u log u), u — число различных дней с событиями
+#   - Пространственная: O(chunk_size · (workers + 1) + u) — от числа
+#     бронирований в файле не зависит
+#
+# Подход:
+#   Генератор читает файл кусками по chunk_size строк. Каждый кусок
+#   (map) разбирается csv.reader и превращается в частичный словарь
+#   изменений {номер дня: ±гостей} — разреженный массив разностей
+#   task_5. Частичные словари (reduce) складываются в общий, и в конце
+#   один проход sweep_deltas даёт самый ранний день максимума — тот же
+#   ответ, что у max_guests_day на всём файле.
+#
+#   Сложение изменений коммутативно, поэтому куски можно считать
+#   в ProcessPoolExecutor и складывать в порядке готовности. В работе
+#   одновременно не больше 2 · workers кусков: чтение файла не убегает
+#   вперёд, и память ограничена. Процессам передаются сырые строки куска,
+#   так что и разбор CSV, и разбор дат идут параллельно.
+
+import argparse
+import csv
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from task_5 import booking_days, day_deltas, format_day, sweep_deltas
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def _line_chunks(path, chunk_size, header):
+    """Генератор списков сырых строк файла по chunk_size строк."""
+    with open(path, newline="") as f:
+        if header:
+            next(f, None)
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                break
+            yield lines
+
+
+def _parse_lines(lines, delimiter, columns):
+    """Пары (заезд, отъезд) из строк CSV; пустые строки пропускаются."""
+    arrival, departure = columns
+    return [(row[arrival], row[departure])
+            for row in csv.reader(lines, delimiter=delimiter) if row]
+
+
+def read_booking_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, delimiter=",",
+                        columns=(0, 1), header=False):
+    """
+    Генератор списков пар (заезд, отъезд) из CSV-файла по chunk_size строк.
+    columns — номера столбцов дат заезда и отъезда; header — пропустить
+    первую строку.
+    """
+    for lines in _line_chunks(path, chunk_size, header):
+        yield _parse_lines(lines, delimiter, columns)
+
+
+def _chunk_deltas(lines, delimiter, columns):
+    """map: частичный словарь изменений по строкам одного куска."""
+    return day_deltas(*booking_days(_parse_lines(lines, delimiter, columns)))
+
+
+def occupancy_deltas(path, chunk_size=DEFAULT_CHUNK_SIZE, delimiter=",",
+                     columns=(0, 1), header=False, workers=1):
+    """
+    Общий словарь {номер дня: изменение числа гостей} по всему файлу.
+    workers > 1 — куски считаются в стольких процессах (None — по числу ядер).
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _line_chunks(path, chunk_size, header)
+    total = Counter()
+    if workers == 1:
+        for lines in chunks:
+            total.update(_chunk_deltas(lines, delimiter, columns))
+        return total
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for lines in chunks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.update(future.result())
+            pending.add(pool.submit(_chunk_deltas, lines, delimiter, columns))
+        for future in wait(pending).done:
+            total.update(future.result())
+    return total
+
+
+def max_guests_day_file(path, **options):
+    """
+    max_guests_day для CSV-файла бронирований: дата 'ДД.ММ.ГГ' или None.
+    Параметры — как у occupancy_deltas.
+    """
+    best_day, _ = sweep_deltas(occupancy_deltas(path, **options))
+    return format_day(best_day) if best_day is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="День с максимумом гостей по CSV-файлу бронирований")
+    parser.add_argument('path', help='CSV-файл: даты заезда и отъезда в формате ДД.ММ.ГГ')
+    parser.add_argument('--columns', type=int, nargs=2, default=(0, 1), metavar=('ЗАЕЗД', 'ОТЪЕЗД'),
+                        help='номера столбцов дат (с 0)')
+    parser.add_argument('--delimiter', default=',')
+    parser.add_argument('--header', action='store_true', help='пропустить первую строку')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='строк в куске')
+    parser.add_argument('--workers', type=int, default=1, help='число процессов (0 — по числу ядер)')
+    args = parser.parse_args()
+
+    deltas = occupancy_deltas(args.path, args.chunk_size, args.delimiter,
+                              tuple(args.columns), args.header, args.workers)
+    best_day, guests = sweep_deltas(deltas)
+    if best_day is None:
+        print("Невозможно определить день (нет данных).")
+    else:
+        print(f"День с максимальным числом гостей: {format_day(best_day)} ({guests})")
+
+
+if __name__ == "__main__":
+    main()
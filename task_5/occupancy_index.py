@@ -0,0 +1,202 @@
+# Файл: occupancy_index.py
+# Индекс занятости для task_5: много запросов к одному набору бронирований
+# без пересчёта max_guests_day с нуля.
+#
+# Теоретическая сложность (D — число дней в диапазоне индекса):
+#   - Построение по списку бронирований: O(n + D)
+#   - Добавление и отмена бронирования: O(log D)
+#   - Число гостей в день, самый загруженный день на отрезке: O(log D)
+#   - Пространственная: O(D)
+#
+# Подход:
+#   Дерево отрезков над днями диапазона [first_day, last_day] в трёх
+#   списках (узел 1 — корень, дети узла p — 2p и 2p + 1, листья — с size):
+#     top[p]  — максимум числа гостей в поддереве с учётом прибавок
+#               в самом p и ниже, но без прибавок предков;
+#     add[p]  — прибавка ко всему отрезку узла (только у внутренних узлов);
+#     best[p] — самый ранний день поддерева, на котором достигается top[p].
+#   Прибавка к поддереву не меняет, где в нём максимум, поэтому best
+#   пересчитывается только при подъёме от изменённых листьев.
+#
+#   Бронирование — прибавка ±guests к отрезку [заезд, отъезд] (события
+#   task_5: +1 в день заезда, −1 после отъезда). Прибавка к отрезку
+#   раскладывается снизу вверх на O(log D) узлов, затем пересчитываются
+#   их предки — без отложенного проталкивания вниз.
+#   Число гостей в день — лист плюс прибавки предков. Максимум на отрезке —
+#   спуск сверху с накоплением прибавок; узлы обходятся слева направо,
+#   и при равенстве остаётся более ранний день, как в max_guests_day.
+#
+#   Построение: массив разностей task_5 и префиксная сумма дают листья,
+#   внутренние узлы заполняются снизу вверх.
+#
+# Дни принимаются строками 'ДД.ММ.ГГ' или номерами дней (date.toordinal).
+
+from task_5 import booking_days, diff_array, format_day, parse_day
+
+
+def _day(value):
+    """Номер дня из строки 'ДД.ММ.ГГ' или из готового номера."""
+    return parse_day(value) if isinstance(value, str) else value
+
+
+class OccupancyIndex:
+    """Число гостей по дням диапазона с изменением бронирований на лету."""
+
+    def __init__(self, first_day, last_day):
+        first = _day(first_day)
+        last = _day(last_day)
+        if last < first:
+            raise ValueError("последний день диапазона раньше первого")
+        self.first_day = first
+        self.last_day = last
+        days = last - first + 1
+        size = 1
+        while size < days:
+            size *= 2
+        self._size = size
+        self._top = [0] * (2 * size)
+        self._add = [0] * size
+        self._best = [0] * size + list(range(size))
+        for p in range(size - 1, 0, -1):
+            self._best[p] = self._best[2 * p]
+
+    @classmethod
+    def from_bookings(cls, bookings, first_day=None, last_day=None):
+        """
+        Индекс по списку пар (заезд, отъезд) за O(n + D). Диапазон — от
+        самого раннего до самого позднего дня бронирований; first_day и
+        last_day могут расширить его под будущие бронирования.
+        """
+        starts, ends = booking_days(bookings)
+        bounds = [_day(day) for day in (first_day, last_day) if day is not None]
+        if starts:
+            # ends — дни после отъезда; в диапазон входит сам день отъезда
+            bounds += (min(starts), max(starts), min(ends) - 1, max(ends) - 1)
+        if not bounds:
+            raise ValueError("нет бронирований: задайте first_day и last_day")
+        first = min(bounds)
+        last = max(bounds)
+        if (first_day is not None and first < _day(first_day)
+                or last_day is not None and last > _day(last_day)):
+            raise ValueError("бронирования выходят за заданный диапазон дней")
+
+        index = cls(first, last)
+        days = last - first + 1
+        top = index._top
+        guests = 0
+        # Длина days + 1: день после последнего отъезда тоже получает −1
+        for offset, delta in enumerate(diff_array(starts, ends, first, days + 1)[:days]):
+            guests += delta
+            top[index._size + offset] = guests
+        index._build()
+        return index
+
+    def _build(self):
+        top, best = self._top, self._best
+        for p in range(self._size - 1, 0, -1):
+            left, right = 2 * p, 2 * p + 1
+            if top[left] >= top[right]:
+                top[p] = top[left]
+                best[p] = best[left]
+            else:
+                top[p] = top[right]
+                best[p] = best[right]
+
+    def _pull(self, p):
+        """Пересчёт предков узла p после изменения."""
+        top, add, best = self._top, self._add, self._best
+        p //= 2
+        while p:
+            left, right = 2 * p, 2 * p + 1
+            if top[left] >= top[right]:
+                top[p] = top[left] + add[p]
+                best[p] = best[left]
+            else:
+                top[p] = top[right] + add[p]
+                best[p] = best[right]
+            p //= 2
+
+    def _offset(self, value):
+        day = _day(value)
+        if not self.first_day <= day <= self.last_day:
+            raise ValueError(f"день {format_day(day)} вне диапазона индекса")
+        return day - self.first_day
+
+    def _range_add(self, lo, hi, delta):
+        """Прибавка delta ко всем дням с номерами lo..hi (смещения от first_day)."""
+        size = self._size
+        top, add = self._top, self._add
+        left = lo + size
+        right = hi + size + 1
+        first_leaf, last_leaf = left, right - 1
+        while left < right:
+            if left & 1:
+                top[left] += delta
+                if left < size:
+                    add[left] += delta
+                left += 1
+            if right & 1:
+                right -= 1
+                top[right] += delta
+                if right < size:
+                    add[right] += delta
+            left //= 2
+            right //= 2
+        self._pull(first_leaf)
+        self._pull(last_leaf)
+
+    def add(self, arrival, departure, guests=1):
+        """Добавляет бронирование: guests гостей с заезда по отъезд включительно."""
+        lo = self._offset(arrival)
+        hi = self._offset(departure)
+        if hi < lo:
+            raise ValueError("дата отъезда раньше даты заезда")
+        self._range_add(lo, hi, guests)
+
+    def cancel(self, arrival, departure, guests=1):
+        """Отменяет ранее добавленное бронирование."""
+        self.add(arrival, departure, -guests)
+
+    def guests_on(self, day):
+        """Число гостей в день day."""
+        p = self._offset(day) + self._size
+        guests = self._top[p]
+        add = self._add
+        p //= 2
+        while p:
+            guests += add[p]
+            p //= 2
+        return guests
+
+    def busiest(self, first_day=None, last_day=None):
+        """
+        (самый ранний день максимума 'ДД.ММ.ГГ', число гостей) на отрезке
+        [first_day, last_day] (по умолчанию — весь диапазон индекса).
+        Как max_guests_day, возвращает (None, 0), если гостей не было.
+        """
+        lo = 0 if first_day is None else self._offset(first_day)
+        hi = self.last_day - self.first_day if last_day is None else self._offset(last_day)
+        if hi < lo:
+            raise ValueError("последний день отрезка раньше первого")
+
+        top, add, best = self._top, self._add, self._best
+        result, result_day = 0, None
+        # (узел, первый лист, последний лист, сумма прибавок предков);
+        # левый ребёнок снимается со стека первым — обход слева направо
+        stack = [(1, 0, self._size - 1, 0)]
+        while stack:
+            node, start, end, above = stack.pop()
+            if end < lo or start > hi:
+                continue
+            if lo <= start and end <= hi:
+                if top[node] + above > result:
+                    result = top[node] + above
+                    result_day = best[node]
+                continue
+            above += add[node]
+            middle = (start + end) // 2
+            stack.append((2 * node + 1, middle + 1, end, above))
+            stack.append((2 * node, start, middle, above))
+        if result_day is None:
+            return None, 0
+        return format_day(self.first_day + result_day), result
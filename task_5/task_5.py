@@ -8,17 +8,33 @@
 количество гостей одновременно.
 
 Алгоритм:
-- Для заезда → событие +1 в день заезда.
-- Для отъезда → событие -1 на следующий день после отъезда.
-- Сортируем события по дате и сканируем, поддерживая счётчик гостей.
-- Отслеживаем день с максимумом.
+- Даты переводятся в номера дней (date.toordinal). Строки 'ДД.ММ.ГГ'
+  разбираются вручную, остальные — через strptime; повторяющиеся даты
+  разбираются один раз (словарь-кэш на вызов).
+- Для заезда → +1 в день заезда.
+- Для отъезда → -1 на следующий день после отъезда.
+- Если все дни лежат в диапазоне, сравнимом с числом бронирований,
+  изменения складываются в массив разностей по дням диапазона,
+  и префиксная сумма даёт число гостей в каждый день.
+  Иначе (редкие даты на большом диапазоне) изменения суммируются по
+  различным дням в словаре, и сортируются только эти дни.
+- Ответ — самый ранний день, на котором достигается максимум. Все
+  изменения одного дня применяются вместе: отъезд накануне и заезд в
+  этот же день не считаются одновременными.
 
 Теоретическая сложность:
-- Время: O(n log n) — из-за сортировки 2n событий.
-- Память: O(n) — хранение событий.
+- Время: O(n + D), D — число дней в диапазоне; в разреженном случае
+  O(n + u log u), u — число различных дней с изменениями.
+- Память: O(D) или O(u).
 """
 
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import date, datetime
+
+# Массив разностей, если диапазон дней не больше стольких дней на бронирование
+# (плюс запас для малых n); иначе — сортировка различных дней
+DENSE_DAYS_PER_BOOKING = 8
+DENSE_MIN_SPAN = 1 << 12
 
 
 def parse_date(date_str: str) -> datetime:
@@ -30,36 +46,126 @@ def parse_date(date_str: str) -> datetime:
     return datetime.strptime(date_str.strip(), "%d.%m.%y")
 
 
+def parse_day(date_str: str) -> int:
+    """
+    Номер дня (date.toordinal) для строки 'ДД.ММ.ГГ'.
+    Строгий формат из восьми символов разбирается вручную, прочие
+    допустимые для parse_date записи (например, '5.9.24') — через неё.
+    Выбрасывает ValueError при ошибке.
+    """
+    s = date_str.strip()
+    if (len(s) == 8 and s[2] == s[5] == "." and s.isascii()
+            and s[:2].isdigit() and s[3:5].isdigit() and s[6:].isdigit()):
+        year = int(s[6:])
+        # Как у %y в strptime: 00-68 → 20xx, 69-99 → 19xx
+        year += 2000 if year <= 68 else 1900
+        return date(year, int(s[3:5]), int(s[:2])).toordinal()
+    return parse_date(s).toordinal()
+
+
 def format_date_for_output(dt: datetime) -> str:
     """Форматирует datetime в строку 'ДД.ММ.ГГ'."""
     return dt.strftime("%d.%m.%y")
 
 
-def max_guests_day(bookings):
-    """Возвращает дату (строка в формате 'ДД.ММ.ГГ') с максимальным числом гостей одновременно."""
-    if not bookings:
-        return None
+def format_day(day: int) -> str:
+    """Форматирует номер дня в строку 'ДД.ММ.ГГ'."""
+    return format_date_for_output(date.fromordinal(day))
 
-    events = []
+
+def booking_days(bookings):
+    """
+    Номера дней изменений: (заезды, дни после отъезда) — два списка
+    той же длины, что и bookings.
+    """
+    # Строка даты → номер дня; день после отъезда — это номер + 1
+    cache = {}
+    starts = []
+    ends = []
     for arrival, departure in bookings:
-        arr_dt = parse_date(arrival)
-        dep_dt = parse_date(departure)
-        events.append((arr_dt, 1))
-        events.append((dep_dt + timedelta(days=1), -1))
+        start = cache.get(arrival)
+        if start is None:
+            start = cache[arrival] = parse_day(arrival)
+        end = cache.get(departure)
+        if end is None:
+            end = cache[departure] = parse_day(departure)
+        end += 1
+        starts.append(start)
+        ends.append(end)
+    return starts, ends
+
+
+def diff_array(starts, ends, first, span):
+    """Массив разностей длины span: +1 в start − first, −1 в end − first."""
+    diff = [0] * span
+    for start in starts:
+        diff[start - first] += 1
+    for end in ends:
+        diff[end - first] -= 1
+    return diff
+
+
+def sweep_dense(diff, first=0):
+    """
+    Проход по массиву разностей: (самый ранний день максимума, максимум).
+    День — first + индекс; (None, 0), если гостей не было ни в один день.
+    """
+    best_day = None
+    best = 0
+    current = 0
+    for index, delta in enumerate(diff):
+        current += delta
+        if current > best:
+            best = current
+            best_day = first + index
+    return best_day, best
+
+
+def day_deltas(starts, ends):
+    """Словарь {номер дня: изменение числа гостей} — только дни с событиями."""
+    deltas = Counter(starts)
+    deltas.subtract(Counter(ends))
+    return deltas
+
 
-    events.sort(key=lambda x: x[0])  # Сортируем только по дате
+def sweep_sparse(starts, ends):
+    """То же по словарю изменений: сортируются только различные дни."""
+    return sweep_deltas(day_deltas(starts, ends))
 
-    current_guests = 0
-    max_guests = 0
+
+def sweep_deltas(deltas):
+    """Проход по словарю изменений в порядке дней: (самый ранний день максимума, максимум)."""
     best_day = None
+    best = 0
+    current = 0
+    for day in sorted(deltas):
+        current += deltas[day]
+        if current > best:
+            best = current
+            best_day = day
+    return best_day, best
+
+
+def sweep_bookings(starts, ends):
+    """(самый ранний день максимума, максимум) — массивом разностей или словарём."""
+    if not starts:
+        return None, 0
+    # Отъезд раньше заезда не проверяется, как и раньше: день после
+    # отъезда может оказаться левее всех заездов
+    first = min(min(starts), min(ends))
+    span = max(max(starts), max(ends)) - first + 1
+    if span <= max(DENSE_MIN_SPAN, DENSE_DAYS_PER_BOOKING * len(starts)):
+        return sweep_dense(diff_array(starts, ends, first, span), first)
+    return sweep_sparse(starts, ends)
+
 
-    for date, delta in events:
-        current_guests += delta
-        if current_guests > max_guests:
-            max_guests = current_guests
-            best_day = date
+def max_guests_day(bookings):
+    """Возвращает дату (строка в формате 'ДД.ММ.ГГ') с максимальным числом гостей одновременно."""
+    if not bookings:
+        return None
 
-    return format_date_for_output(best_day) if best_day else None
+    best_day, _ = sweep_bookings(*booking_days(bookings))
+    return format_day(best_day) if best_day is not None else None
 
 
 def input_manual_bookings():